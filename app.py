@@ -1,611 +1,677 @@
-import random
-import pandas as pd
-from flask import Flask, render_template, request, redirect, url_for, Response
+import functools
+import multiprocessing
+import os
+import click
+from flask import Flask, Response, abort, g, jsonify, render_template, request, redirect, stream_with_context, url_for
+
+from ekspor import MIMETYPE, FormatTidakTersedia, ekspor
+from impor import baca_nama
+from keadilan import METRIK, hitung_metrik, metrik_turnamen, simulasikan
+from klasemen import cek_konsistensi_wlt
+from log_event import LogEvent
+from musim import BATAS_HALAMAN_MAKS, IndeksMusim
+from penyimpanan import KonflikVersi, PenyimpananSQLite
+import profil
+from rating import RATING_AWAL, rating_dari_jadwal_df
+from registri import TURNAMEN_UTAMA, RegistriTurnamen
+from siaran import SiaranTurnamen
+from tampilan import (data_index, data_match, data_putaran, data_rating, data_rekap, kelas_wlt, peringkat_berubah,
+                      peringkat_turnamen, peta_nama, tersimpan)
+from turnamen import Turnamen
 
 # --- Konfigurasi Turnamen ---
-MAX_PEMAIN = 32
+# Batas roster dan pilihan lapangan; naikkan untuk liga besar (mis. 200 pemain / 40 lapangan)
+MAX_PEMAIN = int(os.environ.get('MAX_PEMAIN', 32))
+MAX_LAPANGAN = int(os.environ.get('MAX_LAPANGAN', 4))
+# Path database SQLite; kosong = state hanya di memori (hilang saat restart)
+TURNAMEN_DB = os.environ.get('TURNAMEN_DB')
+# Direktori log event + snapshot; kosong = tanpa audit trail / undo
+TURNAMEN_LOG = os.environ.get('TURNAMEN_LOG')
+# Direktori data multi-turnamen (<dir>/<id>/turnamen.db); kosong = turnamen lain hanya di memori
+TURNAMEN_DIR = os.environ.get('TURNAMEN_DIR')
+# Jumlah turnamen yang boleh aktif di memori sebelum yang terlama dikeluarkan
+TURNAMEN_AKTIF_MAKS = int(os.environ.get('TURNAMEN_AKTIF_MAKS', 64))
+# Database indeks klasemen musim (musim.py); kosong = <TURNAMEN_DIR>/musim.db, atau hanya di memori
+TURNAMEN_MUSIM = os.environ.get('TURNAMEN_MUSIM') or (os.path.join(TURNAMEN_DIR, 'musim.db') if TURNAMEN_DIR else None)
+# Urutan pembagian peringkat Mexicano: 'poin' (Total_Poin) atau 'rating' (Elo, lihat rating.py)
+SEEDING_MEXICANO = os.environ.get('SEEDING_MEXICANO', 'poin')
+# Pencarian jadwal paralel (penjadwal_paralel.py): jumlah proses pekerja (kosong/0 = mati)
+# dan tenggat per putaran dalam milidetik
+TURNAMEN_PARALEL = int(os.environ.get('TURNAMEN_PARALEL') or 0)
+TURNAMEN_PARALEL_MS = float(os.environ.get('TURNAMEN_PARALEL_MS', 50))
+
+# Instrumentasi: span per fase, header Server-Timing dan /metrics (kosong = mati, tanpa biaya)
+TURNAMEN_PROFIL = bool(os.environ.get('TURNAMEN_PROFIL'))
+# Direktori dump cProfile satu file .prof per request (ikut menyalakan instrumentasi)
+TURNAMEN_PROFIL_DIR = os.environ.get('TURNAMEN_PROFIL_DIR')
+
+# Versi JSON API (prefix /api/v<API_VERSI>)
+API_VERSI = 1
+
+# Acak per proses: ETag dari proses lain (atau sebelum restart) tidak pernah dianggap cocok
+TOKEN_ETAG = os.urandom(4).hex()
 
 # Inisialisasi Aplikasi Flask
 app = Flask(__name__)
-
-# --- Manajemen Data dengan Pandas (Simulasi Database) ---
-if 'pemain_df' not in globals():
-    # 'Total_Poin' adalah akumulasi skor match (cth: Poin Americano)
-    pemain_df = pd.DataFrame(columns=['ID', 'Nama', 'Total_Poin', 'Games_Played', 'Total_Bye', 'W', 'L', 'T'])
-    pemain_df = pemain_df.set_index('ID')
-
-if 'jadwal_df' not in globals():
-    jadwal_df = pd.DataFrame(columns=['Putaran', 'Lapangan', 'Mode', 'Pemain_1_A', 'Pemain_1_B', 'Pemain_2_A', 'Pemain_2_B', 'Poin_Tim_1', 'Poin_Tim_2', 'Status'])
-    jadwal_df.index.name = 'Match_ID' 
-
-if 'next_player_id' not in globals():
-    next_player_id = 1
-
-if 'putaran_saat_ini' not in globals():
-    putaran_saat_ini = 0
-
-if 'next_match_id' not in globals():
-    next_match_id = 1
-
-if 'last_config' not in globals():
-    last_config = {
-        'num_lapangan': 1,
-        'format_turnamen': 'Americano', 
-        'mode_permainan': 'Double'
-    }
-
-# --- Fungsi Utility ---
-def get_next_player_id():
-    global next_player_id
-    current_id = next_player_id
-    next_player_id += 1
-    return current_id
-
-def get_next_match_id():
-    global next_match_id
-    current_id = next_match_id
-    next_match_id += 1
-    return current_id
-
-def hitung_wlt(pemain_df_copy, jadwal_df_copy):
+# Dipanggil index.html untuk kelas W/L/T match (padanan fungsi JS dengan nama sama)
+app.add_template_global(kelas_wlt, 'getWltClass')
+# Dipasang paling awal agar waktu total request mencakup hook lain
+if TURNAMEN_PROFIL or TURNAMEN_PROFIL_DIR:
+    profil.pasang(app, direktori_cprofile=TURNAMEN_PROFIL_DIR)
+
+# Proses pekerja (spawn) ikut mengimpor modul ini; pool hanya dibuat di proses utama
+if TURNAMEN_PARALEL and multiprocessing.parent_process() is None:
+    import penjadwal_paralel
+    penjadwal_paralel.pasang(TURNAMEN_PARALEL, TURNAMEN_PARALEL_MS / 1000)
+
+# --- Manajemen Data (lihat registri.py, turnamen.py dan penyimpanan.py) ---
+# Satu siaran live per turnamen_id di memori. Saat turnamennya dikeluarkan dari
+# registri, siarannya ditutup: layar yang terhubung memuat ulang halaman, yang
+# memuat turnamen kembali dengan siaran baru.
+siaran = {}
+
+def pasang_siaran(turnamen_id, turnamen):
+    siaran.setdefault(turnamen_id, SiaranTurnamen()).pasang(turnamen)
+
+def lepas_siaran(turnamen_id, turnamen):
+    lama = siaran.pop(turnamen_id, None)
+    if lama is not None:
+        lama.tutup()
+
+registri = RegistriTurnamen(
+    direktori=TURNAMEN_DIR,
+    pakai_log=bool(TURNAMEN_LOG),
+    maks_aktif=TURNAMEN_AKTIF_MAKS,
+    max_pemain=MAX_PEMAIN,
+    # Turnamen utama ('/') tetap memakai TURNAMEN_DB / TURNAMEN_LOG seperti sebelumnya
+    penyimpanan_utama=PenyimpananSQLite(TURNAMEN_DB) if TURNAMEN_DB else None,
+    log_utama=LogEvent(TURNAMEN_LOG) if TURNAMEN_LOG else None,
+    saat_dibuat=pasang_siaran,
+    saat_dikeluarkan=lepas_siaran,
+    seeding_mexicano=SEEDING_MEXICANO
+)
+
+# Klasemen musim lintas turnamen; turnamen dilipat ke sini secara eksplisit (API / CLI)
+musim = IndeksMusim(TURNAMEN_MUSIM)
+
+
+def route_turnamen(rule, **options):
     """
-    Menghitung Win/Lose/Tie KUMULATIF berdasarkan semua pertandingan Selesai.
-    Menggunakan copy dari DataFrame untuk mencegah side effects.
+    Mendaftarkan route dua kali: `/t/<turnamen_id><rule>` dan `<rule>` untuk
+    turnamen utama. Keduanya memakai endpoint yang sama, jadi template cukup
+    memanggil url_for('index') dan turnamen aktif diisi oleh url_defaults.
     """
-    
-    # Inisialisasi/Reset kolom W/L/T untuk perhitungan baru
-    for col in ['W', 'L', 'T']:
-        if col not in pemain_df_copy.columns:
-            pemain_df_copy[col] = 0
-        pemain_df_copy[col] = 0 # Reset
-        
-    jadwal_selesai = jadwal_df_copy[jadwal_df_copy['Status'] == 'Selesai']
-    
-    for _, match in jadwal_selesai.iterrows():
-        # Memastikan hanya ID yang valid
-        pemain_tim_1 = [match['Pemain_1_A'], match['Pemain_1_B']] if match['Mode'] == 'Double' else [match['Pemain_1_A']]
-        pemain_tim_1 = [p_id for p_id in pemain_tim_1 if pd.notna(p_id) and p_id in pemain_df_copy.index]
-        
-        pemain_tim_2 = [match['Pemain_2_A'], match['Pemain_2_B']] if match['Mode'] == 'Double' else [match['Pemain_2_A']]
-        pemain_tim_2 = [p_id for p_id in pemain_tim_2 if pd.notna(p_id) and p_id in pemain_df_copy.index]
-
-        poin1, poin2 = match['Poin_Tim_1'], match['Poin_Tim_2']
-        
-        if poin1 > poin2:
-            # Tim 1 Menang, Tim 2 Kalah
-            for p_id in pemain_tim_1:
-                pemain_df_copy.loc[p_id, 'W'] += 1
-            for p_id in pemain_tim_2:
-                pemain_df_copy.loc[p_id, 'L'] += 1
-        elif poin2 > poin1:
-            # Tim 2 Menang, Tim 1 Kalah
-            for p_id in pemain_tim_2:
-                pemain_df_copy.loc[p_id, 'W'] += 1
-            for p_id in pemain_tim_1:
-                pemain_df_copy.loc[p_id, 'L'] += 1
-        else:
-            # Seri/Tie (poin1 == poin2)
-            pemain_all = pemain_tim_1 + pemain_tim_2
-            for p_id in pemain_all:
-                pemain_df_copy.loc[p_id, 'T'] += 1
-                    
-    return pemain_df_copy
-    
-def buat_jadwal(pemain_df, putaran, num_lapangan, mode_permainan, format_turnamen):
+    def daftar(f):
+        app.route(rule, defaults={'turnamen_id': TURNAMEN_UTAMA}, **options)(f)
+        return app.route('/t/<turnamen_id>' + rule, **options)(f)
+    return daftar
+
+@app.url_value_preprocessor
+def ambil_turnamen(endpoint, values):
+    # ID yang belum dibuat (lihat api_buat_turnamen) menjadi 404, termasuk untuk GET
+    if values is not None and 'turnamen_id' in values:
+        g.turnamen_id = values.pop('turnamen_id')
+        if endpoint == 'api_buat_turnamen':
+            return
+        try:
+            g.turnamen = registri.ambil(g.turnamen_id)
+        except KeyError:
+            abort(404)
+
+@app.url_defaults
+def isi_turnamen_id(endpoint, values):
+    if 'turnamen_id' not in values and 'turnamen_id' in g and app.url_map.is_endpoint_expecting(endpoint, 'turnamen_id'):
+        values['turnamen_id'] = g.turnamen_id
+
+@app.before_request
+def sinkronkan_turnamen():
+    # Murah: hanya membaca satu baris versi; muat ulang jika instance lain menulis
+    if 'turnamen' in g:
+        g.turnamen.sinkronkan()
+
+def cache_halaman(f):
     """
-    Membuat jadwal baru dengan logika prioritas.
+    Untuk GET yang hanya bergantung pada state turnamen. ETag = versi_state:
+    jika klien masih memegang versi ini, jawab 304 tanpa membangun apa pun;
+    selain itu body diambil dari cache versi ini (dirender sekali per versi).
     """
-    if 'Total_Bye' not in pemain_df.columns:
-        pemain_df['Total_Bye'] = 0
-    if 'Games_Played' not in pemain_df.columns:
-        pemain_df['Games_Played'] = 0
-            
-    pemain_df['Random_Tie_Breaker'] = [random.random() for _ in range(len(pemain_df))]
-            
-    pemain_df['Rank_Poin'] = pemain_df['Total_Poin'].rank(method='min', ascending=False)
-    
-    # Kriteria Sorting Prioritas: Total_Bye DESC, Games_Played ASC, Total_Poin DESC, Random_Tie_Breaker ASC
-    pemain_aktif_sorted = pemain_df.sort_values(
-        by=['Total_Bye', 'Games_Played', 'Total_Poin', 'Random_Tie_Breaker'], 
-        ascending=[False, True, False, True] 
-    ).index.tolist()
-    
-    players_per_court = 4 if mode_permainan == 'Double' else 2
-    total_slots = num_lapangan * players_per_court
-    
-    pemain_potensial = pemain_aktif_sorted[:total_slots]
-    
-    pemain_yang_bermain_count = len(pemain_potensial) - (len(pemain_potensial) % players_per_court)
-    pemain_bermain_ids = pemain_potensial[:pemain_yang_bermain_count]
-    
-    pemain_bermain = pemain_bermain_ids
-
-    if len(pemain_bermain) < players_per_court:
-        return []
-
-    jadwal_baru = []
-    
-    # --- AMERICANO (Acak) ---
-    if format_turnamen == 'Americano':
-        random.shuffle(pemain_bermain) 
-        
-        for i in range(0, len(pemain_bermain), players_per_court):
-            grup_pemain = pemain_bermain[i:i+players_per_court]
-            
-            if len(grup_pemain) == players_per_court:
-                lapangan_num = (i // players_per_court) + 1
-                
-                if mode_permainan == 'Double':
-                    P1A, P1B, P2A, P2B = grup_pemain
-                else: # Single
-                    P1A, P2A = grup_pemain
-                    P1B, P2B = None, None
-                
-                match_data = {
-                    'Match_ID': get_next_match_id(),
-                    'Putaran': putaran,
-                    'Lapangan': lapangan_num,
-                    'Mode': mode_permainan,
-                    'Pemain_1_A': P1A, 'Pemain_1_B': P1B,
-                    'Pemain_2_A': P2A, 'Pemain_2_B': P2B,
-                    'Poin_Tim_1': 0, 'Poin_Tim_2': 0,
-                    'Status': 'Belum Selesai'
-                }
-                jadwal_baru.append(match_data)
-    
-    # --- MEXICANO (Peringkat) ---
-    elif format_turnamen == 'Mexicano':
-        
-        pemain_bermain_df_sorted = pemain_df.loc[pemain_bermain].sort_values(
-            by='Total_Poin', ascending=False
-        ).index.tolist()
-        
-        mid_point = len(pemain_bermain_df_sorted) // 2
-        peringkat_tinggi = pemain_bermain_df_sorted[:mid_point]
-        peringkat_rendah = pemain_bermain_df_sorted[mid_point:]
-        
-        random.shuffle(peringkat_tinggi)
-        random.shuffle(peringkat_rendah)
-        
-        if mode_permainan == 'Double':
-            
-            num_matches = len(peringkat_tinggi) // 2 
-            
-            for i in range(num_matches):
-                
-                H1 = peringkat_tinggi.pop(0)
-                H2 = peringkat_tinggi.pop(0)
-                L1 = peringkat_rendah.pop(0)
-                L2 = peringkat_rendah.pop(0)
-
-                P1A, P1B, P2A, P2B = H1, L1, H2, L2 
-                
-                lapangan_num = i + 1
-                
-                match_data = {
-                    'Match_ID': get_next_match_id(),
-                    'Putaran': putaran,
-                    'Lapangan': lapangan_num,
-                    'Mode': mode_permainan,
-                    'Pemain_1_A': P1A, 'Pemain_1_B': P1B,
-                    'Pemain_2_A': P2A, 'Pemain_2_B': P2B,
-                    'Poin_Tim_1': 0, 'Poin_Tim_2': 0,
-                    'Status': 'Belum Selesai'
-                }
-                jadwal_baru.append(match_data)
-        
-        elif mode_permainan == 'Single':
-            
-            num_matches = len(peringkat_tinggi)
-            for i in range(num_matches):
-                P1A = peringkat_tinggi[i]
-                P2A = peringkat_rendah[i]
-                
-                lapangan_num = i + 1
-                
-                match_data = {
-                    'Match_ID': get_next_match_id(),
-                    'Putaran': putaran,
-                    'Lapangan': lapangan_num,
-                    'Mode': mode_permainan,
-                    'Pemain_1_A': P1A, 'Pemain_1_B': None,
-                    'Pemain_2_A': P2A, 'Pemain_2_B': None,
-                    'Poin_Tim_1': 0, 'Poin_Tim_2': 0,
-                    'Status': 'Belum Selesai'
-                }
-                jadwal_baru.append(match_data)
-            
-    return jadwal_baru
+    @functools.wraps(f)
+    def pembungkus(*args, **kwargs):
+        turnamen = g.turnamen
+        with turnamen.kunci:
+            versi, cache = turnamen.versi_state, turnamen.cache_tampilan
+        etag = f'{TOKEN_ETAG}-{versi}'
+        if request.if_none_match.contains(etag):
+            respons = Response(status=304)
+        else:
+            kunci = ('halaman', request.full_path)
+            isi = cache.get(kunci)
+            if isi is None:
+                respons = app.make_response(f(*args, **kwargs))
+                if respons.status_code != 200:
+                    return respons
+                # Body dirender di luar kunci; jika state sudah berubah, `cache` sudah
+                # tidak dipakai lagi sehingga body yang lebih baru pun tidak tercampur
+                cache[kunci] = (respons.get_data(), respons.mimetype)
+            else:
+                respons = Response(isi[0], mimetype=isi[1])
+        respons.set_etag(etag)
+        respons.headers['Cache-Control'] = 'no-cache'
+        return respons
+    return pembungkus
 
 # ----------------------------------------------------
 #               ROUTE APLIKASI
 # ----------------------------------------------------
 
-@app.route('/')
+@route_turnamen('/')
+@cache_halaman
 def index():
-    global pemain_df, jadwal_df, putaran_saat_ini, last_config
-
-    # Inisialisasi kolom jika belum ada
-    if 'Total_Bye' not in pemain_df.columns:
-        pemain_df['Total_Bye'] = 0
-    if 'Games_Played' not in pemain_df.columns:
-        pemain_df['Games_Played'] = 0
-    for col in ['W', 'L', 'T']:
-          if col not in pemain_df.columns:
-              pemain_df[col] = 0
-
-    peringkat = pd.DataFrame()
-    if not pemain_df.empty:
-        # --- PERBAIKAN W/L/T SINKRONISASI ---
-        # 1. Hitung W/L/T menggunakan fungsi hitung_wlt()
-        pemain_df_hitung = hitung_wlt(pemain_df.copy(), jadwal_df.copy())
-        
-        # 2. SINKRONISASI: Perbarui kolom W, L, T di DataFrame global pemain_df
-        # Ini penting agar W/L/T selalu terupdate, tidak hanya 0/0/0
-        pemain_df['W'] = pemain_df_hitung['W']
-        pemain_df['L'] = pemain_df_hitung['L']
-        pemain_df['T'] = pemain_df_hitung['T']
-        # ------------------------------------
-        
-        # Buat kolom Ranking_W_L (sama dengan Total_Poin, untuk menyesuaikan nama variabel di HTML Anda)
-        peringkat = pemain_df.copy()
-        peringkat['Ranking_W_L'] = peringkat['Total_Poin']
-        
-        # Ranking tetap berdasarkan Total_Poin
-        peringkat['Peringkat'] = peringkat['Total_Poin'].rank(method='min', ascending=False).astype(int)
-        peringkat = peringkat.sort_values(by=['Peringkat', 'Total_Poin'], ascending=[True, False])
-        
-        peringkat = peringkat.reset_index(names=['ID'])
-        
-
-    jadwal_saat_ini = jadwal_df[jadwal_df['Putaran'] == putaran_saat_ini].reset_index()
-    jadwal_untuk_template = []
-    
-    can_reshuffle = False
-    current_mode = last_config['mode_permainan'] 
-    current_format = last_config['format_turnamen'] 
-    pemain_bye = []
-
-    if not jadwal_saat_ini.empty:
-        
-        current_mode = jadwal_saat_ini.loc[0, 'Mode']
-        current_format = last_config['format_turnamen'] 
-        players_per_court = 4 if current_mode == 'Double' else 2
-        
-        if 'Rank_Poin' not in pemain_df.columns:
-            pemain_df['Rank_Poin'] = pemain_df['Total_Poin'].rank(method='min', ascending=False)
-                
-        if 'Random_Tie_Breaker' not in pemain_df.columns:
-             pemain_df['Random_Tie_Breaker'] = 0 
-            
-        pemain_potensial_idx = pemain_df.sort_values(
-            by=['Total_Bye', 'Games_Played', 'Total_Poin', 'Random_Tie_Breaker'], 
-            ascending=[False, True, False, True]
-        ).index.tolist()
-        
-        id_cols = ['Pemain_1_A', 'Pemain_1_B', 'Pemain_2_A', 'Pemain_2_B']
-        pemain_yang_bermain_id = set()
-        for col in id_cols:
-            if col in jadwal_saat_ini.columns:
-                pemain_yang_bermain_id.update(jadwal_saat_ini[col].dropna().tolist())
-
-        num_courts_used = len(jadwal_saat_ini)
-        max_players_scheduled = num_courts_used * players_per_court
-        
-        # Identifikasi pemain yang seharusnya bermain (berdasarkan ranking dan kriteria Bye)
-        pemain_ranked = pemain_potensial_idx[:max_players_scheduled + players_per_court]
-        
-        # Identifikasi pemain yang mendapat Bye (ada di ranking potensial tapi tidak dijadwalkan)
-        pemain_bye_ids = [id for id in pemain_ranked if id not in pemain_yang_bermain_id]
-        
-        pemain_bye = pemain_df.loc[pemain_bye_ids]['Nama'].tolist()
-        
-        if (jadwal_saat_ini['Status'] == 'Belum Selesai').all():
-            can_reshuffle = True
-            
-        if not pemain_df.empty:
-            jadwal_dengan_nama = jadwal_saat_ini.copy()
-            
-            for col in id_cols:
-                if col in jadwal_dengan_nama.columns and jadwal_dengan_nama[col].notna().any():
-                    jadwal_dengan_nama = jadwal_dengan_nama.merge(
-                        pemain_df[['Nama']], 
-                        left_on=col, 
-                        right_index=True, 
-                        how='left', 
-                        suffixes=('', f'_{col}_Nama')
-                    )
-                    jadwal_dengan_nama = jadwal_dengan_nama.rename(columns={'Nama': f'{col}_Nama'})
-
-            # --- LOGIKA STATUS W/L/T PER MATCH ---
-            def hitung_status_match(poin1, poin2):
-                if poin1 > poin2: return 'W'
-                if poin2 > poin1: return 'L'
-                return 'T'
-
-            for index, row in jadwal_dengan_nama.iterrows():
-                
-                match_data = row.to_dict()
-                
-                if row['Status'] == 'Selesai':
-                    poin1, poin2 = row['Poin_Tim_1'], row['Poin_Tim_2']
-                    
-                    status_tim_1 = hitung_status_match(poin1, poin2)
-                    status_tim_2 = hitung_status_match(poin2, poin1)
-                    
-                    # Konversi status ke format W/L/T (Contoh: Menang = 1/0/0)
-                    wlt_tim_1 = {'W': '1/0/0', 'L': '0/1/0', 'T': '0/0/1'}.get(status_tim_1, '-')
-                    wlt_tim_2 = {'W': '1/0/0', 'L': '0/1/0', 'T': '0/0/1'}.get(status_tim_2, '-')
-                    
-                    match_data['Status_Tim_1'] = wlt_tim_1
-                    match_data['Status_Tim_2'] = wlt_tim_2
-                else:
-                    match_data['Status_Tim_1'] = '-'
-                    match_data['Status_Tim_2'] = '-'
-                
-                jadwal_untuk_template.append(match_data)
-            # ----------------------------------------------
-            
-    if putaran_saat_ini == 0:
-        pemain_bye = []
-
+    # View dibangun di bawah kunci agar tidak membaca state setengah jadi
+    with g.turnamen.kunci:
+        konteks = tersimpan(g.turnamen, 'index', lambda: data_index(g.turnamen))
+        bisa_undo = g.turnamen.log_event is not None and g.turnamen.log_event.jumlah_event > 0
 
     return render_template(
-        'index.html', 
-        peringkat=peringkat.to_dict('records'),
-        jadwal=jadwal_untuk_template,
-        putaran=putaran_saat_ini,
-        max_lapangan_pilihan=[1, 2, 3, 4],
-        can_reshuffle=can_reshuffle,
-        current_mode=current_mode,
-        current_format=current_format,
-        pemain_bye=pemain_bye
+        'index.html',
+        max_lapangan_pilihan=list(range(1, MAX_LAPANGAN + 1)),
+        bisa_undo=bisa_undo,
+        turnamen_id=None if g.turnamen_id == TURNAMEN_UTAMA else g.turnamen_id,
+        **konteks
     )
 
-@app.route('/tambah_pemain', methods=['POST'])
+@route_turnamen('/tambah_pemain', methods=['POST'])
 def tambah_pemain():
-    global pemain_df
-    nama = request.form.get('nama_pemain')
-    
-    if nama and len(pemain_df) < MAX_PEMAIN:
-        new_id = get_next_player_id()
-        new_row = pd.DataFrame([{'ID': new_id, 'Nama': nama, 'Total_Poin': 0, 'Games_Played': 0, 'Total_Bye': 0, 'W': 0, 'L': 0, 'T': 0}])
-        new_row = new_row.set_index('ID')
-        pemain_df = pd.concat([pemain_df, new_row])
-        
+    g.turnamen.tambah_pemain(request.form.get('nama_pemain'))
     return redirect(url_for('index'))
 
-@app.route('/hapus_pemain/<int:player_id>', methods=['POST'])
-def hapus_pemain(player_id):
-    global pemain_df, jadwal_df, putaran_saat_ini
-    
-    if player_id in pemain_df.index:
-        pemain_df.drop(player_id, inplace=True)
-        
-        cols_to_check = ['Pemain_1_A', 'Pemain_1_B', 'Pemain_2_A', 'Pemain_2_B']
-        
-        jadwal_saat_ini_idx = jadwal_df[jadwal_df['Putaran'] == putaran_saat_ini].index
-        
-        indices_to_drop = []
-        for idx in jadwal_saat_ini_idx:
-            is_involved = False
-            for col in cols_to_check:
-                if jadwal_df.loc[idx, col] == player_id:
-                    is_involved = True
-                    break
-            
-            if is_involved:
-                indices_to_drop.append(idx)
-        
-        if indices_to_drop:
-            jadwal_df.drop(indices_to_drop, inplace=True)
-        
-        # Jika semua match di putaran saat ini dihapus, mundur 1 putaran (opsional)
-        if putaran_saat_ini > 0 and jadwal_df[jadwal_df['Putaran'] == putaran_saat_ini].empty:
-            putaran_saat_ini -= 1
+@route_turnamen('/tambah_pemain_banyak', methods=['POST'])
+def tambah_pemain_banyak():
+    """Daftar nama yang ditempel (satu per baris) dan/atau berkas CSV, dalam satu request."""
+    nama = baca_nama(request.form.get('daftar_pemain', ''))
+    berkas = request.files.get('berkas_pemain')
+    if berkas and berkas.filename:
+        nama += baca_nama(berkas.read().decode('utf-8', errors='replace'), format_csv=True)
+    g.turnamen.tambah_pemain_banyak(nama)
+    return redirect(url_for('index'))
 
+@route_turnamen('/hapus_pemain/<int:player_id>', methods=['POST'])
+def hapus_pemain(player_id):
+    g.turnamen.hapus_pemain(player_id)
     return redirect(url_for('index'))
 
 
-@app.route('/mulai_putaran', methods=['POST'])
+@route_turnamen('/mulai_putaran', methods=['POST'])
 def mulai_putaran():
-    global putaran_saat_ini, jadwal_df, last_config
-    
-    num_lapangan = int(request.form.get('num_lapangan', 1))
+    num_lapangan = min(max(int(request.form.get('num_lapangan', 1)), 1), MAX_LAPANGAN)
     format_turnamen = request.form.get('format_turnamen')
     mode_permainan = request.form.get('mode_permainan') 
+    # Jumlah putaran Americano yang direncanakan sekaligus (0 = per putaran)
+    try:
+        jumlah_putaran_rencana = int(request.form.get('jumlah_putaran_rencana') or 0)
+    except ValueError:
+        jumlah_putaran_rencana = 0
 
-    players_per_court = 4 if mode_permainan == 'Double' else 2
-
-    if len(pemain_df) < players_per_court:
-        return redirect(url_for('index')) 
-
-    # Hapus jadwal putaran yang belum selesai.
-    jadwal_df = jadwal_df[jadwal_df['Status'] == 'Selesai'] 
-    
-    putaran_saat_ini += 1
-    
-    last_config['num_lapangan'] = num_lapangan
-    last_config['format_turnamen'] = format_turnamen
-    last_config['mode_permainan'] = mode_permainan
-    
-    if 'Games_Played' not in pemain_df.columns: pemain_df['Games_Played'] = 0
-    if 'Total_Bye' not in pemain_df.columns: pemain_df['Total_Bye'] = 0
-
-    new_matches = buat_jadwal(pemain_df, putaran_saat_ini, num_lapangan, mode_permainan, format_turnamen)
-    
-    if new_matches:
-        new_jadwal_df = pd.DataFrame(new_matches)
-        new_jadwal_df.set_index('Match_ID', inplace=True) 
-        jadwal_df = pd.concat([jadwal_df, new_jadwal_df])
-        
+    g.turnamen.mulai_putaran(num_lapangan, format_turnamen, mode_permainan, jumlah_putaran_rencana)
     return redirect(url_for('index'))
 
-@app.route('/kocok_ulang', methods=['POST'])
+@route_turnamen('/kocok_ulang', methods=['POST'])
 def kocok_ulang():
-    global jadwal_df, putaran_saat_ini, last_config
-    
-    jadwal_saat_ini = jadwal_df[jadwal_df['Putaran'] == putaran_saat_ini]
-    
-    if not jadwal_saat_ini.empty and (jadwal_saat_ini['Status'] == 'Belum Selesai').all():
-        
-        # Hapus jadwal putaran saat ini untuk dikocok ulang
-        jadwal_df = jadwal_df[jadwal_df['Putaran'] != putaran_saat_ini]
-
-        num_lapangan = len(jadwal_saat_ini['Lapangan'].unique()) 
-        format_turnamen = request.form.get('format_turnamen_ulang')
-        mode_permainan = request.form.get('mode_permainan_ulang') 
-        
-        last_config['num_lapangan'] = num_lapangan
-        last_config['format_turnamen'] = format_turnamen
-        last_config['mode_permainan'] = mode_permainan
-
-        if 'Games_Played' not in pemain_df.columns: pemain_df['Games_Played'] = 0
-        if 'Total_Bye' not in pemain_df.columns: pemain_df['Total_Bye'] = 0
-        
-        new_matches = buat_jadwal(pemain_df, putaran_saat_ini, num_lapangan, mode_permainan, format_turnamen)
-
-        if new_matches:
-            new_jadwal_df = pd.DataFrame(new_matches)
-            new_jadwal_df.set_index('Match_ID', inplace=True) 
-            jadwal_df = pd.concat([jadwal_df, new_jadwal_df])
+    format_turnamen = request.form.get('format_turnamen_ulang')
+    mode_permainan = request.form.get('mode_permainan_ulang') 
 
+    g.turnamen.kocok_ulang(format_turnamen, mode_permainan)
     return redirect(url_for('index'))
 
-@app.route('/input_skor/<int:match_id>', methods=['POST'])
+@route_turnamen('/input_skor/<int:match_id>', methods=['POST'])
 def input_skor(match_id):
-    global jadwal_df, pemain_df, putaran_saat_ini, last_config
-    
     try:
         skor_tim_1 = int(request.form.get('skor_tim_1', 0))
         skor_tim_2 = int(request.form.get('skor_tim_2', 0))
+        # Versi baris match yang dilihat form; kosong = tanpa cek (klien lama)
+        versi = request.form.get('versi')
+        versi = int(versi) if versi else None
+    except ValueError:
+        return redirect(url_for('index'))
+
+    try:
+        g.turnamen.input_skor(match_id, skor_tim_1, skor_tim_2, versi)
+    except KonflikVersi:
+        # Match sudah diubah proses lain; state sudah dimuat ulang, tampilkan yang terbaru
+        pass
+    return redirect(url_for('index'))
+
+@route_turnamen('/undo', methods=['POST'])
+def undo():
+    try:
+        jumlah = int(request.form.get('jumlah', 1))
     except ValueError:
         return redirect(url_for('index'))
-    
-    if skor_tim_1 >= 0 and skor_tim_2 >= 0:
-        
-        if match_id in jadwal_df.index:
-            
-            match_row = jadwal_df.loc[match_id]
-            
-            p1b = match_row.get('Pemain_1_B')
-            p2b = match_row.get('Pemain_2_B')
-            
-            pemain_ids_team_1 = [id for id in [match_row['Pemain_1_A'], p1b] if pd.notna(id)]
-            pemain_ids_team_2 = [id for id in [match_row['Pemain_2_A'], p2b] if pd.notna(id)]
-            
-            pemain_ids_all = [id for id in pemain_ids_team_1 + pemain_ids_team_2 if id in pemain_df.index]
-
-            # 1. Kurangi Poin dan Games_Played Lama (untuk update skor/reset)
-            if match_row['Status'] == 'Selesai':
-                poin_lama_tim_1 = match_row['Poin_Tim_1']
-                poin_lama_tim_2 = match_row['Poin_Tim_2']
-                
-                # Kurangi Poin dan Games Played (1)
-                for id in pemain_ids_team_1:
-                    if id in pemain_df.index:
-                        pemain_df.loc[id, 'Total_Poin'] -= poin_lama_tim_1
-                        pemain_df.loc[id, 'Games_Played'] -= 1 
-                
-                for id in pemain_ids_team_2:
-                    if id in pemain_df.index:
-                        pemain_df.loc[id, 'Total_Poin'] -= poin_lama_tim_2
-                        pemain_df.loc[id, 'Games_Played'] -= 1 
-                        
-            # 2. Update Jadwal
-            jadwal_df.loc[match_id, ['Poin_Tim_1', 'Poin_Tim_2']] = [skor_tim_1, skor_tim_2]
-            jadwal_df.loc[match_id, 'Status'] = 'Selesai'
-
-            # 3. Tambah Poin Baru ke Total Poin Pemain
-            for id in pemain_ids_team_1:
-                if id in pemain_df.index:
-                    pemain_df.loc[id, 'Total_Poin'] += skor_tim_1
-            for id in pemain_ids_team_2:
-                if id in pemain_df.index:
-                    pemain_df.loc[id, 'Total_Poin'] += skor_tim_2
-
-            # 4. Tambah Games_Played Baru (1 per match/round)
-            for id in pemain_ids_all:
-                 if id in pemain_df.index:
-                     pemain_df.loc[id, 'Games_Played'] += 1 
-                    
-    
-    # --- Otomatis Buat Jadwal Putaran Berikutnya ---
-    current_round_matches = jadwal_df[jadwal_df['Putaran'] == putaran_saat_ini]
-    
-    if not current_round_matches.empty and (current_round_matches['Status'] == 'Selesai').all():
-        
-        # Simpan jadwal putaran sebelumnya (semua match sudah selesai)
-        prev_putaran = putaran_saat_ini
-        
-        # Update Games_Played dan Total_Bye untuk putaran ini SEBELUM membuat yang baru
-        players_per_court = 4 if last_config['mode_permainan'] == 'Double' else 2
-        num_courts = last_config['num_lapangan']
-        max_players_to_be_scheduled = num_courts * players_per_court
-        
-        pemain_potensial_prev = pemain_df.sort_values(
-            by=['Total_Bye', 'Games_Played', 'Total_Poin'], 
-            ascending=[False, True, False] 
-        ).index.tolist()
-        
-        pemain_potensial_prev = pemain_potensial_prev[:max_players_to_be_scheduled + players_per_court]
-        
-        prev_matches = jadwal_df[jadwal_df['Putaran'] == prev_putaran]
-        players_who_played_prev = set(prev_matches[['Pemain_1_A', 'Pemain_1_B', 'Pemain_2_A', 'Pemain_2_B']].stack().dropna().tolist())
-        
-        players_on_bye_prev = [id for id in pemain_potensial_prev if id not in players_who_played_prev]
-        
-        # Tambah Total_Bye untuk pemain yang mendapat bye di putaran sebelumnya
-        pemain_df.loc[players_on_bye_prev, 'Total_Bye'] += 1
-        
-        
-        # Lanjutkan ke putaran baru
-        putaran_saat_ini += 1
-        
-        num_lapangan = last_config['num_lapangan']
-        format_turnamen = last_config['format_turnamen']
-        mode_permainan = last_config['mode_permainan']
-        
-        new_matches = buat_jadwal(pemain_df, putaran_saat_ini, num_lapangan, mode_permainan, format_turnamen)
-        
-        if new_matches:
-            new_jadwal_df = pd.DataFrame(new_matches)
-            new_jadwal_df.set_index('Match_ID', inplace=True) 
-            jadwal_df = pd.concat([jadwal_df, new_jadwal_df])
-            
+
+    g.turnamen.undo(jumlah)
     return redirect(url_for('index'))
 
+# ----------------------------------------------------
+#               JSON API
+# ----------------------------------------------------
+# Dipakai skrip di index.html untuk mencatat skor tanpa redirect + render ulang.
+API = f'/api/v{API_VERSI}'
+
+def api_galat(status, pesan, **data):
+    return jsonify(api=API_VERSI, galat=pesan, **data), status
+
+@app.route('/t/<turnamen_id>' + API + '/tournament', methods=['POST'])
+def api_buat_turnamen():
+    """Membuat turnamen /t/<turnamen_id>/ (idempoten): 201 jika baru, 200 jika sudah ada."""
+    baru = not registri.ada(g.turnamen_id)
+    try:
+        registri.buat(g.turnamen_id)
+    except KeyError:
+        return api_galat(400, 'ID turnamen hanya boleh huruf, angka, _ dan - (maks 64 karakter).')
+    status = 201 if baru else 200
+    return jsonify(api=API_VERSI, turnamen=g.turnamen_id, url=url_for('index', turnamen_id=g.turnamen_id)), status
+
+@route_turnamen(API + '/standings')
+@cache_halaman
+def api_standings():
+    with g.turnamen.kunci:
+        return jsonify(api=API_VERSI, putaran=g.turnamen.putaran_saat_ini,
+                       peringkat=peringkat_turnamen(g.turnamen))
+
+@route_turnamen(API + '/rounds/<int:putaran>')
+@cache_halaman
+def api_round(putaran):
+    with g.turnamen.kunci:
+        data = tersimpan(g.turnamen, ('putaran', putaran), lambda: data_putaran(g.turnamen, putaran))
+    if not data['jadwal'] and not data['aktif']:
+        return api_galat(404, 'Putaran tidak ditemukan.')
+    return jsonify(api=API_VERSI, **data)
+
+@route_turnamen(API + '/fairness')
+@cache_halaman
+def api_keadilan():
+    """Metrik keadilan jadwal (lihat keadilan.py) untuk seluruh riwayat turnamen."""
+    with g.turnamen.kunci:
+        return jsonify(api=API_VERSI, putaran=g.turnamen.putaran_saat_ini, metrik=metrik_turnamen(g.turnamen))
+
+@route_turnamen(API + '/ratings')
+@cache_halaman
+def api_rating():
+    """Rating Elo pemain (lihat rating.py), urut rating tertinggi."""
+    with g.turnamen.kunci:
+        return jsonify(api=API_VERSI, putaran=g.turnamen.putaran_saat_ini,
+                       seeding_mexicano=g.turnamen.seeding_mexicano, rating=data_rating(g.turnamen))
+
+@route_turnamen(API + '/export/<any(matches, standings):data>.<any(csv, jsonl, parquet):format_ekspor>')
+def api_ekspor(data, format_ekspor):
+    """
+    Seluruh match / klasemen sebagai file CSV, JSON Lines atau Parquet (lihat
+    ekspor.py). Body di-stream per potongan dan tidak di-cache, sehingga
+    arsip ratusan ribu match tidak pernah dimuat utuh ke memori.
+    """
+    try:
+        isi = ekspor(g.turnamen, data, format_ekspor)
+    except FormatTidakTersedia as e:
+        return api_galat(501, str(e))
+    return Response(isi, mimetype=MIMETYPE[format_ekspor], headers={
+        'Content-Disposition': f'attachment; filename="{g.turnamen_id}-{data}.{format_ekspor}"',
+        'Cache-Control': 'no-store',
+    })
+
+@route_turnamen(API + '/matches/<int:match_id>/score', methods=['POST'])
+def api_skor(match_id):
+    """
+    Body JSON: {"skor_tim_1": int, "skor_tim_2": int, "versi": int (opsional)}.
+    Mengembalikan match yang diperbarui dan hanya baris klasemen yang berubah;
+    `putaran_baru` = true jika skor ini menutup putaran (klien memuat ulang).
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        skor_tim_1 = int(data['skor_tim_1'])
+        skor_tim_2 = int(data['skor_tim_2'])
+        versi = int(data['versi']) if data.get('versi') is not None else None
+    except (KeyError, TypeError, ValueError):
+        return api_galat(400, 'skor_tim_1 dan skor_tim_2 harus bilangan bulat.')
+    if skor_tim_1 < 0 or skor_tim_2 < 0:
+        return api_galat(400, 'Skor tidak boleh negatif.')
+
+    turnamen = g.turnamen
+    with turnamen.kunci:
+        turnamen.sinkronkan()
+        if match_id not in turnamen.jadwal:
+            return api_galat(404, 'Match tidak ditemukan.')
+        nama = peta_nama(turnamen.pemain)
+        putaran = turnamen.putaran_saat_ini
+        sebelum = peringkat_turnamen(turnamen)
+
+        try:
+            diterima = turnamen.input_skor(match_id, skor_tim_1, skor_tim_2, versi)
+        except KonflikVersi:
+            diterima = False
+        match = turnamen.jadwal.get(match_id)
+        if not diterima:
+            return api_galat(409, 'Match sudah diubah; muat ulang data terbaru.',
+                             match=data_match(match, nama) if match is not None else None)
+
+        sesudah = peringkat_turnamen(turnamen)
+        return jsonify(
+            api=API_VERSI,
+            match=data_match(match, nama),
+            pemain=peringkat_berubah(sebelum, sesudah),
+            urutan=[p['ID'] for p in sesudah],
+            putaran=turnamen.putaran_saat_ini,
+            putaran_baru=turnamen.putaran_saat_ini != putaran,
+        )
+
+@route_turnamen(API + '/scores', methods=['POST'])
+def api_skor_batch():
+    """
+    Body JSON: {"skor": [{"match_id": int, "skor_tim_1": int, "skor_tim_2": int,
+    "versi": int (opsional)}, ...]}. Semua skor dicatat sekaligus atau tidak
+    sama sekali; putaran dicek (dan putaran baru dibuat) hanya sekali.
+    Respons sama dengan skor tunggal, dengan `matches` berisi semua match.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        skor = [(int(s['match_id']), int(s['skor_tim_1']), int(s['skor_tim_2']),
+                 int(s['versi']) if s.get('versi') is not None else None)
+                for s in data['skor']]
+    except (KeyError, TypeError, ValueError):
+        return api_galat(400, 'skor harus berupa list {match_id, skor_tim_1, skor_tim_2, versi}.')
+    match_ids = [s[0] for s in skor]
+    if not skor or len(set(match_ids)) != len(match_ids):
+        return api_galat(400, 'skor tidak boleh kosong dan setiap match hanya boleh muncul sekali.')
+    if any(s[1] < 0 or s[2] < 0 for s in skor):
+        return api_galat(400, 'Skor tidak boleh negatif.')
+
+    turnamen = g.turnamen
+    with turnamen.kunci:
+        turnamen.sinkronkan()
+        tidak_ada = [m_id for m_id in match_ids if m_id not in turnamen.jadwal]
+        if tidak_ada:
+            return api_galat(404, 'Match tidak ditemukan.', match_ids=tidak_ada)
+        putaran = turnamen.putaran_saat_ini
+        sebelum = peringkat_turnamen(turnamen)
+
+        try:
+            ditolak = turnamen.input_skor_batch(skor)
+        except KonflikVersi:
+            ditolak = match_ids
+        nama = peta_nama(turnamen.pemain)
+        if ditolak:
+            return api_galat(409, 'Sebagian match sudah diubah; tidak ada skor yang dicatat.', match_ids=ditolak,
+                             matches=[data_match(turnamen.jadwal.get(m_id), nama) for m_id in ditolak
+                                      if m_id in turnamen.jadwal])
+
+        sesudah = peringkat_turnamen(turnamen)
+        return jsonify(
+            api=API_VERSI,
+            matches=[data_match(turnamen.jadwal.get(m_id), nama) for m_id in match_ids if m_id in turnamen.jadwal],
+            pemain=peringkat_berubah(sebelum, sesudah),
+            urutan=[p['ID'] for p in sesudah],
+            putaran=turnamen.putaran_saat_ini,
+            putaran_baru=turnamen.putaran_saat_ini != putaran,
+        )
+
+@route_turnamen(API + '/players/import', methods=['POST'])
+def api_impor_pemain():
+    """
+    Body JSON {"nama": ["...", ...]} atau teks (satu nama per baris / CSV
+    dengan header kolom nama). Semua nama masuk dalam satu operasi; nama
+    kosong, duplikat dan di atas batas roster dikembalikan di `dilewati`.
+    """
+    if request.is_json:
+        nama = (request.get_json(silent=True) or {}).get('nama')
+        if not isinstance(nama, list) or not all(isinstance(n, str) for n in nama):
+            return api_galat(400, 'nama harus berupa list string.')
+    else:
+        nama = baca_nama(request.get_data(as_text=True), format_csv=request.mimetype == 'text/csv')
+    ditambah, dilewati = g.turnamen.tambah_pemain_banyak(nama)
+    return jsonify(api=API_VERSI, ditambah=[{'ID': p_id, 'Nama': n} for p_id, n in ditambah],
+                   dilewati=[{'Nama': n, 'alasan': alasan} for n, alasan in dilewati],
+                   jumlah_pemain=len(g.turnamen.pemain))
+
+@route_turnamen(API + '/season/fold', methods=['POST', 'DELETE'])
+def api_lipat_musim():
+    """
+    POST: melipat klasemen turnamen ini ke indeks musim (menggantikan
+    lipatan sebelumnya, jadi boleh diulang). DELETE: mengeluarkannya.
+    """
+    if request.method == 'DELETE':
+        if not musim.keluarkan(g.turnamen_id):
+            return api_galat(404, 'Turnamen belum dilipat ke musim.')
+        return jsonify(api=API_VERSI, turnamen=g.turnamen_id, pemain=0)
+    jumlah = musim.lipat_turnamen(g.turnamen_id, g.turnamen)
+    return jsonify(api=API_VERSI, turnamen=g.turnamen_id, pemain=jumlah)
+
+@app.route(API + '/season/leaderboard')
+def api_klasemen_musim():
+    """Klasemen musim per halaman: ?batas=50&offset=0 (batas maks BATAS_HALAMAN_MAKS)."""
+    batas = request.args.get('batas', 50, type=int)
+    offset = request.args.get('offset', 0, type=int)
+    if not 1 <= batas <= BATAS_HALAMAN_MAKS or offset < 0:
+        return api_galat(400, f'batas harus 1-{BATAS_HALAMAN_MAKS} dan offset tidak boleh negatif.')
+    jumlah_pemain, jumlah_turnamen = musim.jumlah()
+    return jsonify(api=API_VERSI, pemain=jumlah_pemain, turnamen=jumlah_turnamen, batas=batas, offset=offset,
+                   peringkat=musim.halaman(batas, offset))
+
+@app.route(API + '/season/tournaments')
+def api_turnamen_musim():
+    """Turnamen yang sudah dilipat ke klasemen musim."""
+    return jsonify(api=API_VERSI, turnamen=musim.daftar_turnamen())
+
+# ----------------------------------------------------
+#               SIARAN LIVE (SSE)
+# ----------------------------------------------------
+@route_turnamen('/stream')
+def stream():
+    """
+    Server-Sent Events: skor, putaran baru dan perubahan klasemen (lihat
+    siaran.py). Klien yang tersambung ulang mengirim Last-Event-ID dan
+    menerima pesan yang terlewat.
+    """
+    try:
+        terakhir = int(request.headers['Last-Event-ID'])
+    except (KeyError, ValueError):
+        terakhir = None
+    siaran_turnamen = siaran.get(g.turnamen_id)
+    if siaran_turnamen is None:
+        # Turnamen baru saja dikeluarkan dari registri
+        abort(404)
+    penyiar = siaran_turnamen.penyiar
+    return Response(
+        stream_with_context(penyiar.langganan(terakhir)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 # ROUTE BARU: Menampilkan Rekap Visual
-@app.route('/rekap_visual')
+@route_turnamen('/rekap_visual')
+@cache_halaman
 def rekap_visual():
-    global pemain_df, jadwal_df
-    
-    # Hitung W/L/T final dan Peringkat (W/L/T disinkronkan)
-    pemain_final = hitung_wlt(pemain_df.copy(), jadwal_df.copy())
-    pemain_df[['W', 'L', 'T']] = pemain_final[['W', 'L', 'T']]
-    
-    pemain_final = pemain_df.copy()
-    pemain_final['Peringkat'] = pemain_final['Total_Poin'].rank(method='min', ascending=False).astype(int)
-    pemain_final = pemain_final.sort_values(by=['Peringkat', 'Total_Poin'], ascending=[True, False])
-    
-    # Buat Ranking_W_L untuk template HTML
-    pemain_final['Ranking_W_L'] = pemain_final['Total_Poin']
-    
-    # 2. Siapkan data untuk template
-    kolom_rekap = [
-        'Peringkat', 
-        'Nama', 
-        'Ranking_W_L', # Menggunakan ini untuk menyesuaikan template HTML Anda
-        'W', 'L', 'T', 
-        'Games_Played'
-    ]
-    rekap_df = pemain_final.reset_index()
-    rekap_df = rekap_df[kolom_rekap].reset_index(drop=True)
-    
+    # Peringkat final (W/L/T sudah dipelihara secara inkremental)
+    with g.turnamen.kunci:
+        rekap = tersimpan(g.turnamen, 'rekap', lambda: data_rekap(peringkat_turnamen(g.turnamen)))
+
     return render_template(
         'rekap.html', 
-        rekap=rekap_df.to_dict('records')
+        rekap=rekap
     )
 
+def turnamen_cli(turnamen_id):
+    """Turnamen untuk opsi --turnamen; turnamen yang belum dibuat adalah galat."""
+    try:
+        return registri.ambil(turnamen_id)
+    except KeyError:
+        raise click.BadParameter(f'turnamen {turnamen_id!r} belum dibuat (lihat buat-turnamen).',
+                                 param_hint='--turnamen')
+
+@app.cli.command('buat-turnamen')
+@click.argument('turnamen_id')
+def buat_turnamen(turnamen_id):
+    """Membuat turnamen baru (/t/<ID>/); tidak mengubah turnamen yang sudah ada."""
+    if registri.ada(turnamen_id):
+        click.echo(f'{turnamen_id}: sudah ada.')
+        return
+    try:
+        registri.buat(turnamen_id)
+    except KeyError:
+        raise click.BadParameter('hanya huruf, angka, _ dan - (maks 64 karakter).', param_hint='TURNAMEN_ID')
+    click.echo(f'{turnamen_id}: dibuat.')
+
+@app.cli.command('cek-klasemen')
+@click.option('--turnamen', 'turnamen_id', default=TURNAMEN_UTAMA, show_default=True)
+def cek_klasemen(turnamen_id):
+    """Membandingkan W/L/T inkremental dengan hitung ulang penuh dari seluruh jadwal."""
+    turnamen = turnamen_cli(turnamen_id)
+    beda = cek_konsistensi_wlt(turnamen.pemain_df, turnamen.semua_jadwal())
+    if beda.empty:
+        click.echo('Klasemen konsisten.')
+    else:
+        click.echo(beda.to_string())
+        raise SystemExit(1)
+
+@app.cli.command('rating')
+@click.option('--turnamen', 'turnamen_id', default=TURNAMEN_UTAMA, show_default=True)
+@click.option('--cek', is_flag=True, help='Bandingkan dengan hitung ulang batch dari seluruh jadwal_df.')
+def rating(turnamen_id, cek):
+    """Rating Elo pemain; dengan --cek, gagal jika rating inkremental berbeda dari hitung ulang."""
+    turnamen = turnamen_cli(turnamen_id)
+    with turnamen.kunci:
+        baris = data_rating(turnamen)
+        dihitung = rating_dari_jadwal_df(turnamen.semua_jadwal()) if cek else {}
+    beda = 0
+    for p in baris:
+        catatan = ''
+        if cek:
+            acuan = dihitung.get(p['ID'], RATING_AWAL)
+            if acuan != p['Rating']:
+                beda += 1
+                catatan = f'  (hitung ulang: {acuan:.3f})'
+        click.echo(f'{p["ID"]:>5}  {p["Nama"]:<24} {p["Rating"]:9.3f}{catatan}')
+    if cek:
+        if beda:
+            click.echo(f'{beda} rating berbeda dari hitung ulang.')
+            raise SystemExit(1)
+        click.echo('Rating konsisten.')
+
+@app.cli.command('ekspor')
+@click.argument('data', type=click.Choice(['matches', 'standings']))
+@click.option('--turnamen', 'turnamen_id', default=TURNAMEN_UTAMA, show_default=True)
+@click.option('--format', 'format_ekspor', type=click.Choice(sorted(MIMETYPE)), default='csv', show_default=True)
+@click.option('--keluaran', type=click.Path(dir_okay=False, writable=True), default='-', show_default=True,
+              help='File tujuan; - untuk stdout.')
+def ekspor_hasil(data, turnamen_id, format_ekspor, keluaran):
+    """Menulis seluruh match / klasemen sebagai CSV, JSON Lines atau Parquet, per potongan."""
+    try:
+        isi = ekspor(turnamen_cli(turnamen_id), data, format_ekspor)
+    except FormatTidakTersedia as e:
+        raise click.ClickException(str(e))
+    with click.open_file(keluaran, 'wb') as f:
+        for potongan in isi:
+            f.write(potongan)
+
+@app.cli.command('lipat-musim')
+@click.option('--turnamen', 'turnamen_ids', multiple=True, help='Boleh diulang; default turnamen utama.')
+@click.option('--semua', is_flag=True, help='Semua turnamen aktif dan yang tersimpan di TURNAMEN_DIR.')
+def lipat_musim(turnamen_ids, semua):
+    """Melipat klasemen turnamen ke indeks musim (mengganti lipatan sebelumnya)."""
+    for turnamen_id in registri.semua_id() if semua else turnamen_ids or [TURNAMEN_UTAMA]:
+        jumlah = musim.lipat_turnamen(turnamen_id, turnamen_cli(turnamen_id))
+        click.echo(f'{turnamen_id}: {jumlah} pemain')
+
+@app.cli.command('klasemen-musim')
+@click.option('--batas', type=click.IntRange(1, BATAS_HALAMAN_MAKS), default=20, show_default=True)
+@click.option('--offset', type=click.IntRange(0), default=0, show_default=True)
+def klasemen_musim(batas, offset):
+    """Klasemen musim (top-K / per halaman) dari indeks musim."""
+    jumlah_pemain, jumlah_turnamen = musim.jumlah()
+    click.echo(f'{jumlah_pemain} pemain dari {jumlah_turnamen} turnamen')
+    for p in musim.halaman(batas, offset):
+        click.echo(f'{p["Peringkat"]:>5}  {p["Nama"]:<24} {p["Total_Poin"]:>6}  '
+                   f'{p["W"]}/{p["L"]}/{p["T"]}  {p["Games_Played"]:>4} main  {p["Turnamen"]:>3} turnamen')
+
+@app.cli.command('turnamen-musim')
+def turnamen_musim():
+    """Turnamen yang sudah dilipat ke indeks musim."""
+    for t in musim.daftar_turnamen():
+        click.echo(f'{t["Turnamen_ID"]:<24} putaran {t["Putaran"]:>3}  {t["Pemain"]:>4} pemain')
+
+@app.cli.command('impor-pemain')
+@click.argument('berkas', type=click.File('r', encoding='utf-8-sig'))
+@click.option('--turnamen', 'turnamen_id', default=TURNAMEN_UTAMA, show_default=True)
+def impor_pemain(berkas, turnamen_id):
+    """Menambahkan roster dari berkas (satu nama per baris atau CSV; - untuk stdin) sekaligus."""
+    nama = baca_nama(berkas.read(), format_csv=getattr(berkas, 'name', '').endswith('.csv'))
+    ditambah, dilewati = turnamen_cli(turnamen_id).tambah_pemain_banyak(nama)
+    for n, alasan in dilewati:
+        click.echo(f'dilewati ({alasan}): {n}')
+    click.echo(f'{len(ditambah)} pemain ditambahkan, {len(dilewati)} dilewati.')
+
+@app.cli.command('isi-bye')
+@click.option('--turnamen', 'turnamen_id', default=TURNAMEN_UTAMA, show_default=True)
+@click.option('--timpa', is_flag=True, help='Tulis ulang juga putaran yang sudah punya catatan bye.')
+def isi_bye(turnamen_id, timpa):
+    """Mengisi buku bye dari riwayat jadwal (untuk data dari versi sebelum buku bye ada)."""
+    jumlah = turnamen_cli(turnamen_id).isi_buku_bye(timpa=timpa)
+    click.echo(f'{jumlah} putaran diisi.')
+
+@app.cli.command('keadilan')
+@click.option('--turnamen', 'turnamen_id', default=TURNAMEN_UTAMA, show_default=True)
+@click.option('--simulasi', type=int, default=0, help='Jumlah turnamen simulasi (0 = pakai --turnamen).')
+@click.option('--pemain', 'jumlah_pemain', type=int, default=12, show_default=True)
+@click.option('--lapangan', 'num_lapangan', type=int, default=2, show_default=True)
+@click.option('--putaran', 'jumlah_putaran', type=int, default=8, show_default=True)
+@click.option('--format', 'format_turnamen', type=click.Choice(['Americano', 'Mexicano']), default='Americano', show_default=True)
+@click.option('--mode', 'mode_permainan', type=click.Choice(['Double', 'Single']), default='Double', show_default=True)
+@click.option('--rencana', 'jumlah_putaran_rencana', type=int, default=0, show_default=True,
+              help='Putaran Americano yang direncanakan sekaligus.')
+@click.option('--seeding', 'seeding_mexicano', type=click.Choice(['poin', 'rating']), default='poin', show_default=True,
+              help='Urutan pembagian peringkat Mexicano.')
+def keadilan(turnamen_id, simulasi, jumlah_pemain, num_lapangan, jumlah_putaran, format_turnamen, mode_permainan,
+             jumlah_putaran_rencana, seeding_mexicano):
+    """Metrik keadilan jadwal satu turnamen, atau rata-rata/p95 atas banyak turnamen simulasi."""
+    import time
+    import numpy as np
+    if not simulasi:
+        turnamen = turnamen_cli(turnamen_id)
+        with turnamen.kunci:
+            metrik = metrik_turnamen(turnamen)
+        for nama, nilai in metrik.items():
+            click.echo(f'{nama:<28} {nilai:10.3f}')
+        return
+
+    mulai = time.perf_counter()
+    daftar = simulasikan(simulasi, jumlah_pemain, num_lapangan, jumlah_putaran, format_turnamen, mode_permainan,
+                         jumlah_putaran_rencana, seeding_mexicano=seeding_mexicano)
+    durasi_simulasi = time.perf_counter() - mulai
+    mulai = time.perf_counter()
+    hasil = hitung_metrik(daftar)
+    durasi_metrik = time.perf_counter() - mulai
+
+    click.echo(f'{simulasi} turnamen {format_turnamen}/{mode_permainan}, {jumlah_pemain} pemain, '
+               f'{num_lapangan} lapangan, {jumlah_putaran} putaran')
+    click.echo(f'{"metrik":<28} {"rata-rata":>10} {"p95":>10} {"maks":>10}')
+    for nama in METRIK:
+        nilai = hasil[nama]
+        click.echo(f'{nama:<28} {nilai.mean():10.3f} {np.percentile(nilai, 95):10.3f} {nilai.max():10.3f}')
+    click.echo(f'simulasi {durasi_simulasi:.2f} s, metrik {durasi_metrik * 1000:.1f} ms')
+
+@app.cli.command('replay')
+@click.argument('direktori', required=False)
+def replay(direktori):
+    """Membangun ulang state dari log event (default: TURNAMEN_LOG) dan mengukur waktunya."""
+    import time
+    direktori = direktori or TURNAMEN_LOG
+    if not direktori:
+        raise click.UsageError('Berikan direktori log atau set TURNAMEN_LOG.')
+
+    log = LogEvent(direktori)
+    mulai = time.perf_counter()
+    hasil = Turnamen(max_pemain=MAX_PEMAIN, log_event=log, seeding_mexicano=SEEDING_MEXICANO)
+    durasi = time.perf_counter() - mulai
+    click.echo(f'{log.jumlah_event} event, {len(hasil.pemain_df)} pemain, {len(hasil.jadwal_df)} match, '
+               f'putaran {hasil.putaran_saat_ini} - {durasi * 1000:.1f} ms')
+
 if __name__ == '__main__':
     app.run(debug=True)
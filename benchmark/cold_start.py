@@ -0,0 +1,94 @@
+"""
+Benchmark cold start (gaya serverless): setiap percobaan adalah proses Python
+baru yang mengimpor app lalu melayani request pertama. Gagal (exit 1) jika
+pandas ikut termuat di jalur request atau jika batas waktu dilewati, sehingga
+bisa dijalankan di CI.
+
+    python benchmark/cold_start.py [--ulang 5] [--maks-impor-ms 800] [--maks-request-ms 300]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dijalankan di proses baru; mencetak satu baris JSON
+SKRIP = r'''
+import json, sys, time
+mulai = time.perf_counter()
+import app as aplikasi
+impor = time.perf_counter() - mulai
+
+client = aplikasi.app.test_client()
+mulai = time.perf_counter()
+client.get('/')
+request_pertama = time.perf_counter() - mulai
+
+# Jalur request lain yang umum: pemain, putaran, skor, rekap
+mulai = time.perf_counter()
+for i in range(8):
+    client.post('/tambah_pemain', data={'nama_pemain': f'P{i}'})
+client.post('/mulai_putaran', data={'num_lapangan': 2, 'format_turnamen': 'Americano', 'mode_permainan': 'Double'})
+turnamen = aplikasi.registri.ambil('utama')
+for m in turnamen.jadwal.putaran(turnamen.putaran_saat_ini):
+    client.post(f'/input_skor/{m.match_id}', data={'skor_tim_1': 6, 'skor_tim_2': 4})
+client.get('/')
+client.get('/rekap_visual')
+alur = time.perf_counter() - mulai
+
+print(json.dumps({'impor': impor, 'request_pertama': request_pertama, 'alur': alur,
+                  'pandas': 'pandas' in sys.modules}))
+'''
+
+SKRIP_PANDAS = r'''
+import json, time
+mulai = time.perf_counter()
+import pandas
+print(json.dumps({'impor': time.perf_counter() - mulai}))
+'''
+
+
+def jalankan(skrip):
+    env = dict(os.environ)
+    for kunci in ('TURNAMEN_DB', 'TURNAMEN_LOG', 'TURNAMEN_DIR'):
+        env.pop(kunci, None)
+    hasil = subprocess.run([sys.executable, '-c', skrip], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(hasil.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ulang', type=int, default=5)
+    parser.add_argument('--maks-impor-ms', type=float, default=None)
+    parser.add_argument('--maks-request-ms', type=float, default=None)
+    args = parser.parse_args()
+
+    percobaan = [jalankan(SKRIP) for _ in range(args.ulang)]
+    impor = statistics.median(p['impor'] for p in percobaan) * 1000
+    request_pertama = statistics.median(p['request_pertama'] for p in percobaan) * 1000
+    alur = statistics.median(p['alur'] for p in percobaan) * 1000
+    impor_pandas = statistics.median(jalankan(SKRIP_PANDAS)['impor'] for _ in range(args.ulang)) * 1000
+
+    print(f'median dari {args.ulang} proses baru')
+    print(f'  import app               {impor:8.1f} ms')
+    print(f'  request pertama GET /    {request_pertama:8.1f} ms')
+    print(f'  alur pemain/skor/rekap   {alur:8.1f} ms')
+    print(f'  (pembanding) import pandas {impor_pandas:6.1f} ms')
+
+    gagal = []
+    if any(p['pandas'] for p in percobaan):
+        gagal.append('pandas termuat di jalur request')
+    if args.maks_impor_ms is not None and impor > args.maks_impor_ms:
+        gagal.append(f'import app {impor:.1f} ms > {args.maks_impor_ms} ms')
+    if args.maks_request_ms is not None and request_pertama > args.maks_request_ms:
+        gagal.append(f'request pertama {request_pertama:.1f} ms > {args.maks_request_ms} ms')
+    for pesan in gagal:
+        print('GAGAL:', pesan)
+    sys.exit(1 if gagal else 0)
+
+
+if __name__ == '__main__':
+    main()
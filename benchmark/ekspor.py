@@ -0,0 +1,124 @@
+"""
+Ekspor hasil (ekspor.py) dari arsip SQLite besar: memori puncak harus datar.
+
+Database diisi langsung dengan `--match` match Selesai (beberapa ukuran), lalu
+setiap format diekspor dengan ekspor() seperti yang dilakukan route
+/api/v1/export. Memori puncak (tracemalloc) dan throughput diukur per format,
+dibandingkan dengan jalur DataFrame (semua_jadwal().to_csv()) yang memuat
+seluruh arsip sekaligus. Gagal (exit 1) jika jumlah baris CSV / JSON Lines
+salah, atau jika memori puncak ekspor pada arsip terbesar lebih dari
+`--faktor-maks` kali memori puncak pada arsip terkecil.
+
+    python benchmark/ekspor.py [--match 20000,200000] [--format csv,jsonl,parquet]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ekspor import FormatTidakTersedia, ekspor
+from penyimpanan import PenyimpananSQLite
+from turnamen import Turnamen
+
+JUMLAH_PEMAIN = 200
+LAPANGAN = 50
+
+
+def isi_database(path, jumlah_match, acak):
+    penyimpanan = PenyimpananSQLite(path)
+    pemain = [(p_id, f'Pemain {p_id}', 0, 0, 0, 0, 0, 0) for p_id in range(1, JUMLAH_PEMAIN + 1)]
+    matches = []
+    for match_id in range(1, jumlah_match + 1):
+        a, b, c, d = acak.sample(range(1, JUMLAH_PEMAIN + 1), 4)
+        matches.append((match_id, (match_id - 1) // LAPANGAN + 1, (match_id - 1) % LAPANGAN + 1, 'Double',
+                        a, b, c, d, acak.randint(0, 21), acak.randint(0, 21), 'Selesai', 1))
+    putaran = matches[-1][1]
+    penyimpanan.simpan_perubahan(pemain=pemain, match_baru=matches, config={
+        'next_player_id': JUMLAH_PEMAIN + 1, 'next_match_id': jumlah_match + 1, 'putaran_saat_ini': putaran})
+    return penyimpanan
+
+
+def ukur(fungsi):
+    """
+    (hasil, memori puncak MB, detik) untuk fungsi(). Waktu diukur pada
+    panggilan pertama tanpa tracemalloc (yang memperlambat alokasi), memori
+    pada panggilan kedua.
+    """
+    mulai = time.perf_counter()
+    hasil = fungsi()
+    durasi = time.perf_counter() - mulai
+    tracemalloc.start()
+    fungsi()
+    _, puncak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return hasil, puncak / 2 ** 20, durasi
+
+
+def habiskan(isi):
+    """Membaca generator sampai habis (seperti server WSGI); (bytes, baris teks)."""
+    total = baris = 0
+    for potongan in isi:
+        total += len(potongan)
+        baris += potongan.count(b'\n')
+    return total, baris
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--match', default='20000,200000')
+    parser.add_argument('--format', dest='daftar_format', default='csv,jsonl,parquet')
+    parser.add_argument('--faktor-maks', type=float, default=2.0)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    acak = random.Random(args.seed)
+    ukuran_arsip = [int(n) for n in args.match.split(',')]
+    daftar_format = args.daftar_format.split(',')
+    puncak = {}
+    gagal = []
+
+    with tempfile.TemporaryDirectory() as direktori:
+        for jumlah_match in ukuran_arsip:
+            penyimpanan = isi_database(os.path.join(direktori, f'arsip-{jumlah_match}.db'), jumlah_match, acak)
+            turnamen = Turnamen(max_pemain=JUMLAH_PEMAIN, penyimpanan=penyimpanan)
+            print(f'{jumlah_match} match')
+
+            for format_ekspor in daftar_format:
+                try:
+                    ekspor(turnamen, 'matches', format_ekspor)
+                except FormatTidakTersedia as e:
+                    print(f'  {format_ekspor:<8} dilewati: {e}')
+                    continue
+                (ukuran, baris), mb, durasi = ukur(lambda: habiskan(ekspor(turnamen, 'matches', format_ekspor)))
+                puncak[jumlah_match, format_ekspor] = mb
+                print(f'  {format_ekspor:<8} puncak {mb:7.2f} MB  {ukuran / 2 ** 20:7.1f} MB keluaran  '
+                      f'{jumlah_match / durasi / 1000:7.0f} rb match/s')
+                # CSV: header + satu baris per match; JSON Lines: satu baris per match
+                harapan = {'csv': jumlah_match + 1, 'jsonl': jumlah_match}.get(format_ekspor)
+                if harapan is not None and baris != harapan:
+                    gagal.append(f'{format_ekspor} {jumlah_match} match: {baris} baris, seharusnya {harapan}')
+
+            (_, mb, durasi) = ukur(lambda: len(turnamen.semua_jadwal().to_csv()))
+            print(f'  {"to_csv":<8} puncak {mb:7.2f} MB  (DataFrame penuh, {durasi * 1000:.0f} ms)')
+
+    terkecil, terbesar = min(ukuran_arsip), max(ukuran_arsip)
+    for format_ekspor in daftar_format:
+        if (terkecil, format_ekspor) in puncak and terbesar != terkecil:
+            rasio = puncak[terbesar, format_ekspor] / puncak[terkecil, format_ekspor]
+            print(f'{format_ekspor}: puncak {terbesar} / {terkecil} match = {rasio:.2f}x')
+            if rasio > args.faktor_maks:
+                gagal.append(f'{format_ekspor}: memori puncak tumbuh {rasio:.2f}x seiring ukuran arsip')
+
+    for pesan in gagal:
+        print(f'GAGAL: {pesan}')
+    if gagal:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
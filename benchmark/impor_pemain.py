@@ -0,0 +1,98 @@
+"""
+Import roster sekaligus (tambah_pemain_banyak) vs satu pemain per panggilan.
+
+Untuk setiap ukuran roster diukur:
+  model       Turnamen.tambah_pemain N kali vs tambah_pemain_banyak sekali,
+              di memori dan dengan penyimpanan SQLite (satu transaksi vs N)
+  http        N x (POST /tambah_pemain + GET / yang dirender ulang, seperti
+              form di index.html) vs satu POST /api/v1/players/import + GET /
+Gagal (exit 1) jika roster hasil kedua jalur berbeda (nama, ID, urutan
+prioritas) atau jalur sekaligus tidak lebih cepat.
+
+    python benchmark/impor_pemain.py [--pemain 32,200,1000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+UKURAN_DEFAULT = '32,200,1000'
+
+
+def durasi_ms(fungsi):
+    mulai = time.perf_counter()
+    fungsi()
+    return (time.perf_counter() - mulai) * 1000
+
+
+def roster(turnamen):
+    return turnamen.pemain.nama, turnamen.pemain.id_aktif().tolist(), turnamen.pemain.prioritas.teratas(len(turnamen.pemain))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pemain', default=UKURAN_DEFAULT)
+    args = parser.parse_args()
+    ukuran = [int(n) for n in args.pemain.split(',')]
+
+    # Batas roster dibaca app saat diimpor
+    os.environ['MAX_PEMAIN'] = str(max(ukuran))
+    for kunci in ('TURNAMEN_DB', 'TURNAMEN_LOG', 'TURNAMEN_DIR'):
+        os.environ.pop(kunci, None)
+    import app as aplikasi
+    from penyimpanan import PenyimpananSQLite
+    from turnamen import Turnamen
+
+    client = aplikasi.app.test_client()
+    gagal = []
+    print(f'  {"jalur":<16} {"pemain":>6} {"per baris ms":>13} {"sekaligus ms":>13} {"percepatan":>11}')
+    with tempfile.TemporaryDirectory() as direktori:
+        for n in ukuran:
+            nama = [f'Pemain {i + 1}' for i in range(n)]
+
+            for jalur in ('memori', 'sqlite'):
+                def baru(tag):
+                    if jalur == 'memori':
+                        return Turnamen(max_pemain=n)
+                    return Turnamen(max_pemain=n, penyimpanan=PenyimpananSQLite(os.path.join(direktori, f'{tag}-{n}.db')))
+
+                per_baris, sekaligus = baru('per-baris'), baru('sekaligus')
+                ms_per_baris = durasi_ms(lambda: [per_baris.tambah_pemain(x) for x in nama])
+                ms_sekaligus = durasi_ms(lambda: sekaligus.tambah_pemain_banyak(nama))
+                print(f'  {"model " + jalur:<16} {n:6d} {ms_per_baris:13.1f} {ms_sekaligus:13.1f} '
+                      f'{ms_per_baris / ms_sekaligus:10.1f}x')
+                if roster(per_baris) != roster(sekaligus):
+                    gagal.append(f'model {jalur} {n} pemain: roster berbeda')
+                if ms_sekaligus >= ms_per_baris:
+                    gagal.append(f'model {jalur} {n} pemain: sekaligus tidak lebih cepat')
+
+            client.post(f'/t/form-{n}/api/v1/tournament')
+            client.post(f'/t/impor-{n}/api/v1/tournament')
+
+            def lewat_form():
+                for x in nama:
+                    client.post(f'/t/form-{n}/tambah_pemain', data={'nama_pemain': x})
+                    client.get(f'/t/form-{n}/')
+
+            def lewat_impor():
+                client.post(f'/t/impor-{n}/api/v1/players/import', json={'nama': nama})
+                client.get(f'/t/impor-{n}/')
+
+            ms_per_baris, ms_sekaligus = durasi_ms(lewat_form), durasi_ms(lewat_impor)
+            print(f'  {"http":<16} {n:6d} {ms_per_baris:13.1f} {ms_sekaligus:13.1f} {ms_per_baris / ms_sekaligus:10.1f}x')
+            if roster(aplikasi.registri.ambil(f'form-{n}')) != roster(aplikasi.registri.ambil(f'impor-{n}')):
+                gagal.append(f'http {n} pemain: roster berbeda')
+            if ms_sekaligus >= ms_per_baris:
+                gagal.append(f'http {n} pemain: sekaligus tidak lebih cepat')
+
+    for pesan in gagal:
+        print(f'GAGAL: {pesan}')
+    if gagal:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
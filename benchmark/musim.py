@@ -0,0 +1,112 @@
+"""
+Indeks klasemen musim (musim.py): biaya melipat turnamen dan latensi query.
+
+`--turnamen` turnamen sintetis (masing-masing `--pemain` pemain yang dipilih
+dari `--identitas` nama) dilipat ke IndeksMusim berbasis file, sebagian
+dilipat ulang seperti setelah koreksi skor. Lalu diukur:
+  lipat         satu turnamen (kurangi kontribusi lama + tambah yang baru)
+  top-K         halaman pertama dari indeks agregat
+  halaman       halaman di tengah / akhir (OFFSET)
+  agregasi      pembanding: GROUP BY ulang atas semua kontribusi
+Gagal (exit 1) jika hasil indeks berbeda dari agregasi ulang, atau p99
+query halaman melewati `--maks-ms`.
+
+    python benchmark/musim.py [--turnamen 500] [--pemain 100] [--identitas 20000] [--batas 50]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from musim import IndeksMusim
+
+SQL_AGREGASI_ULANG = """
+SELECT MAX(nama), SUM(total_poin), SUM(games_played), SUM(total_bye), SUM(w), SUM(l), SUM(t), COUNT(*)
+FROM kontribusi GROUP BY kunci ORDER BY SUM(total_poin) DESC, SUM(w) DESC, kunci LIMIT ? OFFSET ?
+"""
+
+
+def turnamen_acak(acak, jumlah_pemain, identitas):
+    baris = []
+    for nama in acak.sample(identitas, jumlah_pemain):
+        games = acak.randint(4, 10)
+        w = acak.randint(0, games)
+        l = acak.randint(0, games - w)
+        baris.append((nama, acak.randint(0, 21 * games), games, acak.randint(0, 3), w, l, games - w - l))
+    return baris
+
+
+def ms(fungsi, ulang):
+    hasil = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        hasil.append((time.perf_counter() - mulai) * 1000)
+    hasil.sort()
+    return statistics.median(hasil), hasil[min(len(hasil) - 1, int(len(hasil) * 0.99))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--turnamen', type=int, default=500)
+    parser.add_argument('--pemain', type=int, default=100)
+    parser.add_argument('--identitas', type=int, default=20000)
+    parser.add_argument('--batas', type=int, default=50)
+    parser.add_argument('--ulang', type=int, default=200)
+    parser.add_argument('--maks-ms', type=float, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    acak = random.Random(args.seed)
+    identitas = [f'Pemain {i}' for i in range(args.identitas)]
+    gagal = []
+
+    with tempfile.TemporaryDirectory() as direktori:
+        musim = IndeksMusim(os.path.join(direktori, 'musim.db'))
+        waktu_lipat = []
+        for i in range(args.turnamen):
+            baris = turnamen_acak(acak, args.pemain, identitas)
+            mulai = time.perf_counter()
+            musim.lipat(f't{i}', baris)
+            waktu_lipat.append((time.perf_counter() - mulai) * 1000)
+        # Lipat ulang (koreksi skor setelah turnamen ditutup)
+        for i in acak.sample(range(args.turnamen), max(1, args.turnamen // 10)):
+            musim.lipat(f't{i}', turnamen_acak(acak, args.pemain, identitas))
+
+        jumlah_pemain, jumlah_turnamen = musim.jumlah()
+        tengah = jumlah_pemain // 2
+        akhir = max(0, jumlah_pemain - args.batas)
+        conn = musim.koneksi()
+
+        print(f'{jumlah_turnamen} turnamen x {args.pemain} pemain, {jumlah_pemain} identitas di klasemen musim')
+        print(f'  lipat satu turnamen    p50 {statistics.median(waktu_lipat):7.2f} ms   '
+              f'maks {max(waktu_lipat):7.2f} ms')
+        for nama, offset in [('top-K', 0), ('halaman tengah', tengah), ('halaman akhir', akhir)]:
+            p50, p99 = ms(lambda: musim.halaman(args.batas, offset), args.ulang)
+            print(f'  {nama:<22} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms')
+            if p99 > args.maks_ms:
+                gagal.append(f'{nama}: p99 {p99:.2f} ms melewati {args.maks_ms} ms')
+
+            # Konsistensi dengan agregasi ulang (nama: lipatan terakhir bisa berbeda kapitalisasi, jadi dibandingkan angkanya)
+            indeks = [tuple(p[k] for k in ('Total_Poin', 'Games_Played', 'Total_Bye', 'W', 'L', 'T', 'Turnamen'))
+                      for p in musim.halaman(args.batas, offset)]
+            ulang = [row[1:] for row in conn.execute(SQL_AGREGASI_ULANG, (args.batas, offset)).fetchall()]
+            if indeks != ulang:
+                gagal.append(f'{nama}: indeks agregat berbeda dari agregasi ulang')
+
+        p50, p99 = ms(lambda: conn.execute(SQL_AGREGASI_ULANG, (args.batas, 0)).fetchall(), max(5, args.ulang // 20))
+        print(f'  {"agregasi ulang (top-K)":<22} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms   (pembanding)')
+
+    for pesan in gagal:
+        print(f'GAGAL: {pesan}')
+    if gagal:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
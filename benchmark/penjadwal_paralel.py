@@ -0,0 +1,125 @@
+"""
+Pencarian jadwal paralel (penjadwal_paralel.py) vs jalur cepat susun_grup.
+
+Riwayat partner/lawan dibangun dari turnamen Americano yang sudah berjalan
+banyak putaran (pengulangan tidak bisa dihindari lagi), lalu satu putaran
+berikutnya dicari berulang kali dengan:
+  jalur cepat      susun_grup biasa (greedy + local search BATAS_WAKTU_DEFAULT)
+  N proses         MesinParalel dengan N pekerja dan tenggat `--tenggat-ms`
+
+Kualitas = biaya pengulangan (partner x BOBOT_PARTNER + lawan x BOBOT_LAWAN),
+makin kecil makin baik. "Perbaikan/ms" = penurunan biaya rata-rata terhadap
+jalur cepat dibagi latensi rata-rata; angka ini yang naik seiring jumlah
+core. Selain itu rencana Americano `--rencana` putaran sekaligus diukur:
+seluruh rencana berbagi satu tenggat, jadi harus selesai dalam waktu
+rencana jalur cepat + satu tenggat. Gagal (exit 1) jika p99 latensi satu
+putaran atau waktu rencana melewati batasnya + `--toleransi-ms`.
+
+    python benchmark/penjadwal_paralel.py [--pemain 48] [--lapangan 12] [--riwayat 15] [--rencana 8]
+                                          [--proses 1,2,4] [--tenggat-ms 50] [--ulang 30]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import penjadwal
+import penjadwal_paralel
+from penjadwal import BOBOT_LAWAN, BOBOT_PARTNER, rencanakan_americano, susun_grup
+from turnamen import Turnamen
+
+
+def biaya(grup_lapangan, riwayat):
+    total = 0
+    for a, b, c, d in grup_lapangan:
+        total += BOBOT_PARTNER * (riwayat.partner[a, b] + riwayat.partner[c, d])
+        total += BOBOT_LAWAN * (riwayat.lawan[a, c] + riwayat.lawan[a, d] + riwayat.lawan[b, c] + riwayat.lawan[b, d])
+    return int(total)
+
+
+def ukur(pemain_ids, riwayat, ulang):
+    """(biaya per percobaan, latensi ms per percobaan) dengan mesin yang sedang terpasang."""
+    hasil_biaya, latensi = [], []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        grup = susun_grup(pemain_ids, riwayat, 4)
+        latensi.append((time.perf_counter() - mulai) * 1000)
+        hasil_biaya.append(biaya(grup, riwayat))
+    return np.array(hasil_biaya), np.array(latensi)
+
+
+def ukur_rencana(turnamen, jumlah_putaran, num_lapangan, ulang):
+    """Latensi ms terlama rencanakan_americano `jumlah_putaran` putaran dengan mesin yang sedang terpasang."""
+    latensi = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        rencanakan_americano(turnamen.pemain, jumlah_putaran, num_lapangan, 4, turnamen.riwayat_pasangan)
+        latensi.append((time.perf_counter() - mulai) * 1000)
+    return max(latensi)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pemain', type=int, default=48)
+    parser.add_argument('--lapangan', type=int, default=12)
+    parser.add_argument('--riwayat', type=int, default=15, help='putaran yang sudah dimainkan')
+    parser.add_argument('--rencana', type=int, default=8, help='putaran Americano yang direncanakan sekaligus')
+    parser.add_argument('--proses', default=','.join(str(n) for n in sorted({1, 2, os.cpu_count() or 1})))
+    parser.add_argument('--tenggat-ms', type=float, default=50)
+    parser.add_argument('--toleransi-ms', type=float, default=15)
+    parser.add_argument('--ulang', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    turnamen = Turnamen(max_pemain=args.pemain)
+    for i in range(args.pemain):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(args.lapangan, 'Americano', 'Double')
+    for _ in range(args.riwayat - 1):
+        turnamen.input_skor_batch([(m.match_id, 21, 15, None) for m in turnamen.jadwal.putaran(turnamen.putaran_saat_ini)])
+    riwayat = turnamen.riwayat_pasangan
+    pemain_ids = turnamen.pemain.prioritas.teratas(args.lapangan * 4)
+
+    print(f'{args.pemain} pemain, {args.lapangan} lapangan, riwayat {args.riwayat} putaran, '
+          f'{os.cpu_count()} core, tenggat {args.tenggat_ms:.0f} ms')
+    print(f'  {"mesin":<12} {"biaya rata2":>11} {"biaya min":>9} {"ms rata2":>9} {"ms p99":>8} {"perbaikan/ms":>13}')
+
+    biaya_cepat, latensi_cepat = ukur(pemain_ids, riwayat, args.ulang)
+    rencana_cepat = ukur_rencana(turnamen, args.rencana, args.lapangan, 3)
+    print(f'  {"jalur cepat":<12} {biaya_cepat.mean():11.1f} {biaya_cepat.min():9d} {latensi_cepat.mean():9.1f} '
+          f'{np.percentile(latensi_cepat, 99):8.1f} {"-":>13}   (rencana {args.rencana} putaran {rencana_cepat:.0f} ms)')
+
+    gagal = []
+    for jumlah_proses in [int(n) for n in args.proses.split(',')]:
+        mesin = penjadwal_paralel.pasang(jumlah_proses, args.tenggat_ms / 1000, min_pemain=1)
+        try:
+            hasil_biaya, latensi = ukur(pemain_ids, riwayat, args.ulang)
+            rencana = ukur_rencana(turnamen, args.rencana, args.lapangan, 3)
+        finally:
+            penjadwal_paralel.lepas()
+        perbaikan = (biaya_cepat.mean() - hasil_biaya.mean()) / latensi.mean()
+        p99 = np.percentile(latensi, 99)
+        print(f'  {f"{jumlah_proses} proses":<12} {hasil_biaya.mean():11.1f} {hasil_biaya.min():9d} {latensi.mean():9.1f} '
+              f'{p99:8.1f} {perbaikan:13.3f}   (cadangan {mesin.jumlah_cadangan}/{mesin.jumlah_cari}, '
+              f'rencana {rencana:.0f} ms)')
+        if p99 > args.tenggat_ms + args.toleransi_ms:
+            gagal.append(f'{jumlah_proses} proses: p99 {p99:.1f} ms melewati tenggat {args.tenggat_ms:.0f} ms')
+        if rencana > rencana_cepat + args.tenggat_ms + args.toleransi_ms:
+            gagal.append(f'{jumlah_proses} proses: rencana {args.rencana} putaran {rencana:.0f} ms melewati '
+                         f'{rencana_cepat:.0f} ms + satu tenggat')
+
+    assert penjadwal._mesin_paralel is None
+    for pesan in gagal:
+        print(f'GAGAL: {pesan}')
+    if gagal:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
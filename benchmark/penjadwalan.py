@@ -0,0 +1,86 @@
+"""
+Skala penjadwalan: memilih pemain yang bermain di putaran baru dengan
+lexsort seluruh roster (cara lama) dibandingkan IndeksPrioritas yang
+dipelihara tabel, biaya tambahan memelihara indeks per skor, dan waktu
+mulai_putaran lengkap untuk liga besar.
+
+    python benchmark/penjadwalan.py [--ulang 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tabel import K_BYE, K_GAMES, K_POIN, TabelPemain
+from turnamen import Turnamen
+
+SKALA = [(32, 4), (200, 30), (1000, 100)]
+
+
+def buat_tabel(jumlah_pemain, acak):
+    return TabelPemain.dari_baris([(i, f'Pemain {i}', acak.randint(0, 300), acak.randint(5, 8), acak.randint(0, 2), 0, 0, 0)
+                                   for i in range(1, jumlah_pemain + 1)])
+
+
+def pilih_lexsort(pemain, total_slots):
+    """Cara lama di buat_jadwal: urutkan seluruh roster setiap putaran."""
+    ids = pemain.id_aktif()
+    acak = np.array([random.random() for _ in range(len(ids))])
+    urutan = np.lexsort((acak, -pemain.kolom(K_POIN), pemain.kolom(K_GAMES), -pemain.kolom(K_BYE)))
+    return ids[urutan].tolist()[:total_slots]
+
+
+def ukur(fungsi, ulang):
+    return min(timeit.repeat(fungsi, number=ulang, repeat=5)) / ulang * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ulang', type=int, default=200)
+    args = parser.parse_args()
+
+    acak = random.Random(1)
+    print('Pilih pemain untuk putaran baru (us):')
+    for jumlah_pemain, jumlah_lapangan in SKALA:
+        pemain = buat_tabel(jumlah_pemain, acak)
+        slot = jumlah_lapangan * 4
+        lama = ukur(lambda: pilih_lexsort(pemain, slot), args.ulang)
+        baru = ukur(lambda: pemain.prioritas.teratas_acak(slot), args.ulang)
+        print(f'  {jumlah_pemain:5} pemain {jumlah_lapangan:4} lapangan: lexsort {lama:8.1f}   indeks {baru:8.1f}')
+
+    print('Catat skor (terapkan_skor, 4 pemain) termasuk memelihara indeks (us):')
+    for jumlah_pemain, _ in SKALA:
+        pemain = buat_tabel(jumlah_pemain, acak)
+        ids = pemain.id_aktif().tolist()
+        tim = [acak.sample(ids, 4) for _ in range(args.ulang)]
+
+        def catat():
+            for t in tim:
+                pemain.terapkan_skor(t[:2], t[2:], 21, 15)
+        print(f'  {jumlah_pemain:5} pemain: {ukur(catat, 1) / args.ulang:8.1f}')
+
+    print('mulai_putaran lengkap (ms):')
+    for jumlah_pemain, jumlah_lapangan in SKALA[1:]:
+        for format_turnamen in ('Americano', 'Mexicano'):
+            turnamen = Turnamen(max_pemain=jumlah_pemain)
+            for i in range(jumlah_pemain):
+                turnamen.tambah_pemain(f'Pemain {i + 1}')
+            durasi = []
+            for _ in range(3):
+                mulai = time.perf_counter()
+                turnamen.mulai_putaran(jumlah_lapangan, format_turnamen, 'Double')
+                durasi.append((time.perf_counter() - mulai) * 1000)
+                for m in turnamen.jadwal.putaran(turnamen.putaran_saat_ini):
+                    turnamen.input_skor(m.match_id, acak.randint(0, 21), acak.randint(0, 21))
+            print(f'  {jumlah_pemain:5} pemain {jumlah_lapangan:4} lapangan {format_turnamen:<9} '
+                  f'{min(durasi):8.1f} (jadwal berikutnya dibuat otomatis saat skor terakhir masuk)')
+
+
+if __name__ == '__main__':
+    main()
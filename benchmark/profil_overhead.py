@@ -0,0 +1,69 @@
+"""
+Biaya instrumentasi (profil.py) saat mati dan saat hidup.
+
+Mengukur biaya tambahan per panggilan `terukur` / `span` pada fungsi kosong,
+dan waktu input_skor + data_index (32 pemain / 8 lapangan) dengan
+instrumentasi mati dan hidup. Gagal (exit 1) jika biaya per span saat mati
+lebih dari `--maks-ns`.
+
+    python benchmark/profil_overhead.py [--ulang 200000] [--maks-ns 500]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profil
+from tampilan import data_index
+from turnamen import Turnamen
+
+
+def per_panggilan_ns(fungsi, ulang):
+    return min(timeit.repeat(fungsi, number=ulang, repeat=5)) / ulang * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ulang', type=int, default=200000)
+    parser.add_argument('--maks-ns', type=float, default=500)
+    args = parser.parse_args()
+
+    def kosong():
+        return None
+    dibungkus = profil.terukur('kosong')(kosong)
+
+    def dengan_span():
+        with profil.span('kosong'):
+            return None
+
+    turnamen = Turnamen(max_pemain=32)
+    for i in range(32):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(8, 'Americano', 'Double')
+    match_id = turnamen.jadwal.putaran(1)[0].match_id
+
+    def alur():
+        turnamen.input_skor(match_id, 21, 15)
+        data_index(turnamen)
+
+    hasil = {}
+    for label, nyala in (('mati', False), ('hidup', True)):
+        profil._aktif = nyala
+        hasil[label] = (per_panggilan_ns(dibungkus, args.ulang) - per_panggilan_ns(kosong, args.ulang),
+                        per_panggilan_ns(dengan_span, args.ulang) - per_panggilan_ns(kosong, args.ulang),
+                        per_panggilan_ns(alur, args.ulang // 100) / 1000)
+    profil._aktif = False
+
+    for label, (terukur_ns, span_ns, alur_us) in hasil.items():
+        print(f'{label:>5}: terukur +{terukur_ns:6.0f} ns   span +{span_ns:6.0f} ns   '
+              f'input_skor + data_index {alur_us:7.1f} us')
+
+    if max(hasil['mati'][:2]) > args.maks_ns:
+        print(f'GAGAL: biaya per span saat mati lebih dari {args.maks_ns:.0f} ns')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Rating Elo (rating.py): biaya per skor, seeding Mexicano, dan hitung ulang batch.
+
+Mengukur:
+  per skor      MesinRating.terapkan untuk satu match (termasuk membatalkan delta lama)
+  seeding       urutan pemain yang bermain: indeks rating vs sort_values roster (jalur lama)
+  batch         hitung ulang seluruh riwayat dari jadwal_df (rating_dari_jadwal_df)
+
+Turnamen disimulasikan dengan skor acak dan koreksi skor; gagal (exit 1) jika
+rating inkremental berbeda dari hitung ulang batch.
+
+    python benchmark/rating.py [--pemain 120] [--lapangan 30] [--putaran 40] [--ulang 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rating import SATUAN, rating_dari_jadwal_df
+from turnamen import Turnamen
+
+
+def per_panggilan_us(fungsi, ulang):
+    return min(timeit.repeat(fungsi, number=ulang, repeat=5)) / ulang * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pemain', type=int, default=120)
+    parser.add_argument('--lapangan', type=int, default=30)
+    parser.add_argument('--putaran', type=int, default=40)
+    parser.add_argument('--ulang', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    acak = random.Random(args.seed)
+    turnamen = Turnamen(max_pemain=args.pemain, seeding_mexicano='rating')
+    for i in range(args.pemain):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(args.lapangan, 'Mexicano', 'Double')
+    for _ in range(args.putaran):
+        matches = turnamen.jadwal.putaran(turnamen.putaran_saat_ini)
+        # Satu koreksi per putaran, lalu semua skor (skor terakhir membuat putaran baru)
+        turnamen.input_skor(matches[0].match_id, acak.randint(0, 21), acak.randint(0, 21))
+        for m in matches:
+            turnamen.input_skor(m.match_id, acak.randint(0, 21), acak.randint(0, 21))
+
+    # --- Konsistensi: inkremental == batch ---
+    dihitung = rating_dari_jadwal_df(turnamen.jadwal_df)
+    beda = [p_id for p_id, nilai in turnamen.rating.rating.items() if dihitung.get(p_id) != nilai / SATUAN]
+
+    # --- Biaya ---
+    rating = turnamen.rating
+    match = turnamen.jadwal.putaran(turnamen.putaran_saat_ini - 1)[0]
+    per_skor = per_panggilan_us(lambda: rating.terapkan([match]), args.ulang)
+
+    bermain = turnamen.pemain.prioritas.teratas(args.lapangan * 4)
+    pemain_df = turnamen.pemain_df
+    seeding_indeks = per_panggilan_us(lambda: rating.urutkan(bermain), args.ulang // 10)
+    seeding_pandas = per_panggilan_us(
+        lambda: pemain_df.loc[bermain].sort_values('Total_Poin', ascending=False, kind='stable').index.tolist(),
+        args.ulang // 10)
+
+    jadwal_df = turnamen.jadwal_df
+    batch_ms = per_panggilan_us(lambda: rating_dari_jadwal_df(jadwal_df), 5) / 1000
+
+    print(f'{args.pemain} pemain, {args.lapangan} lapangan, {args.putaran} putaran ({len(jadwal_df)} match)')
+    print(f'  per skor            {per_skor:8.1f} us')
+    print(f'  seeding (indeks)    {seeding_indeks:8.1f} us   sort_values {seeding_pandas:8.1f} us')
+    print(f'  hitung ulang batch  {batch_ms:8.2f} ms')
+
+    if beda:
+        print(f'GAGAL: {len(beda)} rating inkremental berbeda dari hitung ulang batch')
+        raise SystemExit(1)
+    print('OK: rating inkremental sama dengan hitung ulang batch')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Biaya CPU per skor dengan dan tanpa penonton siaran live (/stream).
+
+Server Flask dijalankan sungguhan (werkzeug, threaded) dan `--penonton`
+koneksi SSE dibuka ke /stream. Skor dicatat langsung lewat Turnamen.input_skor
+di thread utama; CPU thread itu (time.thread_time) per skor dibandingkan
+antara 1 penonton dan `--penonton` penonton (dengan 0 penonton diff tidak
+dihitung sama sekali, angkanya ditampilkan sebagai acuan). Gagal (exit 1) jika
+biayanya naik lebih dari `--toleransi` kali, atau ada penonton yang tidak
+menerima semua skor.
+
+    python benchmark/siaran_penonton.py [--penonton 200] [--skor 300]
+"""
+import argparse
+import http.client
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def penonton(port, jumlah_skor, siap, hasil):
+    koneksi = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    koneksi.request('GET', '/stream')
+    respon = koneksi.getresponse()
+    siap.release()
+    diterima = 0
+    while diterima < jumlah_skor:
+        baris = respon.fp.readline()
+        if not baris:
+            break
+        if baris == b'event: skor\n':
+            diterima += 1
+    hasil.append(diterima)
+    koneksi.close()
+
+
+def ukur(turnamen, match_id, jumlah_skor):
+    """CPU thread pencatat skor (mikrodetik) per skor."""
+    durasi = []
+    for i in range(jumlah_skor):
+        mulai = time.thread_time_ns()
+        turnamen.input_skor(match_id, i % 22, 21 - i % 22)
+        durasi.append((time.thread_time_ns() - mulai) / 1000)
+    return durasi
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pemain', type=int, default=32)
+    parser.add_argument('--lapangan', type=int, default=8)
+    parser.add_argument('--penonton', type=int, default=200)
+    parser.add_argument('--skor', type=int, default=300)
+    parser.add_argument('--toleransi', type=float, default=1.5)
+    args = parser.parse_args()
+
+    from werkzeug.serving import make_server
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    import app as aplikasi
+    from registri import TURNAMEN_UTAMA
+
+    turnamen = aplikasi.registri.ambil(TURNAMEN_UTAMA)
+    turnamen.max_pemain = max(turnamen.max_pemain, args.pemain)
+    for i in range(args.pemain):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(args.lapangan, 'Americano', 'Double')
+    # Koreksi berulang pada satu match: putaran tidak pernah selesai, setiap skor = satu event 'skor'
+    match_id = turnamen.jadwal.putaran(turnamen.putaran_saat_ini)[0].match_id
+
+    server = make_server('127.0.0.1', 0, aplikasi.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    penyiar = aplikasi.siaran[TURNAMEN_UTAMA].penyiar
+
+    def dengan_penonton(jumlah):
+        siap, hasil = threading.Semaphore(0), []
+        threads = [threading.Thread(target=penonton, args=(server.port, args.skor, siap, hasil), daemon=True)
+                   for _ in range(jumlah)]
+        for t in threads:
+            t.start()
+        for _ in threads:
+            siap.acquire()
+        while penyiar.pelanggan < jumlah:
+            time.sleep(0.01)
+        ukur(turnamen, match_id, 20)  # pemanasan; penonton berhenti setelah `args.skor` skor
+        durasi = ukur(turnamen, match_id, args.skor - 20)
+        for t in threads:
+            t.join(timeout=60)
+        while penyiar.pelanggan:
+            time.sleep(0.01)
+        return durasi, hasil
+
+    ukur(turnamen, match_id, 50)  # pemanasan
+    nol = ukur(turnamen, match_id, args.skor)
+    satu, _ = dengan_penonton(1)
+    banyak, hasil = dengan_penonton(args.penonton)
+    server.shutdown()
+
+    for label, durasi in (('0 penonton', nol), ('1 penonton', satu), (f'{args.penonton} penonton', banyak)):
+        print(f'{label:>14}: median {statistics.median(durasi):8.1f} us/skor  (rata-rata {statistics.mean(durasi):.1f})')
+    lengkap = sum(1 for n in hasil if n == args.skor)
+    print(f'{lengkap}/{args.penonton} penonton menerima {args.skor} skor')
+
+    gagal = False
+    rasio = statistics.median(banyak) / statistics.median(satu)
+    if rasio > args.toleransi:
+        print(f'GAGAL: biaya per skor naik {rasio:.2f}x dengan {args.penonton} penonton')
+        gagal = True
+    if lengkap != args.penonton:
+        print('GAGAL: ada penonton yang tidak menerima semua skor')
+        gagal = True
+    if gagal:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
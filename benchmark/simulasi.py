@@ -0,0 +1,206 @@
+"""
+Simulator turnamen headless: menjalankan app Flask lewat test client untuk
+kombinasi format (Americano/Mexicano) dan mode (Double/Single) dengan skor
+acak, lalu mencatat latensi per operasi (p50/p95/p99) dan memori puncak
+(tracemalloc, pada lintasan terpisah agar tidak mengganggu latensi).
+
+Operasi yang diukur:
+  tambah_pemain, mulai_putaran, input_skor    POST seperti dari browser
+                                              (skor terakhir putaran ikut membuat putaran baru)
+  index, rekap_visual                         GET halaman (cache per versi state ikut bekerja)
+  buat_jadwal, hitung_wlt                     dipanggil langsung pada state saat itu
+
+Setelah simulasi, klasemen dicek konsisten (W/L/T, games, jumlah putaran).
+Hasil dibandingkan dengan baseline (`--baseline`, default
+benchmark/baseline_simulasi.json): gagal (exit 1) jika p95 suatu operasi
+lebih dari `--toleransi` kali baseline (dan lebih dari `--lantai-ms` di
+atasnya), atau memori puncak lebih dari `--toleransi-memori` kali baseline.
+Baseline bergantung mesin; perbarui dengan --simpan-baseline.
+
+    python benchmark/simulasi.py [--pemain 32] [--lapangan 8] [--putaran 10]
+                                 [--format semua] [--mode semua] [--simpan-baseline]
+"""
+import argparse
+import gc
+import itertools
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BASELINE = os.path.join(ROOT, 'benchmark', 'baseline_simulasi.json')
+FORMAT = ['Americano', 'Mexicano']
+MODE = ['Double', 'Single']
+OPERASI = ['tambah_pemain', 'mulai_putaran', 'input_skor', 'index', 'rekap_visual', 'buat_jadwal', 'hitung_wlt']
+
+
+class Pencatat:
+    """Mengumpulkan durasi (ms) per nama operasi."""
+
+    def __init__(self, aktif=True):
+        self.aktif = aktif
+        self.durasi = {}
+
+    def ukur(self, nama, fungsi, *args, **kwargs):
+        if not self.aktif:
+            return fungsi(*args, **kwargs)
+        mulai = time.perf_counter()
+        hasil = fungsi(*args, **kwargs)
+        self.durasi.setdefault(nama, []).append((time.perf_counter() - mulai) * 1000)
+        return hasil
+
+    def ringkasan(self):
+        return {nama: {'n': len(d), **{f'p{p}_ms': round(float(np.percentile(d, p)), 4) for p in (50, 95, 99)}}
+                for nama, d in self.durasi.items()}
+
+
+def simulasi(aplikasi, turnamen_id, args, format_turnamen, mode, acak, pencatat):
+    """Satu turnamen penuh; mengembalikan objek Turnamen untuk dicek."""
+    from klasemen import hitung_wlt
+    from turnamen import buat_jadwal
+
+    client = aplikasi.app.test_client()
+    awalan = f'/t/{turnamen_id}'
+    client.post(awalan + '/api/v1/tournament')
+    turnamen = aplikasi.registri.ambil(turnamen_id)
+
+    for i in range(args.pemain):
+        pencatat.ukur('tambah_pemain', client.post, awalan + '/tambah_pemain', data={'nama_pemain': f'Pemain {i + 1}'})
+    pencatat.ukur('mulai_putaran', client.post, awalan + '/mulai_putaran',
+                  data={'num_lapangan': args.lapangan, 'format_turnamen': format_turnamen, 'mode_permainan': mode})
+
+    for _ in range(args.putaran):
+        with turnamen.kunci:
+            matches = [(m.match_id, m.versi) for m in turnamen.jadwal.putaran(turnamen.putaran_saat_ini)]
+            # Jadwal putaran berikutnya dari state saat ini, tanpa mengubah turnamen
+            pencatat.ukur('buat_jadwal', buat_jadwal, turnamen.pemain, turnamen.putaran_saat_ini + 1, args.lapangan,
+                          mode, format_turnamen, turnamen.riwayat_pasangan, itertools.count(1).__next__)
+        for match_id, versi in matches:
+            pencatat.ukur('input_skor', client.post, f'{awalan}/input_skor/{match_id}',
+                          data={'skor_tim_1': acak.randint(0, 21), 'skor_tim_2': acak.randint(0, 21), 'versi': versi})
+            pencatat.ukur('index', client.get, awalan + '/')
+        pencatat.ukur('hitung_wlt', hitung_wlt, turnamen.pemain_df[['Nama']].copy(), turnamen.semua_jadwal())
+
+    pencatat.ukur('rekap_visual', client.get, awalan + '/rekap_visual')
+    return turnamen
+
+
+def cek_hasil(turnamen, args, mode):
+    """Daftar pesan kegagalan (kosong jika klasemen konsisten)."""
+    from klasemen import cek_konsistensi_wlt
+
+    gagal = []
+    jadwal = turnamen.semua_jadwal()
+    pemain_df = turnamen.pemain_df
+    if not cek_konsistensi_wlt(pemain_df, jadwal).empty:
+        gagal.append('W/L/T tidak konsisten dengan hitung ulang')
+    selesai = jadwal[jadwal['Status'] == 'Selesai']
+    per_tim = 2 if mode == 'Double' else 1
+    if int(pemain_df['Games_Played'].sum()) != len(selesai) * 2 * per_tim:
+        gagal.append('jumlah Games_Played tidak sama dengan match selesai')
+    if turnamen.putaran_saat_ini != args.putaran + 1:
+        gagal.append(f'putaran saat ini {turnamen.putaran_saat_ini}, seharusnya {args.putaran + 1}')
+    return gagal
+
+
+def bandingkan(nama, hasil, baseline, args):
+    """Pesan regresi terhadap baseline skenario ini."""
+    regresi = []
+    for operasi, angka in hasil['operasi'].items():
+        acuan = baseline['operasi'].get(operasi)
+        if acuan is None:
+            continue
+        batas = max(acuan['p95_ms'] * args.toleransi, acuan['p95_ms'] + args.lantai_ms)
+        if angka['p95_ms'] > batas:
+            regresi.append(f'{nama} {operasi}: p95 {angka["p95_ms"]:.2f} ms > batas {batas:.2f} ms '
+                           f'(baseline {acuan["p95_ms"]:.2f})')
+    batas = baseline['memori_puncak_kib'] * args.toleransi_memori
+    if hasil['memori_puncak_kib'] > batas:
+        regresi.append(f'{nama} memori puncak {hasil["memori_puncak_kib"]:.0f} KiB > batas {batas:.0f} KiB')
+    return regresi
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pemain', type=int, default=32)
+    parser.add_argument('--lapangan', type=int, default=8)
+    parser.add_argument('--putaran', type=int, default=10)
+    parser.add_argument('--format', choices=FORMAT + ['semua'], default='semua')
+    parser.add_argument('--mode', choices=MODE + ['semua'], default='semua')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--simpan-baseline', action='store_true', help='tulis hasil run ini sebagai baseline')
+    parser.add_argument('--toleransi', type=float, default=2.0)
+    parser.add_argument('--lantai-ms', type=float, default=1.0, help='selisih p95 minimum yang dianggap regresi')
+    parser.add_argument('--toleransi-memori', type=float, default=1.5)
+    args = parser.parse_args()
+
+    # Batas roster/lapangan dibaca app saat diimpor
+    os.environ['MAX_PEMAIN'] = str(max(args.pemain, int(os.environ.get('MAX_PEMAIN', 0))))
+    os.environ['MAX_LAPANGAN'] = str(max(args.lapangan, int(os.environ.get('MAX_LAPANGAN', 0))))
+    import app as aplikasi
+
+    skenario = [(f, m) for f in (FORMAT if args.format == 'semua' else [args.format])
+                for m in (MODE if args.mode == 'semua' else [args.mode])]
+    # Pemanasan: import lazy, kompilasi template, dsb. tidak ikut terukur di skenario pertama
+    simulasi(aplikasi, 'pemanasan', argparse.Namespace(pemain=8, lapangan=2, putaran=2), 'Americano', 'Double',
+             random.Random(0), Pencatat(aktif=False))
+
+    semua_hasil, gagal = {}, []
+    for format_turnamen, mode in skenario:
+        nama = f'{format_turnamen}-{mode}-{args.pemain}p-{args.lapangan}l-{args.putaran}r'
+        random.seed(args.seed)
+
+        pencatat = Pencatat()
+        turnamen = simulasi(aplikasi, f'sim-{nama}', args, format_turnamen, mode, random.Random(args.seed), pencatat)
+        gagal += [f'{nama}: {pesan}' for pesan in cek_hasil(turnamen, args, mode)]
+
+        # Lintasan kedua hanya untuk memori (tracemalloc memperlambat setiap alokasi)
+        gc.collect()
+        tracemalloc.start()
+        simulasi(aplikasi, f'mem-{nama}', args, format_turnamen, mode, random.Random(args.seed), Pencatat(aktif=False))
+        _, puncak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        hasil = semua_hasil[nama] = {'operasi': pencatat.ringkasan(), 'memori_puncak_kib': round(puncak / 1024, 1)}
+        print(f'{nama}  (memori puncak {hasil["memori_puncak_kib"]:.0f} KiB)')
+        for operasi in OPERASI:
+            angka = hasil['operasi'].get(operasi)
+            if angka:
+                print(f'  {operasi:<14} n={angka["n"]:<5} p50 {angka["p50_ms"]:8.3f}  '
+                      f'p95 {angka["p95_ms"]:8.3f}  p99 {angka["p99_ms"]:8.3f} ms')
+
+    if args.simpan_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(semua_hasil)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+            f.write('\n')
+        print(f'Baseline disimpan: {args.baseline}')
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for nama, hasil in semua_hasil.items():
+            if nama in baseline:
+                gagal += bandingkan(nama, hasil, baseline[nama], args)
+            else:
+                print(f'(tidak ada baseline untuk {nama})')
+
+    for pesan in gagal:
+        print(f'GAGAL: {pesan}')
+    if gagal:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
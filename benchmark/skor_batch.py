@@ -0,0 +1,73 @@
+"""
+Mencatat skor satu putaran penuh: satu input_skor per match (cara lama)
+dibandingkan satu input_skor_batch, keduanya dari state yang sama. Klasemen
+hasil kedua cara dicek sama, lalu waktu per putaran (termasuk pembuatan
+putaran berikutnya, yang pada kedua cara hanya terjadi sekali) ditampilkan.
+
+    python benchmark/skor_batch.py [--putaran 20]
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from turnamen import Turnamen
+
+SKALA = [(32, 8), (120, 30)]
+
+
+def salin(turnamen):
+    """Turnamen baru dengan state yang sama (pencarian jadwal dibatasi waktu, jadi tidak di-replay)."""
+    hasil = Turnamen(max_pemain=turnamen.max_pemain)
+    hasil.pasang_state(copy.deepcopy(turnamen.ke_state()))
+    return hasil
+
+
+def catat_per_match(turnamen, skor):
+    for match_id, skor_1, skor_2, versi in skor:
+        turnamen.input_skor(match_id, skor_1, skor_2, versi)
+
+
+def ukur(turnamen, skor, catat):
+    mulai = time.perf_counter()
+    catat(turnamen, skor)
+    return (time.perf_counter() - mulai) * 1000
+
+
+def jalankan(jumlah_pemain, jumlah_lapangan, jumlah_putaran):
+    """Setiap putaran dicatat dengan kedua cara dari state yang sama; klasemen hasilnya harus sama."""
+    acak = random.Random(1)
+    turnamen = Turnamen(max_pemain=jumlah_pemain)
+    for i in range(jumlah_pemain):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(jumlah_lapangan, 'Americano', 'Double')
+
+    durasi_satu, durasi_batch = [], []
+    for _ in range(jumlah_putaran):
+        skor = [(m.match_id, acak.randint(0, 21), acak.randint(0, 21), m.versi)
+                for m in turnamen.jadwal.putaran(turnamen.putaran_saat_ini)]
+        pembanding = salin(turnamen)
+        durasi_satu.append(ukur(pembanding, skor, catat_per_match))
+        durasi_batch.append(ukur(turnamen, skor, Turnamen.input_skor_batch))
+        if pembanding.ke_state()['pemain'] != turnamen.ke_state()['pemain']:
+            raise SystemExit(f'GAGAL: klasemen berbeda pada {jumlah_pemain} pemain / {jumlah_lapangan} lapangan')
+    return min(durasi_satu), min(durasi_batch)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--putaran', type=int, default=20)
+    args = parser.parse_args()
+
+    for jumlah_pemain, jumlah_lapangan in SKALA:
+        satu, batch = jalankan(jumlah_pemain, jumlah_lapangan, args.putaran)
+        print(f'{jumlah_pemain:4} pemain {jumlah_lapangan:3} lapangan: per match {satu:7.2f} ms   '
+              f'batch {batch:7.2f} ms  per putaran')
+
+
+if __name__ == '__main__':
+    main()
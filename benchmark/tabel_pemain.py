@@ -0,0 +1,113 @@
+"""
+Micro-benchmark jalur panas: pandas per-ID (.loc) vs TabelPemain / TabelJadwal.
+
+    python benchmark/tabel_pemain.py [--pemain 32] [--lapangan 8] [--ulang 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from klasemen import hasil_match
+from tabel import K_BYE, K_GAMES, K_POIN, Match, TabelJadwal, TabelPemain
+
+ID_COLS = ['Pemain_1_A', 'Pemain_1_B', 'Pemain_2_A', 'Pemain_2_B']
+
+
+def siapkan(jumlah_pemain, jumlah_lapangan):
+    rows = [(i, f'P{i}', random.randint(0, 200), random.randint(0, 10), random.randint(0, 3), 0, 0, 0)
+            for i in range(1, jumlah_pemain + 1)]
+    pemain_df = pd.DataFrame(rows, columns=['ID', 'Nama', 'Total_Poin', 'Games_Played', 'Total_Bye', 'W', 'L', 'T']).set_index('ID')
+    tabel = TabelPemain.dari_baris(rows)
+
+    ids = list(range(1, jumlah_pemain + 1))
+    random.shuffle(ids)
+    matches = [Match(m_id, 1, m_id, 'Double', *ids[4 * (m_id - 1):4 * m_id]) for m_id in range(1, jumlah_lapangan + 1)]
+    jadwal_df = pd.DataFrame([(m.match_id,) + m.ke_baris() for m in matches],
+                             columns=['Match_ID', 'Putaran', 'Lapangan', 'Mode'] + ID_COLS +
+                                     ['Poin_Tim_1', 'Poin_Tim_2', 'Status', 'Versi']).set_index('Match_ID')
+    return pemain_df, tabel, jadwal_df, TabelJadwal(matches), matches
+
+
+def skor_pandas(pemain_df, tim_1, tim_2, poin1, poin2):
+    # Jalur lama input_skor: operasi skalar .loc per pemain
+    for p_id in tim_1:
+        pemain_df.loc[p_id, 'Total_Poin'] += poin1
+    for p_id in tim_2:
+        pemain_df.loc[p_id, 'Total_Poin'] += poin2
+    for p_id in tim_1 + tim_2:
+        pemain_df.loc[p_id, 'Games_Played'] += 1
+    kol_1, kol_2 = hasil_match(poin1, poin2)
+    pemain_df.loc[tim_1, kol_1] += 1
+    pemain_df.loc[tim_2, kol_2] += 1
+
+
+def cari_pandas(jadwal_df, player_id):
+    # Jalur lama hapus_pemain: scan .loc per baris dan kolom
+    hasil = []
+    for idx in jadwal_df[jadwal_df['Putaran'] == 1].index:
+        for col in ID_COLS:
+            if jadwal_df.loc[idx, col] == player_id:
+                hasil.append(idx)
+                break
+    return hasil
+
+
+def bye_pandas(pemain_df, n):
+    return pemain_df.sort_values(by=['Total_Bye', 'Games_Played', 'Total_Poin'],
+                                 ascending=[False, True, False]).index[:n].tolist()
+
+
+def bye_tabel(tabel, n):
+    urutan = np.lexsort((-tabel.kolom(K_POIN), tabel.kolom(K_GAMES), -tabel.kolom(K_BYE)))
+    return tabel.id_aktif()[urutan[:n]].tolist()
+
+
+def ukur(nama, fungsi, ulang):
+    detik = min(timeit.repeat(fungsi, number=ulang, repeat=3)) / ulang
+    print(f'  {nama:<28} {detik * 1e6:10.1f} us')
+    return detik
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pemain', type=int, default=32)
+    parser.add_argument('--lapangan', type=int, default=8)
+    parser.add_argument('--ulang', type=int, default=2000)
+    args = parser.parse_args()
+
+    pemain_df, tabel, jadwal_df, tabel_jadwal, matches = siapkan(args.pemain, args.lapangan)
+    match = matches[-1]
+    tim_1, tim_2 = match.tim()
+    target = match.p2b
+    n_bye = args.lapangan * 4 + 4
+
+    assert bye_pandas(pemain_df, n_bye) == bye_tabel(tabel, n_bye)
+    assert cari_pandas(jadwal_df, target) == [m.match_id for m in tabel_jadwal.putaran(1) if target in m.pemain()]
+
+    print(f'{args.pemain} pemain, {args.lapangan} lapangan')
+    for judul, lama, baru in [
+        ('catat skor satu match', lambda: skor_pandas(pemain_df, tim_1, tim_2, 21, 15),
+         lambda: tabel.terapkan_skor(tim_1, tim_2, 21, 15)),
+        ('cari match pemain (hapus)', lambda: cari_pandas(jadwal_df, target),
+         lambda: [m.match_id for m in tabel_jadwal.putaran(1) if target in m.pemain()]),
+        ('urutan bye akhir putaran', lambda: bye_pandas(pemain_df, n_bye), lambda: bye_tabel(tabel, n_bye)),
+    ]:
+        print(judul)
+        t_lama = ukur('pandas', lama, max(1, args.ulang // 10))
+        t_baru = ukur('TabelPemain/TabelJadwal', baru, args.ulang)
+        print(f'  {"percepatan":<28} {t_lama / t_baru:10.1f}x')
+
+    print('view DataFrame untuk rendering')
+    ukur('TabelPemain.ke_dataframe', tabel.ke_dataframe, max(1, args.ulang // 10))
+    ukur('TabelJadwal.ke_dataframe', tabel_jadwal.ke_dataframe, max(1, args.ulang // 10))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+View model jadwal untuk index() pada 32 pemain / 8 lapangan dan 500 pemain /
+100 lapangan: cara lama (empat DataFrame.merge untuk nama + iterrows untuk
+W/L/T, dibuat ulang di sini sebagai pembanding) dibandingkan data_jadwal
+(satu tabel nama, satu lintasan). Nama dan W/L/T keduanya dicek sama, lalu
+data_index lengkap ikut diukur.
+
+    python benchmark/view_model.py [--ulang 100]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tabel import Match, TabelJadwal, TabelPemain
+from tampilan import WLT_TEKS, data_index, data_jadwal, hitung_status_match
+from turnamen import Turnamen
+
+SKALA = [(32, 8), (500, 100)]
+SLOT = ['Pemain_1_A', 'Pemain_1_B', 'Pemain_2_A', 'Pemain_2_B']
+
+
+def buat_turnamen(jumlah_pemain, jumlah_lapangan, acak):
+    turnamen = Turnamen(max_pemain=jumlah_pemain)
+    turnamen.pemain = TabelPemain.dari_baris(
+        [(i, f'Pemain {i}', acak.randint(0, 200), 5, 1, 2, 2, 1) for i in range(1, jumlah_pemain + 1)])
+    ids = list(range(1, jumlah_pemain + 1))
+    acak.shuffle(ids)
+    matches = []
+    for lapangan in range(jumlah_lapangan):
+        p1a, p1b, p2a, p2b = ids[lapangan * 4:lapangan * 4 + 4]
+        selesai = acak.random() < 0.5
+        skor = (acak.randint(0, 21), acak.randint(0, 21)) if selesai else (0, 0)
+        matches.append(Match(lapangan + 1, 1, lapangan + 1, 'Double', p1a, p1b, p2a, p2b, *skor, selesai))
+    turnamen.jadwal = TabelJadwal(matches)
+    turnamen.putaran_saat_ini = 1
+    return turnamen
+
+
+def referensi_merge(matches, pemain):
+    """Cara lama: merge nama per kolom Pemain_*, lalu iterrows + to_dict per match."""
+    jadwal = TabelJadwal(matches).ke_dataframe().reset_index()
+    nama_df = pemain.ke_dataframe()[['Nama']]
+    for slot in SLOT:
+        jadwal = jadwal.merge(nama_df, left_on=slot, right_index=True, how='left')
+        jadwal = jadwal.rename(columns={'Nama': f'{slot}_Nama'})
+    hasil = []
+    for _, row in jadwal.iterrows():
+        data = row.to_dict()
+        if data['Status'] == 'Selesai':
+            data['Status_Tim_1'] = WLT_TEKS[hitung_status_match(data['Poin_Tim_1'], data['Poin_Tim_2'])]
+            data['Status_Tim_2'] = WLT_TEKS[hitung_status_match(data['Poin_Tim_2'], data['Poin_Tim_1'])]
+        else:
+            data['Status_Tim_1'] = data['Status_Tim_2'] = '-'
+        hasil.append(data)
+    return hasil
+
+
+def ringkas(jadwal):
+    return [(m['Match_ID'],) + tuple(m[f'{slot}_Nama'] for slot in SLOT) + (m['Status_Tim_1'], m['Status_Tim_2'])
+            for m in jadwal]
+
+
+def ukur(fungsi, ulang):
+    return min(timeit.repeat(fungsi, number=ulang, repeat=5)) / ulang * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ulang', type=int, default=100)
+    args = parser.parse_args()
+
+    acak = random.Random(1)
+    for jumlah_pemain, jumlah_lapangan in SKALA:
+        turnamen = buat_turnamen(jumlah_pemain, jumlah_lapangan, acak)
+        matches, pemain = turnamen.jadwal.putaran(1), turnamen.pemain
+        if ringkas(referensi_merge(matches, pemain)) != ringkas(data_jadwal(matches, pemain)):
+            raise SystemExit(f'GAGAL: hasil berbeda pada {jumlah_pemain} pemain / {jumlah_lapangan} lapangan')
+
+        print(f'{jumlah_pemain} pemain, {jumlah_lapangan} lapangan:')
+        print(f'  merge + iterrows (lama)  {ukur(lambda: referensi_merge(matches, pemain), args.ulang):9.1f} us')
+        print(f'  data_jadwal              {ukur(lambda: data_jadwal(matches, pemain), args.ulang):9.1f} us')
+        print(f'  data_index lengkap       {ukur(lambda: data_index(turnamen), args.ulang):9.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+
+from tabel import KOLOM_JADWAL, KOLOM_PEMAIN
+from tampilan import peringkat_turnamen
+
+# --- Ekspor Hasil (CSV / JSON Lines / Parquet) ---
+# Match dan klasemen ditulis per potongan (UKURAN_POTONGAN baris) sebagai
+# generator bytes, sehingga bisa langsung menjadi body Response Flask atau
+# ditulis ke file oleh CLI. Memori yang dipakai sebanding dengan satu
+# potongan, bukan dengan seluruh arsip:
+#   - dengan penyimpanan SQLite, baris dibaca lewat cursor (iter_jadwal);
+#   - tanpa penyimpanan, satu potongan disalin di bawah kunci turnamen lalu
+#     kunci dilepas, sehingga skor tetap bisa dicatat selama unduhan berjalan.
+# pandas tidak dipakai. Parquet memakai pyarrow (opsional), diimpor saat
+# format itu diminta.
+
+UKURAN_POTONGAN = 5000
+
+KOLOM_EKSPOR = {
+    'matches': ['Match_ID'] + KOLOM_JADWAL,
+    'standings': ['Peringkat'] + KOLOM_PEMAIN + ['Rating'],
+}
+# Tipe kolom untuk skema Parquet (CSV / JSON Lines tidak memerlukannya)
+TIPE_KOLOM = {'Mode': 'str', 'Status': 'str', 'Nama': 'str', 'Rating': 'float'}
+
+MIMETYPE = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+class FormatTidakTersedia(Exception):
+    """Format ekspor butuh dependensi opsional yang tidak terpasang (pyarrow untuk Parquet)."""
+
+
+# --- Sumber baris ---
+def potongan_match(turnamen, ukuran=UKURAN_POTONGAN):
+    """Seluruh riwayat match sebagai potongan list tuple (kolom KOLOM_EKSPOR['matches'])."""
+    if turnamen.penyimpanan is not None:
+        yield from turnamen.penyimpanan.iter_jadwal(ukuran)
+        return
+    with turnamen.kunci:
+        ids = list(turnamen.jadwal.match)
+    for mulai in range(0, len(ids), ukuran):
+        with turnamen.kunci:
+            jadwal = turnamen.jadwal
+            # Match yang dihapus (kocok ulang / undo) setelah daftar ID diambil dilewati
+            rows = [(m.match_id, *m.ke_baris()) for m in map(jadwal.get, ids[mulai:mulai + ukuran]) if m is not None]
+        if rows:
+            yield rows
+
+
+def potongan_klasemen(turnamen, ukuran=UKURAN_POTONGAN):
+    """Klasemen urut peringkat (kolom KOLOM_EKSPOR['standings']), beserta rating Elo."""
+    with turnamen.kunci:
+        rating = turnamen.rating
+        rows = [(p['Peringkat'], *(p[k] for k in KOLOM_PEMAIN),
+                 rating.nilai(p['ID']) if p['ID'] in rating else None)
+                for p in peringkat_turnamen(turnamen)]
+    for mulai in range(0, len(rows), ukuran):
+        yield rows[mulai:mulai + ukuran]
+
+
+SUMBER = {'matches': potongan_match, 'standings': potongan_klasemen}
+
+
+# --- Penulis format ---
+def tulis_csv(kolom, potongan):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(kolom)
+    for rows in potongan:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def tulis_jsonl(kolom, potongan):
+    for rows in potongan:
+        yield ''.join(json.dumps(dict(zip(kolom, row)), ensure_ascii=False) + '\n' for row in rows).encode()
+
+
+class _Penampung:
+    """File tulis-saja untuk ParquetWriter; isinya diambil (dan dikosongkan) per potongan."""
+
+    def __init__(self):
+        self._isi = bytearray()
+        self._posisi = 0
+        self.closed = False
+
+    def write(self, data):
+        self._isi += data
+        self._posisi += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._posisi
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def ambil(self):
+        isi = bytes(self._isi)
+        self._isi.clear()
+        return isi
+
+
+def _skema_parquet(pa, kolom):
+    tipe = {'str': pa.string(), 'float': pa.float64()}
+    return pa.schema([(k, tipe.get(TIPE_KOLOM.get(k), pa.int64())) for k in kolom])
+
+
+def tulis_parquet(kolom, potongan):
+    """Satu row group per potongan; bytes row group dikirim begitu selesai ditulis."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    skema = _skema_parquet(pa, kolom)
+    penampung = _Penampung()
+    with pq.ParquetWriter(penampung, skema) as writer:
+        for rows in potongan:
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(nilai, type=skema.field(k).type) for k, nilai in zip(kolom, zip(*rows))], schema=skema))
+            isi = penampung.ambil()
+            if isi:
+                yield isi
+    # Footer ditulis saat writer ditutup
+    yield penampung.ambil()
+
+
+PENULIS = {'csv': tulis_csv, 'jsonl': tulis_jsonl, 'parquet': tulis_parquet}
+
+
+def ekspor(turnamen, data, format_ekspor, ukuran=UKURAN_POTONGAN):
+    """
+    Generator bytes `data` ('matches' / 'standings') turnamen dalam
+    `format_ekspor` ('csv' / 'jsonl' / 'parquet'). Format dicek saat
+    dipanggil, bukan saat iterasi pertama: FormatTidakTersedia jika pyarrow
+    tidak terpasang, ValueError untuk data / format yang tidak dikenal.
+    """
+    if data not in SUMBER or format_ekspor not in PENULIS:
+        raise ValueError(f'Ekspor tidak dikenal: {data}.{format_ekspor}')
+    if format_ekspor == 'parquet':
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise FormatTidakTersedia('Ekspor Parquet membutuhkan pyarrow (pip install pyarrow).') from None
+    return PENULIS[format_ekspor](KOLOM_EKSPOR[data], SUMBER[data](turnamen, ukuran))
@@ -0,0 +1,28 @@
+import csv
+import io
+
+# --- Import Roster ---
+# Daftar nama untuk Turnamen.tambah_pemain_banyak dari teks yang ditempel
+# (satu nama per baris) atau dari CSV. CSV dikenali dari baris header yang
+# memuat kolom nama (KOLOM_NAMA); tanpa header, teks dibaca per baris apa
+# adanya sehingga nama yang mengandung koma tetap utuh. CSV tanpa header
+# (format_csv=True, mis. berkas .csv) memakai kolom pertama.
+
+KOLOM_NAMA = {'nama', 'nama_pemain', 'name', 'player', 'pemain'}
+
+
+def baca_nama(teks, format_csv=False):
+    """Nama-nama dari `teks` sesuai urutannya; baris kosong dilewati."""
+    teks = teks.lstrip('\ufeff')
+    baris = teks.splitlines()
+    header = next(csv.reader(baris[:1]), [])
+    kolom = next((i for i, sel in enumerate(header) if sel.strip().casefold() in KOLOM_NAMA), None)
+    if kolom is None and not format_csv:
+        return [b.strip() for b in baris if b.strip()]
+
+    rows = csv.reader(io.StringIO(teks))
+    if kolom is None:
+        kolom = 0
+    else:
+        next(rows)
+    return [row[kolom].strip() for row in rows if len(row) > kolom and row[kolom].strip()]
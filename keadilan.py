@@ -0,0 +1,163 @@
+import random
+
+import numpy as np
+
+from tabel import K_BYE, array_id
+
+# --- Metrik Keadilan Jadwal ---
+# Seberapa adil jadwal yang dibuat buat_jadwal, dihitung dari seluruh riwayat
+# match sekaligus (tanpa loop per match):
+#   bye            sebaran Total_Bye antar pemain (min, maks, selisih, std)
+#   partner/lawan  berapa kali pasangan partner / lawan yang sama terulang
+#                  (jumlah kemunculan di atas yang pertama) dan yang terbanyak
+#   selisih        selisih rata-rata peringkat kedua tim, dengan peringkat
+#   peringkat      (aturan 'min') dari poin kumulatif SEBELUM putaran match itu
+# Banyak turnamen bisa dihitung dalam satu lintasan (hitung_metrik), sehingga
+# strategi penjadwal bisa dibandingkan atas ribuan turnamen simulasi.
+
+METRIK = ['bye_min', 'bye_maks', 'bye_selisih', 'bye_std', 'partner_ulang', 'partner_maks',
+          'lawan_ulang', 'lawan_maks', 'selisih_peringkat_rata_rata', 'selisih_peringkat_maks']
+
+# Pasangan slot [1A, 1B, 2A, 2B] yang menjadi partner / lawan
+PASANGAN_PARTNER = [(0, 1), (2, 3)]
+PASANGAN_LAWAN = [(0, 2), (0, 3), (1, 2), (1, 3)]
+
+
+def _indeks_lokal(matches, pemain):
+    """Slot match (n, 4) sebagai indeks lokal 0..N-1 (-1 = kosong), plus indeks baris pemain aktif."""
+    ids = array_id(matches)
+    semua = np.unique(np.concatenate([ids[~np.isnan(ids)], pemain.id_aktif().astype(float)]))
+    slot = np.full(ids.shape, -1, dtype=np.int64)
+    ada = ~np.isnan(ids)
+    slot[ada] = np.searchsorted(semua, ids[ada])
+    return slot, np.searchsorted(semua, pemain.id_aktif().astype(float)), len(semua)
+
+
+def _ulang(slot, t, pasangan, n, jumlah_turnamen):
+    """(jumlah ulangan, kemunculan terbanyak) per turnamen untuk pasangan slot tak berurutan."""
+    a = np.concatenate([slot[:, i] for i, _ in pasangan])
+    b = np.concatenate([slot[:, j] for _, j in pasangan])
+    t = np.tile(t, len(pasangan))
+    valid = (a >= 0) & (b >= 0)
+    a, b, t = a[valid], b[valid], t[valid]
+    kunci, jumlah = np.unique((t * n + np.minimum(a, b)) * n + np.maximum(a, b), return_counts=True)
+    t_kunci = kunci // (n * n)
+    ulang = np.bincount(t_kunci, weights=jumlah - 1, minlength=jumlah_turnamen).astype(np.int64)
+    maks = np.zeros(jumlah_turnamen, dtype=np.int64)
+    np.maximum.at(maks, t_kunci, jumlah)
+    return ulang, maks
+
+
+def _peringkat_per_putaran(poin_kumulatif, hadir):
+    """
+    Peringkat 'min' (1 + jumlah pemain berpoin lebih besar) untuk setiap
+    (turnamen, putaran) sekaligus. `poin_kumulatif` (T, R, N); pemain yang
+    tidak `hadir` (T, N) tidak ikut dihitung.
+    """
+    jumlah_turnamen, jumlah_putaran, n = poin_kumulatif.shape
+    nilai = np.where(hadir[:, None, :], poin_kumulatif, -1).astype(np.int64)
+    # Setiap baris (turnamen, putaran) digeser ke rentangnya sendiri agar bisa diurutkan sekali
+    rentang = int(nilai.max()) + 2 if nilai.size else 1
+    baris = np.arange(jumlah_turnamen * jumlah_putaran, dtype=np.int64).reshape(jumlah_turnamen, jumlah_putaran, 1)
+    kunci = (nilai + 1 + baris * rentang).ravel()
+    urut = np.sort(kunci)
+    lebih_besar = (baris + 1) * n - np.searchsorted(urut, kunci, side='right').reshape(nilai.shape)
+    return 1 + lebih_besar
+
+
+def hitung_metrik(daftar):
+    """
+    Metrik keadilan untuk banyak turnamen sekaligus. `daftar` berisi
+    (matches, pemain): seluruh riwayat Match dan TabelPemain satu turnamen.
+    Mengembalikan dict nama metrik (METRIK) -> array satu nilai per turnamen.
+    """
+    jumlah_turnamen = len(daftar)
+    lokal = [_indeks_lokal(matches, pemain) for matches, pemain in daftar]
+    n = max([jumlah for _, _, jumlah in lokal], default=0) or 1
+
+    slot = np.concatenate([s for s, _, _ in lokal] + [np.empty((0, 4), dtype=np.int64)])
+    t = np.repeat(np.arange(jumlah_turnamen), [len(s) for s, _, _ in lokal])
+    data = [(m.putaran, m.poin_1, m.poin_2, m.selesai) for matches, _ in daftar for m in matches]
+    putaran, poin_1, poin_2, selesai = (np.array(kolom, dtype=np.int64).reshape(-1)
+                                        for kolom in (zip(*data) if data else ([], [], [], [])))
+    selesai = selesai.astype(bool)
+
+    # --- Bye: Total_Bye pemain aktif, baris yang kosong = NaN ---
+    bye = np.full((jumlah_turnamen, n), np.nan)
+    hadir = np.zeros((jumlah_turnamen, n), dtype=bool)
+    for i, ((_, pemain), (_, baris, _)) in enumerate(zip(daftar, lokal)):
+        bye[i, baris] = pemain.kolom(K_BYE)
+        hadir[i, baris] = True
+    kosong = ~hadir.any(axis=1)
+    bye[kosong, 0] = 0
+    hasil = {
+        'bye_min': np.nanmin(bye, axis=1),
+        'bye_maks': np.nanmax(bye, axis=1),
+        'bye_std': np.nanstd(bye, axis=1),
+    }
+    hasil['bye_selisih'] = hasil['bye_maks'] - hasil['bye_min']
+
+    # --- Partner / lawan berulang ---
+    hasil['partner_ulang'], hasil['partner_maks'] = _ulang(slot, t, PASANGAN_PARTNER, n, jumlah_turnamen)
+    hasil['lawan_ulang'], hasil['lawan_maks'] = _ulang(slot, t, PASANGAN_LAWAN, n, jumlah_turnamen)
+
+    # --- Selisih peringkat tim, peringkat dari poin sebelum putaran match ---
+    jumlah_putaran = int(putaran.max()) + 1 if putaran.size else 1
+    poin = np.zeros((jumlah_turnamen, jumlah_putaran + 1, n), dtype=np.int64)
+    for kolom, poin_tim in ((0, poin_1), (1, poin_1), (2, poin_2), (3, poin_2)):
+        valid = selesai & (slot[:, kolom] >= 0)
+        # Poin putaran r baru terlihat di peringkat putaran r + 1
+        np.add.at(poin, (t[valid], putaran[valid] + 1, slot[valid, kolom]), poin_tim[valid])
+    # Pemain yang sudah dihapus tetap ikut peringkat putaran yang ia mainkan
+    hadir_match = hadir.copy()
+    for kolom in range(4):
+        valid = slot[:, kolom] >= 0
+        hadir_match[t[valid], slot[valid, kolom]] = True
+    peringkat = _peringkat_per_putaran(np.cumsum(poin, axis=1), hadir_match)
+
+    def peringkat_tim(kolom_tim):
+        nilai = np.zeros(len(slot))
+        jumlah = np.zeros(len(slot))
+        for kolom in kolom_tim:
+            valid = slot[:, kolom] >= 0
+            nilai[valid] += peringkat[t[valid], putaran[valid], slot[valid, kolom]]
+            jumlah += valid
+        return nilai / np.maximum(jumlah, 1)
+
+    selisih = np.abs(peringkat_tim((0, 1)) - peringkat_tim((2, 3)))
+    jumlah_match = np.maximum(np.bincount(t, minlength=jumlah_turnamen), 1)
+    hasil['selisih_peringkat_rata_rata'] = np.bincount(t, weights=selisih, minlength=jumlah_turnamen) / jumlah_match
+    hasil['selisih_peringkat_maks'] = np.zeros(jumlah_turnamen)
+    np.maximum.at(hasil['selisih_peringkat_maks'], t, selisih)
+    return {nama: hasil[nama] for nama in METRIK}
+
+
+def metrik_turnamen(turnamen):
+    """Metrik keadilan satu turnamen sebagai dict angka biasa (untuk JSON). Panggil di bawah kunci turnamen."""
+    matches = turnamen.semua_match()
+    metrik = {nama: nilai[0].item() for nama, nilai in hitung_metrik([(matches, turnamen.pemain)]).items()}
+    metrik['jumlah_pemain'] = len(turnamen.pemain)
+    metrik['jumlah_match'] = len(matches)
+    return metrik
+
+
+def simulasikan(jumlah, jumlah_pemain, num_lapangan, jumlah_putaran, format_turnamen, mode_permainan,
+                jumlah_putaran_rencana=0, acak=None, seeding_mexicano='poin'):
+    """
+    Menjalankan `jumlah` turnamen di memori dengan skor acak dan mengembalikan
+    daftar (matches, pemain) untuk hitung_metrik.
+    """
+    from turnamen import Turnamen
+
+    acak = acak or random.Random()
+    daftar = []
+    for _ in range(jumlah):
+        turnamen = Turnamen(max_pemain=jumlah_pemain, seeding_mexicano=seeding_mexicano)
+        for i in range(jumlah_pemain):
+            turnamen.tambah_pemain(f'Pemain {i + 1}')
+        turnamen.mulai_putaran(num_lapangan, format_turnamen, mode_permainan, jumlah_putaran_rencana)
+        for _ in range(jumlah_putaran):
+            turnamen.input_skor_batch([(m.match_id, acak.randint(0, 21), acak.randint(0, 21), None)
+                                       for m in turnamen.jadwal.putaran(turnamen.putaran_saat_ini)])
+        daftar.append((turnamen.semua_match(), turnamen.pemain))
+    return daftar
@@ -0,0 +1,83 @@
+import numpy as np
+
+from profil import terukur
+
+# --- Mesin Klasemen W/L/T ---
+# Counter W/L/T dipelihara per match oleh TabelPemain.terapkan_wlt (tabel.py),
+# bukan dihitung ulang dari seluruh jadwal_df. Modul ini menyediakan aturan
+# hasil match dan hitung ulang penuh sebagai pembanding. pandas hanya diimpor
+# oleh hitung ulang (dipakai CLI / benchmark), bukan di jalur request.
+
+ID_COLS = ['Pemain_1_A', 'Pemain_1_B', 'Pemain_2_A', 'Pemain_2_B']
+
+
+def hasil_match(poin1, poin2):
+    """Mengembalikan kolom hasil untuk (Tim 1, Tim 2): 'W', 'L' atau 'T'."""
+    if poin1 > poin2:
+        return 'W', 'L'
+    if poin2 > poin1:
+        return 'L', 'W'
+    return 'T', 'T'
+
+
+def pemain_tim(match_row):
+    """Daftar ID pemain (Tim 1, Tim 2) dari satu baris jadwal, tanpa slot kosong."""
+    double = match_row['Mode'] == 'Double'
+    tim_1 = [match_row['Pemain_1_A']] + ([match_row['Pemain_1_B']] if double else [])
+    tim_2 = [match_row['Pemain_2_A']] + ([match_row['Pemain_2_B']] if double else [])
+    tim_1 = [int(p_id) for p_id in tim_1 if p_id is not None and p_id == p_id]
+    tim_2 = [int(p_id) for p_id in tim_2 if p_id is not None and p_id == p_id]
+    return tim_1, tim_2
+
+
+@terukur()
+def hitung_wlt(pemain_df_copy, jadwal_df_copy):
+    """
+    Menghitung Win/Lose/Tie KUMULATIF berdasarkan semua pertandingan Selesai.
+    Versi vectorized (group-by), dipakai sebagai pembanding counter inkremental.
+    Menggunakan copy dari DataFrame untuk mencegah side effects.
+    """
+    import pandas as pd
+
+    for col in ['W', 'L', 'T']:
+        pemain_df_copy[col] = 0
+
+    jadwal_selesai = jadwal_df_copy[jadwal_df_copy['Status'] == 'Selesai']
+    if jadwal_selesai.empty or pemain_df_copy.empty:
+        return pemain_df_copy
+
+    poin1 = jadwal_selesai['Poin_Tim_1'].to_numpy(dtype=float)
+    poin2 = jadwal_selesai['Poin_Tim_2'].to_numpy(dtype=float)
+    hasil_tim_1 = np.where(poin1 > poin2, 'W', np.where(poin2 > poin1, 'L', 'T'))
+    hasil_tim_2 = np.where(poin2 > poin1, 'W', np.where(poin1 > poin2, 'L', 'T'))
+    double = (jadwal_selesai['Mode'] == 'Double').to_numpy()
+
+    # Bentuk panjang: satu baris per (pemain, hasil)
+    potongan = []
+    for col in ID_COLS:
+        ids = pd.to_numeric(jadwal_selesai[col], errors='coerce').to_numpy(dtype=float)
+        hasil = hasil_tim_1 if col.startswith('Pemain_1') else hasil_tim_2
+        valid = ~np.isnan(ids)
+        if col.endswith('_B'):
+            valid &= double
+        potongan.append(pd.DataFrame({'ID': ids[valid].astype(int), 'Hasil': hasil[valid]}))
+
+    panjang = pd.concat(potongan, ignore_index=True)
+    panjang = panjang[panjang['ID'].isin(pemain_df_copy.index)]
+
+    rekap = panjang.groupby(['ID', 'Hasil']).size().unstack(fill_value=0)
+    rekap = rekap.reindex(index=pemain_df_copy.index, columns=['W', 'L', 'T'], fill_value=0)
+
+    pemain_df_copy[['W', 'L', 'T']] = rekap.to_numpy()
+    return pemain_df_copy
+
+
+def cek_konsistensi_wlt(pemain_df, jadwal_df):
+    """
+    Membandingkan counter W/L/T yang dipelihara dengan hasil hitung ulang penuh.
+    Mengembalikan DataFrame baris yang berbeda (kosong jika konsisten).
+    """
+    dihitung = hitung_wlt(pemain_df[['Nama']].copy(), jadwal_df)
+    tersimpan = pemain_df[['W', 'L', 'T']].astype(int)
+    beda = (tersimpan != dihitung[['W', 'L', 'T']].astype(int)).any(axis=1)
+    return tersimpan[beda].join(dihitung[['W', 'L', 'T']], rsuffix='_Hitung')
@@ -0,0 +1,325 @@
+import glob
+import json
+import os
+
+from klasemen import hasil_match
+from profil import terukur
+
+# --- Log Event (Append-Only) ---
+# Setiap mutasi ditulis sebagai satu baris JSON ringkas. Event menyimpan HASIL
+# (match yang dibuat, pemain yang bye), bukan input acak, sehingga replay
+# selalu menghasilkan state yang sama persis.
+#
+#   ['P+', id, nama, rencana]                           tambah_pemain
+#   ['P*', [[id, nama], ...], rencana]                  tambah_pemain_banyak
+#   ['P-', id, rencana]                                 hapus_pemain
+#   ['R', num_lapangan, format, mode, matches, rencana] mulai_putaran
+#   ['K', format, mode, matches, rencana]               kocok_ulang
+#   ['S', match_id, skor_1, skor_2, lanjut]             input_skor
+#       lanjut = None atau [bye_ids, mode, matches, dari_rencana]
+#   ['B', [[match_id, skor_1, skor_2], ...], lanjut]    input_skor_batch
+#   ['U', n]                                            undo n event terakhir
+#
+# Buku bye (state['bye'], putaran -> ID yang duduk di luar) tidak ada di event:
+# ditulis ulang saat fold dari roster dan match putaran yang dibuat, dengan
+# aturan yang sama seperti Turnamen (turnamen.catat_bye).
+#
+# `matches` berisi baris ringkas [match_id, lapangan, p1a, p1b, p2a, p2b].
+# `rencana` adalah state rencana_jadwal setelah event (None jika tidak ada).
+
+SNAPSHOT_SETIAP = 250  # event
+
+# Urutan kolom baris pemain dan match di dalam state
+P_NAMA, P_POIN, P_GAMES, P_BYE, P_W, P_L, P_T = range(7)
+M_PUTARAN, M_LAPANGAN, M_MODE, M_P1A, M_P1B, M_P2A, M_P2B, M_POIN_1, M_POIN_2, M_SELESAI, M_VERSI = range(11)
+KOLOM_WLT = {'W': P_W, 'L': P_L, 'T': P_T}
+
+
+def state_kosong():
+    """State turnamen dalam struktur Python biasa (cepat di-fold dan di-serialize)."""
+    return {
+        'pemain': {},   # id -> [nama, poin, games, bye, w, l, t]
+        'jadwal': {},   # match_id -> [putaran, lapangan, mode, p1a, p1b, p2a, p2b, poin_1, poin_2, selesai, versi]
+        'next_player_id': 1,
+        'next_match_id': 1,
+        'putaran_saat_ini': 0,
+        'last_config': {'num_lapangan': 1, 'format_turnamen': 'Americano', 'mode_permainan': 'Double'},
+        'rencana_jadwal': None,
+        'bye': {},      # putaran -> [id, ...]
+    }
+
+
+def ringkas_match(match):
+    """Baris jadwal (dict dari buat_match_dari_grup) -> baris ringkas untuk event."""
+    return [match['Match_ID'], match['Lapangan'], match['Pemain_1_A'], match['Pemain_1_B'],
+            match['Pemain_2_A'], match['Pemain_2_B']]
+
+
+# --- Fold event ke state ---
+def _tim(m):
+    double = m[M_MODE] == 'Double'
+    tim_1 = [p for p in ((m[M_P1A], m[M_P1B]) if double else (m[M_P1A],)) if p is not None]
+    tim_2 = [p for p in ((m[M_P2A], m[M_P2B]) if double else (m[M_P2A],)) if p is not None]
+    return tim_1, tim_2
+
+
+def _wlt(pemain, m, arah):
+    tim_1, tim_2 = _tim(m)
+    kol_1, kol_2 = hasil_match(m[M_POIN_1], m[M_POIN_2])
+    for tim, kol in ((tim_1, KOLOM_WLT[kol_1]), (tim_2, KOLOM_WLT[kol_2])):
+        for p_id in tim:
+            if p_id in pemain:
+                pemain[p_id][kol] += arah
+
+
+def _tambah_matches(state, putaran, mode, matches):
+    for match_id, lapangan, p1a, p1b, p2a, p2b in matches:
+        state['jadwal'][match_id] = [putaran, lapangan, mode, p1a, p1b, p2a, p2b, 0, 0, False, 0]
+        state['next_match_id'] = max(state['next_match_id'], match_id + 1)
+
+
+def _catat_bye(state, putaran, matches):
+    if matches:
+        bermain = {p for row in matches for p in row[2:] if p is not None}
+        state['bye'][putaran] = sorted(p_id for p_id in state['pemain'] if p_id not in bermain)
+
+
+def isi_bye(state):
+    """Buku bye turunan dari jadwal state (snapshot lama tanpa buku bye), lihat turnamen.bye_dari_jadwal."""
+    bermain = {}
+    for m in state['jadwal'].values():
+        bermain.setdefault(m[M_PUTARAN], set()).update(p for p in (m[M_P1A], m[M_P1B], m[M_P2A], m[M_P2B]) if p is not None)
+    return {putaran: sorted(p_id for p_id in state['pemain'] if p_id not in ids) for putaran, ids in bermain.items()}
+
+
+def _skor(state, match_id, skor_1, skor_2):
+    pemain = state['pemain']
+    m = state['jadwal'].get(match_id)
+    if m is None:
+        return
+    tim_1 = [p for p in (m[M_P1A], m[M_P1B]) if p is not None and p in pemain]
+    tim_2 = [p for p in (m[M_P2A], m[M_P2B]) if p is not None and p in pemain]
+    if m[M_SELESAI]:
+        for tim, poin in ((tim_1, m[M_POIN_1]), (tim_2, m[M_POIN_2])):
+            for p_id in tim:
+                pemain[p_id][P_POIN] -= poin
+                pemain[p_id][P_GAMES] -= 1
+        _wlt(pemain, m, -1)
+    m[M_POIN_1], m[M_POIN_2], m[M_SELESAI] = skor_1, skor_2, True
+    m[M_VERSI] += 1
+    for tim, poin in ((tim_1, skor_1), (tim_2, skor_2)):
+        for p_id in tim:
+            pemain[p_id][P_POIN] += poin
+            pemain[p_id][P_GAMES] += 1
+    _wlt(pemain, m, 1)
+
+
+def _lanjut(state, lanjut):
+    if lanjut is None:
+        return
+    pemain = state['pemain']
+    bye_ids, mode, matches, dari_rencana = lanjut
+    for p_id in bye_ids:
+        if p_id in pemain:
+            pemain[p_id][P_BYE] += 1
+    state['putaran_saat_ini'] += 1
+    _tambah_matches(state, state['putaran_saat_ini'], mode, matches)
+    _catat_bye(state, state['putaran_saat_ini'], matches)
+    if dari_rencana:
+        state['rencana_jadwal']['putaran'].pop(0)
+
+
+def terapkan_event(state, event):
+    """Menerapkan satu event ke state (aturan sama dengan metode Turnamen)."""
+    jenis = event[0]
+    pemain, jadwal = state['pemain'], state['jadwal']
+
+    if jenis == 'P+':
+        _, p_id, nama, rencana = event
+        pemain[p_id] = [nama, 0, 0, 0, 0, 0, 0]
+        state['next_player_id'] = max(state['next_player_id'], p_id + 1)
+        state['rencana_jadwal'] = rencana
+
+    elif jenis == 'P*':
+        _, daftar, rencana = event
+        for p_id, nama in daftar:
+            pemain[p_id] = [nama, 0, 0, 0, 0, 0, 0]
+        state['next_player_id'] = max(state['next_player_id'], daftar[-1][0] + 1)
+        state['rencana_jadwal'] = rencana
+
+    elif jenis == 'P-':
+        _, p_id, rencana = event
+        pemain.pop(p_id, None)
+        putaran = state['putaran_saat_ini']
+        lepas = set()
+        for match_id in [m_id for m_id, m in jadwal.items()
+                         if m[M_PUTARAN] == putaran and p_id in (m[M_P1A], m[M_P1B], m[M_P2A], m[M_P2B])]:
+            m = jadwal.pop(match_id)
+            if m[M_SELESAI]:
+                _wlt(pemain, m, -1)
+            else:
+                lepas.update(p for p in (m[M_P1A], m[M_P1B], m[M_P2A], m[M_P2B]) if p is not None)
+        if putaran in state['bye']:
+            state['bye'][putaran] = sorted((set(state['bye'][putaran]) | lepas) - {p_id})
+        if putaran > 0 and not any(m[M_PUTARAN] == putaran for m in jadwal.values()):
+            state['putaran_saat_ini'] -= 1
+        state['rencana_jadwal'] = rencana
+
+    elif jenis == 'R':
+        _, num_lapangan, format_turnamen, mode, matches, rencana = event
+        for match_id in [m_id for m_id, m in jadwal.items() if not m[M_SELESAI]]:
+            del jadwal[match_id]
+        state['putaran_saat_ini'] += 1
+        state['last_config'] = {'num_lapangan': num_lapangan, 'format_turnamen': format_turnamen, 'mode_permainan': mode}
+        _tambah_matches(state, state['putaran_saat_ini'], mode, matches)
+        _catat_bye(state, state['putaran_saat_ini'], matches)
+        state['rencana_jadwal'] = rencana
+
+    elif jenis == 'K':
+        _, format_turnamen, mode, matches, rencana = event
+        putaran = state['putaran_saat_ini']
+        lama = [m_id for m_id, m in jadwal.items() if m[M_PUTARAN] == putaran]
+        num_lapangan = len({jadwal[m_id][M_LAPANGAN] for m_id in lama})
+        for match_id in lama:
+            del jadwal[match_id]
+        state['last_config'] = {'num_lapangan': num_lapangan, 'format_turnamen': format_turnamen, 'mode_permainan': mode}
+        _tambah_matches(state, putaran, mode, matches)
+        _catat_bye(state, putaran, matches)
+        state['rencana_jadwal'] = rencana
+
+    elif jenis == 'S':
+        _, match_id, skor_1, skor_2, lanjut = event
+        _skor(state, match_id, skor_1, skor_2)
+        _lanjut(state, lanjut)
+
+    elif jenis == 'B':
+        _, skor, lanjut = event
+        for match_id, skor_1, skor_2 in skor:
+            _skor(state, match_id, skor_1, skor_2)
+        _lanjut(state, lanjut)
+
+    else:
+        raise ValueError(f'Jenis event tidak dikenal: {jenis!r}')
+
+    return state
+
+
+def _serialisasi(state):
+    data = dict(state)
+    data['pemain'] = [[p_id] + row for p_id, row in state['pemain'].items()]
+    data['jadwal'] = [[m_id] + row for m_id, row in state['jadwal'].items()]
+    # Kunci JSON selalu string; simpan sebagai pasangan [putaran, ids]
+    data['bye'] = [[putaran, ids] for putaran, ids in state['bye'].items()]
+    return data
+
+
+def _deserialisasi(data):
+    state = dict(data)
+    state['pemain'] = {row[0]: row[1:] for row in data['pemain']}
+    # Snapshot lama belum punya kolom versi
+    state['jadwal'] = {row[0]: row[1:] + [0] * (M_VERSI + 2 - len(row)) for row in data['jadwal']}
+    state['bye'] = {putaran: ids for putaran, ids in data['bye']} if 'bye' in data else isi_bye(state)
+    return state
+
+
+class LogEvent:
+    """
+    Log event append-only (`events.jsonl`) plus snapshot berkala di satu direktori.
+    Cold start memuat snapshot terakhir lalu hanya me-replay ekor log.
+    """
+
+    def __init__(self, direktori, snapshot_setiap=SNAPSHOT_SETIAP):
+        self.direktori = direktori
+        self.snapshot_setiap = snapshot_setiap
+        os.makedirs(direktori, exist_ok=True)
+        self.path_log = os.path.join(direktori, 'events.jsonl')
+        self._file = open(self.path_log, 'ab')
+        self.jumlah_event = self._hitung_baris()
+        self._sejak_snapshot = self.jumlah_event - self._snapshot_terakhir()[0]
+
+    def _berkas(self):
+        # Dibuka ulang setelah tutup() (turnamen dimuat kembali dengan LogEvent yang sama)
+        if self._file.closed:
+            self._file = open(self.path_log, 'ab')
+        return self._file
+
+    def tutup(self):
+        """Menutup berkas log; tambah() berikutnya membukanya kembali."""
+        self._file.close()
+
+    def _hitung_baris(self):
+        with open(self.path_log, 'rb') as f:
+            return sum(1 for _ in f)
+
+    def _daftar_snapshot(self):
+        """(seq, offset, path) semua snapshot, terbaru di akhir. seq 0 = state kosong."""
+        daftar = [(0, 0, None)]
+        for path in glob.glob(os.path.join(self.direktori, 'snapshot-*.json')):
+            seq, offset = os.path.basename(path)[len('snapshot-'):-len('.json')].split('-')
+            daftar.append((int(seq), int(offset), path))
+        return sorted(daftar)
+
+    def _snapshot_terakhir(self):
+        return self._daftar_snapshot()[-1]
+
+    @terukur('log_event')
+    def tambah(self, event, ambil_state=None):
+        """
+        Menambahkan satu event. `ambil_state` (callable) dipanggil untuk membuat
+        snapshot setiap `snapshot_setiap` event.
+        """
+        berkas = self._berkas()
+        berkas.write(json.dumps(event, separators=(',', ':')).encode() + b'\n')
+        berkas.flush()
+        self.jumlah_event += 1
+        self._sejak_snapshot += 1
+        if ambil_state is not None and self._sejak_snapshot >= self.snapshot_setiap:
+            self.snapshot(ambil_state())
+
+    def snapshot(self, state):
+        offset = self._berkas().tell()
+        path = os.path.join(self.direktori, f'snapshot-{self.jumlah_event:09d}-{offset}.json')
+        sementara = path + '.tmp'
+        with open(sementara, 'w') as f:
+            json.dump(_serialisasi(state), f, separators=(',', ':'))
+        os.replace(sementara, path)
+        self._sejak_snapshot = 0
+
+    def _baca_dari(self, offset):
+        with open(self.path_log, 'rb') as f:
+            f.seek(offset)
+            return [json.loads(baris) for baris in f if baris.strip()]
+
+    def replay(self):
+        """
+        Membangun ulang state dari snapshot terbaru yang masih berlaku plus ekor log.
+        Event 'U' membatalkan event efektif terakhir; jika undo melewati batas
+        snapshot, snapshot sebelumnya yang dipakai.
+        """
+        for seq, offset, path in reversed(self._daftar_snapshot()):
+            efektif = []
+            valid = True
+            for event in self._baca_dari(offset):
+                if event[0] == 'U':
+                    if event[1] > len(efektif) and path is not None:
+                        valid = False
+                        break
+                    del efektif[max(0, len(efektif) - event[1]):]
+                else:
+                    efektif.append(event)
+            if not valid:
+                continue
+
+            if path is None:
+                state = state_kosong()
+            else:
+                with open(path) as f:
+                    state = _deserialisasi(json.load(f))
+            for event in efektif:
+                terapkan_event(state, event)
+            return state
+
+    def undo(self, n):
+        """Mencatat undo n event terakhir lalu mengembalikan state hasil replay."""
+        self.tambah(['U', int(n)])
+        return self.replay()
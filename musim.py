@@ -0,0 +1,215 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager, nullcontext
+
+from tabel import kunci_pemain
+
+# --- Indeks Klasemen Musim ---
+# Klasemen setiap turnamen hanya hidup selama turnamen itu. Indeks musim
+# melipat total per pemain (Total_Poin, Games_Played, Total_Bye, W/L/T) dari
+# banyak turnamen ke tabel agregat yang sudah dihitung sebelumnya, di SQLite
+# tersendiri. Identitas pemain antar turnamen adalah nama yang dinormalisasi
+# (kunci_pemain), bukan ID per turnamen (next_player_id).
+#
+# Setiap turnamen menyimpan kontribusinya sendiri. Melipat ulang turnamen
+# yang sama mengurangi kontribusi lama lalu menambahkan yang baru dalam satu
+# transaksi, jadi aman dipanggil berkali-kali (mis. setelah koreksi skor).
+# Klasemen musim dibaca lewat indeks (total_poin DESC) dengan LIMIT/OFFSET:
+# top-K dan per halaman tanpa membaca riwayat match sama sekali.
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS kontribusi (
+    turnamen_id TEXT NOT NULL,
+    kunci TEXT NOT NULL,
+    nama TEXT NOT NULL,
+    total_poin INTEGER NOT NULL,
+    games_played INTEGER NOT NULL,
+    total_bye INTEGER NOT NULL,
+    w INTEGER NOT NULL,
+    l INTEGER NOT NULL,
+    t INTEGER NOT NULL,
+    PRIMARY KEY (turnamen_id, kunci)
+);
+CREATE TABLE IF NOT EXISTS agregat (
+    kunci TEXT PRIMARY KEY,
+    nama TEXT NOT NULL,
+    turnamen INTEGER NOT NULL,
+    total_poin INTEGER NOT NULL,
+    games_played INTEGER NOT NULL,
+    total_bye INTEGER NOT NULL,
+    w INTEGER NOT NULL,
+    l INTEGER NOT NULL,
+    t INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_agregat_peringkat ON agregat (total_poin DESC, w DESC, kunci);
+CREATE TABLE IF NOT EXISTS turnamen (
+    turnamen_id TEXT PRIMARY KEY,
+    putaran INTEGER NOT NULL,
+    jumlah_pemain INTEGER NOT NULL
+);
+"""
+
+SQL_KONTRIBUSI = """
+SELECT kunci, total_poin, games_played, total_bye, w, l, t FROM kontribusi WHERE turnamen_id = ?
+"""
+SQL_KURANGI = """
+UPDATE agregat SET turnamen = turnamen - 1, total_poin = total_poin - ?, games_played = games_played - ?,
+                   total_bye = total_bye - ?, w = w - ?, l = l - ?, t = t - ?
+WHERE kunci = ?
+"""
+SQL_HAPUS_KONTRIBUSI = "DELETE FROM kontribusi WHERE turnamen_id = ?"
+SQL_INSERT_KONTRIBUSI = """
+INSERT INTO kontribusi (turnamen_id, kunci, nama, total_poin, games_played, total_bye, w, l, t)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_TAMBAH = """
+INSERT INTO agregat (kunci, nama, turnamen, total_poin, games_played, total_bye, w, l, t)
+VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (kunci) DO UPDATE SET
+    nama = excluded.nama, turnamen = turnamen + 1, total_poin = total_poin + excluded.total_poin,
+    games_played = games_played + excluded.games_played, total_bye = total_bye + excluded.total_bye,
+    w = w + excluded.w, l = l + excluded.l, t = t + excluded.t
+"""
+SQL_BERSIHKAN = "DELETE FROM agregat WHERE kunci = ? AND turnamen <= 0"
+SQL_SIMPAN_TURNAMEN = "INSERT OR REPLACE INTO turnamen (turnamen_id, putaran, jumlah_pemain) VALUES (?, ?, ?)"
+SQL_HAPUS_TURNAMEN = "DELETE FROM turnamen WHERE turnamen_id = ?"
+
+SQL_HALAMAN = """
+SELECT nama, total_poin, games_played, total_bye, w, l, t, turnamen FROM agregat
+ORDER BY total_poin DESC, w DESC, kunci LIMIT ? OFFSET ?
+"""
+SQL_DI_ATAS = "SELECT COUNT(*) FROM agregat WHERE total_poin > ?"
+SQL_JUMLAH = "SELECT (SELECT COUNT(*) FROM agregat), (SELECT COUNT(*) FROM turnamen)"
+SQL_SEMUA_TURNAMEN = "SELECT turnamen_id, putaran, jumlah_pemain FROM turnamen ORDER BY turnamen_id"
+
+KOLOM_MUSIM = ['Nama', 'Total_Poin', 'Games_Played', 'Total_Bye', 'W', 'L', 'T', 'Turnamen']
+BATAS_HALAMAN_MAKS = 500
+
+
+def baris_turnamen(turnamen):
+    """(nama, poin, games, bye, w, l, t) setiap pemain turnamen, dari counter TabelPemain (tanpa membaca jadwal)."""
+    with turnamen.kunci:
+        pemain = turnamen.pemain
+        return [(nama, *angka) for nama, angka in zip(pemain.nama, pemain.angka[:len(pemain)].tolist())]
+
+
+class IndeksMusim:
+    """
+    Agregat klasemen satu musim di SQLite. Dengan `path`: WAL, satu koneksi
+    per thread seperti PenyimpananSQLite. Tanpa `path`: database memori
+    (hilang saat proses berhenti) dengan satu koneksi yang dijaga kunci.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lokal = threading.local()
+        self._memori = None
+        self._kunci = nullcontext()
+        if path is None:
+            self._memori = sqlite3.connect(':memory:', isolation_level=None, check_same_thread=False)
+            self._kunci = threading.RLock()
+        elif os.path.dirname(path):
+            # Default <TURNAMEN_DIR>/musim.db dibuka saat app diimpor, sebelum registri membuat direktorinya
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.koneksi().executescript(SKEMA)
+
+    def koneksi(self):
+        if self._memori is not None:
+            return self._memori
+        conn = getattr(self._lokal, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._lokal.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaksi(self, mulai='BEGIN IMMEDIATE'):
+        with self._kunci:
+            conn = self.koneksi()
+            conn.execute(mulai)
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    # --- Tulis ---
+    def lipat(self, turnamen_id, baris, putaran=0):
+        """
+        Menggantikan kontribusi `turnamen_id` dengan `baris` (lihat
+        baris_turnamen). Pemain dengan kunci sama dalam satu turnamen
+        dijumlahkan. Mengembalikan jumlah pemain (kunci) yang dilipat.
+        """
+        per_kunci = {}
+        for nama, *angka in baris:
+            kunci = kunci_pemain(nama)
+            lama = per_kunci.get(kunci)
+            per_kunci[kunci] = (nama, angka) if lama is None else (lama[0], [a + b for a, b in zip(lama[1], angka)])
+
+        with self._transaksi() as conn:
+            self._kurangi(conn, turnamen_id)
+            conn.executemany(SQL_INSERT_KONTRIBUSI, [(turnamen_id, kunci, nama, *angka)
+                                                     for kunci, (nama, angka) in per_kunci.items()])
+            conn.executemany(SQL_TAMBAH, [(kunci, nama, *angka) for kunci, (nama, angka) in per_kunci.items()])
+            conn.execute(SQL_SIMPAN_TURNAMEN, (turnamen_id, putaran, len(per_kunci)))
+        return len(per_kunci)
+
+    def lipat_turnamen(self, turnamen_id, turnamen):
+        """lipat() dari klasemen Turnamen saat ini."""
+        return self.lipat(turnamen_id, baris_turnamen(turnamen), turnamen.putaran_saat_ini)
+
+    def keluarkan(self, turnamen_id):
+        """Menghapus kontribusi turnamen dari musim; False jika belum pernah dilipat."""
+        with self._transaksi() as conn:
+            ada = self._kurangi(conn, turnamen_id)
+            conn.execute(SQL_HAPUS_TURNAMEN, (turnamen_id,))
+        return ada
+
+    @staticmethod
+    def _kurangi(conn, turnamen_id):
+        lama = conn.execute(SQL_KONTRIBUSI, (turnamen_id,)).fetchall()
+        if not lama:
+            return False
+        conn.executemany(SQL_KURANGI, [(*angka, kunci) for kunci, *angka in lama])
+        conn.execute(SQL_HAPUS_KONTRIBUSI, (turnamen_id,))
+        # Pemain yang tidak lagi punya turnamen di musim ini dikeluarkan dari agregat
+        conn.executemany(SQL_BERSIHKAN, [(row[0],) for row in lama])
+        return True
+
+    # --- Baca ---
+    def jumlah(self):
+        """(jumlah pemain, jumlah turnamen) di musim ini."""
+        with self._kunci:
+            return self.koneksi().execute(SQL_JUMLAH).fetchone()
+
+    def daftar_turnamen(self):
+        """Turnamen yang sudah dilipat ke musim ini (ID, putaran saat dilipat, jumlah pemain), urut ID."""
+        with self._kunci:
+            rows = self.koneksi().execute(SQL_SEMUA_TURNAMEN).fetchall()
+        return [{'Turnamen_ID': t_id, 'Putaran': putaran, 'Pemain': n} for t_id, putaran, n in rows]
+
+    def halaman(self, batas=50, offset=0):
+        """
+        Baris klasemen musim urut Total_Poin DESC (seri: W DESC, lalu nama),
+        `batas` baris mulai `offset`. Peringkat memakai aturan 'min' seperti
+        data_peringkat: poin sama = peringkat sama, juga lintas halaman.
+        """
+        batas = max(0, min(batas, BATAS_HALAMAN_MAKS))
+        offset = max(0, offset)
+        # Satu snapshot untuk halaman dan hitungan peringkat
+        with self._transaksi('BEGIN') as conn:
+            rows = conn.execute(SQL_HALAMAN, (batas, offset)).fetchall()
+            peringkat = poin_sebelumnya = None
+            if rows:
+                peringkat = conn.execute(SQL_DI_ATAS, (rows[0][1],)).fetchone()[0] + 1
+                poin_sebelumnya = rows[0][1]
+        hasil = []
+        for posisi, row in enumerate(rows, start=offset + 1):
+            if row[1] != poin_sebelumnya:
+                peringkat, poin_sebelumnya = posisi, row[1]
+            hasil.append({'Peringkat': peringkat, **dict(zip(KOLOM_MUSIM, row))})
+        return hasil
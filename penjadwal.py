@@ -0,0 +1,262 @@
+import random
+import time
+
+import numpy as np
+
+from profil import terukur
+from tabel import K_BYE, K_GAMES
+
+# --- Mesin Pemasangan (Partner/Lawan) ---
+# Riwayat disimpan sebagai matriks NumPy yang diindeks langsung dengan ID pemain,
+# lalu setiap putaran disusun dengan greedy + local search (tukar slot) agar
+# pasangan dan lawan yang sama sesedikit mungkin terulang.
+
+BOBOT_PARTNER = 3  # Mengulang partner lebih "mahal" daripada mengulang lawan
+BOBOT_LAWAN = 1
+BATAS_WAKTU_DEFAULT = 0.004  # detik
+
+# Mesin pencarian paralel opsional (lihat penjadwal_paralel.py); None = hanya jalur cepat
+_mesin_paralel = None
+
+
+class RiwayatPasangan:
+    """Matriks simetris jumlah kali dua pemain menjadi partner / lawan."""
+
+    def __init__(self, kapasitas=64):
+        self.partner = np.zeros((kapasitas, kapasitas), dtype=np.int32)
+        self.lawan = np.zeros((kapasitas, kapasitas), dtype=np.int32)
+
+    def _pastikan_kapasitas(self, max_id):
+        kapasitas = len(self.partner)
+        if max_id < kapasitas:
+            return
+        while kapasitas <= max_id:
+            kapasitas *= 2
+        for nama in ('partner', 'lawan'):
+            lama = getattr(self, nama)
+            baru = np.zeros((kapasitas, kapasitas), dtype=np.int32)
+            baru[:len(lama), :len(lama)] = lama
+            setattr(self, nama, baru)
+
+    def catat(self, match, arah=1):
+        """Menambah (arah=1) atau membatalkan (arah=-1) satu match ke riwayat."""
+        # `p == p` menyaring NaN tanpa pandas
+        tim_1 = [int(p) for p in (match['Pemain_1_A'], match['Pemain_1_B']) if p is not None and p == p]
+        tim_2 = [int(p) for p in (match['Pemain_2_A'], match['Pemain_2_B']) if p is not None and p == p]
+        if not tim_1 or not tim_2:
+            return
+        self._pastikan_kapasitas(max(tim_1 + tim_2))
+
+        for tim in (tim_1, tim_2):
+            if len(tim) == 2:
+                a, b = tim
+                self.partner[a, b] += arah
+                self.partner[b, a] += arah
+        for a in tim_1:
+            for b in tim_2:
+                self.lawan[a, b] += arah
+                self.lawan[b, a] += arah
+
+    def catat_grup(self, grup, arah=1):
+        """catat() untuk satu grup lapangan [1A, 1B, 2A, 2B] atau [1A, 2A]."""
+        if len(grup) == 4:
+            p1a, p1b, p2a, p2b = grup
+        else:
+            (p1a, p2a), p1b, p2b = grup, None, None
+        self.catat({'Pemain_1_A': p1a, 'Pemain_1_B': p1b, 'Pemain_2_A': p2a, 'Pemain_2_B': p2b}, arah)
+
+    def catat_array(self, ids, arah=1):
+        """
+        Versi vectorized dari catat() untuk banyak match sekaligus: `ids`
+        berbentuk (n, 4) float (lihat tabel.array_id), NaN untuk slot kosong.
+        """
+        ids = np.asarray(ids, dtype=float).reshape(-1, 4)
+        if ids.size == 0 or np.isnan(ids).all():
+            return
+        self._pastikan_kapasitas(int(np.nanmax(ids)))
+
+        p1a, p1b, p2a, p2b = ids.T
+        for matriks, pasangan in ((self.partner, [(p1a, p1b), (p2a, p2b)]),
+                                  (self.lawan, [(p1a, p2a), (p1a, p2b), (p1b, p2a), (p1b, p2b)])):
+            for a, b in pasangan:
+                valid = ~(np.isnan(a) | np.isnan(b))
+                a, b = a[valid].astype(np.int64), b[valid].astype(np.int64)
+                np.add.at(matriks, (a, b), arah)
+                np.add.at(matriks, (b, a), arah)
+
+    def salin(self):
+        riwayat = RiwayatPasangan(kapasitas=len(self.partner))
+        riwayat.partner = self.partner.copy()
+        riwayat.lawan = self.lawan.copy()
+        return riwayat
+
+
+def _biaya_lapangan(slot, mulai, partner, lawan, double):
+    """Biaya satu lapangan; `slot` berisi indeks lokal pemain."""
+    if double:
+        a, b, c, d = slot[mulai:mulai + 4]
+        return (BOBOT_PARTNER * (partner[a][b] + partner[c][d])
+                + BOBOT_LAWAN * (lawan[a][c] + lawan[a][d] + lawan[b][c] + lawan[b][d]))
+    a, c = slot[mulai:mulai + 2]
+    return BOBOT_LAWAN * lawan[a][c]
+
+
+def _greedy(n, partner, lawan, double, acak=random):
+    """Susunan awal: tiap slot diisi pemain sisa yang paling jarang bertemu."""
+    sisa = list(range(n))
+    acak.shuffle(sisa)
+    slot = []
+    players_per_court = 4 if double else 2
+    while sisa:
+        grup = [sisa.pop()]
+        while len(grup) < players_per_court:
+            posisi = len(grup)
+            def biaya(kandidat):
+                if double and posisi == 1:
+                    return BOBOT_PARTNER * partner[grup[0]][kandidat]
+                if double and posisi == 2:
+                    return BOBOT_LAWAN * (lawan[grup[0]][kandidat] + lawan[grup[1]][kandidat])
+                if double and posisi == 3:
+                    return (BOBOT_PARTNER * partner[grup[2]][kandidat]
+                            + BOBOT_LAWAN * (lawan[grup[0]][kandidat] + lawan[grup[1]][kandidat]))
+                return BOBOT_LAWAN * lawan[grup[0]][kandidat]
+            terbaik = min(sisa, key=biaya)
+            sisa.remove(terbaik)
+            grup.append(terbaik)
+        slot.extend(grup)
+    return slot
+
+
+def cari_lokal(slot, label, partner, lawan, double, batas, acak=random, maks_tanpa_perbaikan=None):
+    """
+    Local search: tukar dua slot berlabel sama dari lapangan berbeda, terima
+    jika biaya tidak naik. Berhenti saat biaya 0, waktu `batas`
+    (time.perf_counter) habis, atau `maks_tanpa_perbaikan` percobaan
+    berturut-turut tidak menurunkan biaya. `slot` diubah di tempat;
+    mengembalikan (slot, total biaya).
+    """
+    n = len(slot)
+    players_per_court = 4 if double else 2
+
+    # Indeks slot per label, untuk memilih pasangan tukar yang sah
+    slot_per_label = {}
+    for i, lab in enumerate(label):
+        slot_per_label.setdefault(lab, []).append(i)
+    grup_tukar = [s for s in slot_per_label.values() if len(s) > 1] if n > 2 else []
+
+    biaya = [_biaya_lapangan(slot, i, partner, lawan, double) for i in range(0, n, players_per_court)]
+    total = sum(biaya)
+
+    percobaan = tanpa_perbaikan = 0
+    while total > 0 and grup_tukar:
+        percobaan += 1
+        if percobaan % 32 == 0 and time.perf_counter() > batas:
+            break
+        if maks_tanpa_perbaikan is not None and tanpa_perbaikan >= maks_tanpa_perbaikan:
+            break
+        kandidat = acak.choice(grup_tukar)
+        i, j = acak.sample(kandidat, 2)
+        lap_i, lap_j = i // players_per_court, j // players_per_court
+        if lap_i == lap_j and (not double or (i % 4 < 2) == (j % 4 < 2)):
+            continue  # Tukar di dalam tim yang sama tidak mengubah apa pun
+
+        slot[i], slot[j] = slot[j], slot[i]
+        baru_i = _biaya_lapangan(slot, lap_i * players_per_court, partner, lawan, double)
+        baru_j = baru_i if lap_i == lap_j else _biaya_lapangan(slot, lap_j * players_per_court, partner, lawan, double)
+        delta = baru_i - biaya[lap_i] + (0 if lap_i == lap_j else baru_j - biaya[lap_j])
+
+        if delta <= 0:
+            biaya[lap_i] = baru_i
+            biaya[lap_j] = baru_j
+            total += delta
+            tanpa_perbaikan = 0 if delta < 0 else tanpa_perbaikan + 1
+        else:
+            slot[i], slot[j] = slot[j], slot[i]
+            tanpa_perbaikan += 1
+    return slot, total
+
+
+@terukur()
+def susun_grup(pemain_ids, riwayat, players_per_court, kelompok=None, batas_waktu=BATAS_WAKTU_DEFAULT,
+               tenggat_paralel=None):
+    """
+    Menyusun pemain_ids menjadi grup per lapangan dengan pengulangan minimal.
+
+    Urutan slot per lapangan: [1A, 1B, 2A, 2B] (Double) atau [1A, 2A] (Single).
+    `kelompok` (opsional) memberi label per posisi awal pemain_ids; pertukaran
+    hanya dilakukan antar slot berlabel sama (dipakai Mexicano agar pemain
+    peringkat tinggi tetap di slot A dan peringkat rendah di slot B).
+    Jika mesin paralel terpasang dan pemainnya cukup banyak, pencarian
+    disebar ke proses lain dan jalur ini menjadi cadangannya;
+    `tenggat_paralel` (detik) menggantikan tenggat mesin untuk pencarian ini.
+    """
+    n = len(pemain_ids)
+    if n == 0:
+        return []
+    double = players_per_court == 4
+    ids = np.asarray(pemain_ids, dtype=np.int64)
+    riwayat._pastikan_kapasitas(int(ids.max()))
+    partner_np = riwayat.partner[np.ix_(ids, ids)]
+    lawan_np = riwayat.lawan[np.ix_(ids, ids)]
+    partner, lawan = partner_np.tolist(), lawan_np.tolist()
+    label = [0] * n if kelompok is None else list(kelompok)
+
+    def jalur_cepat():
+        slot = _greedy(n, partner, lawan, double) if kelompok is None else list(range(n))
+        return cari_lokal(slot, label, partner, lawan, double, time.perf_counter() + batas_waktu)
+
+    mesin = _mesin_paralel
+    if mesin is not None and n >= mesin.min_pemain:
+        slot, _ = mesin.cari(partner_np, lawan_np, double, label, kelompok is not None, jalur_cepat,
+                             tenggat=tenggat_paralel)
+    else:
+        slot, _ = jalur_cepat()
+
+    urutan = [int(ids[k]) for k in slot]
+    return [urutan[i:i + players_per_court] for i in range(0, n, players_per_court)]
+
+
+@terukur()
+def rencanakan_americano(pemain, jumlah_putaran, num_lapangan, players_per_court, riwayat,
+                         batas_waktu=BATAS_WAKTU_DEFAULT):
+    """
+    Menyusun rencana Americano untuk `jumlah_putaran` putaran sekaligus.
+
+    Bye dan Games_Played disimulasikan dari kondisi TabelPemain `pemain` agar bye
+    tersebar merata, dan riwayat partner/lawan disimulasikan pada salinan
+    `riwayat` sehingga putaran-putaran dalam rencana juga saling menghindari
+    pengulangan. Mengembalikan list putaran, masing-masing list grup lapangan.
+    Dengan mesin paralel, seluruh rencana berbagi satu tenggat mesin: sisa
+    waktunya dibagi rata ke putaran yang belum disusun.
+    """
+    ids = pemain.id_aktif().copy()
+    bye = pemain.kolom(K_BYE).copy()
+    games = pemain.kolom(K_GAMES).copy()
+
+    total_slots = min(num_lapangan * players_per_court, len(ids))
+    total_slots -= total_slots % players_per_court
+    if total_slots < players_per_court:
+        return []
+
+    riwayat_simulasi = riwayat.salin()
+    rencana = []
+    mesin = _mesin_paralel
+    akhir = None if mesin is None else time.monotonic() + mesin.tenggat
+    for k in range(jumlah_putaran):
+        tenggat = None if akhir is None else max(0.0, akhir - time.monotonic()) / (jumlah_putaran - k)
+        # Prioritas sama dengan buat_jadwal: Total_Bye DESC, Games_Played ASC, acak
+        urutan = np.lexsort((np.random.random(len(ids)), games, -bye))
+        bermain = urutan[:total_slots]
+
+        grup_lapangan = susun_grup(ids[bermain].tolist(), riwayat_simulasi, players_per_court,
+                                   batas_waktu=batas_waktu, tenggat_paralel=tenggat)
+        for grup in grup_lapangan:
+            riwayat_simulasi.catat_grup(grup)
+
+        istirahat = np.ones(len(ids), dtype=bool)
+        istirahat[bermain] = False
+        games[bermain] += 1
+        bye[istirahat] += 1
+        rencana.append(grup_lapangan)
+
+    return rencana
@@ -0,0 +1,204 @@
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import penjadwal
+from penjadwal import _greedy, cari_lokal
+
+# --- Pencarian Jadwal Paralel (Opsional) ---
+# susun_grup biasanya hanya punya beberapa milidetik untuk satu local search.
+# Mesin ini menyebar pencarian ke ProcessPoolExecutor: setiap proses mencoba
+# susunan awal acak berulang kali (greedy untuk Americano, acak per kelompok
+# untuk Mexicano) dan mengembalikan yang terbaik. Sementara itu proses utama
+# menjalankan jalur cepat seperti biasa. Pada tenggat, hasil terbaik yang
+# sudah masuk dipakai. Jika tidak ada proses yang selesai tepat waktu, hasil
+# jalur cepat yang dipakai. Rencana Americano beberapa putaran berbagi satu
+# tenggat (lihat penjadwal.rencanakan_americano), bukan satu tenggat per putaran.
+#
+# Matriks partner/lawan pemain yang bermain ditulis sekali ke shared memory;
+# proses pekerja membacanya tanpa pickle. Header [generasi, n] memastikan
+# pekerja yang terlambat tidak memakai data pencarian berikutnya.
+
+TENGGAT_DEFAULT = 0.05  # detik, seluruh pencarian termasuk jalur cepat
+MIN_PEMAIN_DEFAULT = 16  # di bawah ini overhead antar proses lebih mahal daripada hasilnya
+HEADER = 2  # int64: generasi, n
+# Bagian tenggat yang disisakan untuk mengirim hasil pekerja kembali ke proses utama
+CADANGAN_IPC = 0.2
+
+# Shared memory yang sudah dibuka di proses pekerja (nama -> SharedMemory)
+_terbuka = {}
+
+
+def _buka(nama):
+    shm = _terbuka.get(nama)
+    if shm is None:
+        for lama in _terbuka.values():
+            lama.close()
+        _terbuka.clear()
+        # Pekerja spawn memakai resource tracker proses utama, jadi unlink tetap milik proses utama
+        shm = _terbuka[nama] = shared_memory.SharedMemory(name=nama)
+    return shm
+
+
+def _baca(shm, generasi):
+    """(partner, lawan) sebagai list bersarang, atau None jika data sudah milik pencarian lain."""
+    header = np.ndarray((HEADER,), dtype=np.int64, buffer=shm.buf)
+    if header[0] != generasi:
+        return None
+    n = int(header[1])
+    data = np.ndarray((2, n, n), dtype=np.int32, buffer=shm.buf, offset=HEADER * 8)
+    partner, lawan = data[0].tolist(), data[1].tolist()
+    # Penulis mengganti generasi lebih dulu; jika berubah, salinan di atas mungkin campuran
+    if header[0] != generasi:
+        return None
+    return partner, lawan
+
+
+def _cari_di_pekerja(nama, generasi, double, label, berkelompok, benih, tenggat):
+    """
+    Dijalankan di proses pekerja: restart acak + local search sampai
+    `tenggat` (time.monotonic, sama di semua proses). Mengembalikan
+    (total biaya, slot, jumlah restart) atau None.
+    """
+    data = _baca(_buka(nama), generasi)
+    if data is None:
+        return None
+    partner, lawan = data
+    n = len(label)
+    acak = random.Random(benih)
+    per_label = {}
+    for i, lab in enumerate(label):
+        per_label.setdefault(lab, []).append(i)
+
+    terbaik, restart = None, 0
+    while time.monotonic() < tenggat:
+        restart += 1
+        if berkelompok:
+            # Permutasi acak di dalam setiap kelompok (tetap susunan yang sah)
+            slot = list(range(n))
+            for posisi in per_label.values():
+                isi = list(posisi)
+                acak.shuffle(isi)
+                for i, k in zip(posisi, isi):
+                    slot[i] = k
+        else:
+            slot = _greedy(n, partner, lawan, double, acak)
+        batas = time.perf_counter() + (tenggat - time.monotonic())
+        slot, total = cari_lokal(slot, label, partner, lawan, double, batas, acak, maks_tanpa_perbaikan=20 * n)
+        if terbaik is None or total < terbaik[0]:
+            terbaik = (total, slot)
+            if total == 0:
+                break
+    if terbaik is None:
+        return None
+    return terbaik[0], terbaik[1], restart
+
+
+def _siap(_):
+    return os.getpid()
+
+
+class MesinParalel:
+    """
+    Pool proses untuk susun_grup. `jumlah_proses` pekerja, `tenggat` detik
+    per pencarian (jalur cepat dan pekerja berjalan bersamaan). Hanya satu
+    pencarian berjalan pada satu waktu; pemanggil lain langsung memakai
+    jalur cepat. Pasang dengan pasang() agar dipakai susun_grup.
+    """
+
+    def __init__(self, jumlah_proses=None, tenggat=TENGGAT_DEFAULT, min_pemain=MIN_PEMAIN_DEFAULT):
+        self.jumlah_proses = jumlah_proses or os.cpu_count() or 1
+        self.tenggat = tenggat
+        self.min_pemain = min_pemain
+        self._kunci = threading.Lock()
+        self._generasi = 0
+        self._shm = None
+        # Pekerja baru dibuat dengan spawn: fork dari proses web yang punya thread tidak aman
+        self._pool = ProcessPoolExecutor(self.jumlah_proses, mp_context=multiprocessing.get_context('spawn'))
+        # Statistik untuk benchmark / monitoring
+        self.jumlah_cari = self.jumlah_cadangan = self.jumlah_sibuk = 0
+
+    def panaskan(self):
+        """Menunggu semua pekerja hidup (impor modul), agar pencarian pertama tidak habis untuk startup."""
+        list(self._pool.map(_siap, range(self.jumlah_proses)))
+
+    def _tulis(self, partner, lawan):
+        n = len(partner)
+        ukuran = HEADER * 8 + 2 * n * n * 4
+        if self._shm is None or self._shm.size < ukuran:
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+            self._shm = shared_memory.SharedMemory(create=True, size=max(ukuran, 1 << 16))
+        self._generasi += 1
+        header = np.ndarray((HEADER,), dtype=np.int64, buffer=self._shm.buf)
+        header[0] = self._generasi
+        header[1] = n
+        data = np.ndarray((2, n, n), dtype=np.int32, buffer=self._shm.buf, offset=HEADER * 8)
+        data[0] = partner
+        data[1] = lawan
+
+    def cari(self, partner, lawan, double, label, berkelompok, jalur_cepat, tenggat=None):
+        """
+        Susunan slot terbaik dalam tenggat: (slot, total biaya). `partner` /
+        `lawan` adalah matriks (n, n) pemain yang bermain, `jalur_cepat()`
+        menjalankan pencarian biasa di proses ini dan menjadi cadangan.
+        `tenggat` (detik, opsional) menggantikan self.tenggat untuk pencarian ini.
+        """
+        if not self._kunci.acquire(blocking=False):
+            self.jumlah_sibuk += 1
+            return jalur_cepat()
+        try:
+            durasi = self.tenggat if tenggat is None else tenggat
+            mulai = time.monotonic()
+            tenggat = mulai + durasi
+            self._tulis(partner, lawan)
+            tenggat_pekerja = mulai + durasi * (1 - CADANGAN_IPC)
+            futures = [self._pool.submit(_cari_di_pekerja, self._shm.name, self._generasi, double, label,
+                                         berkelompok, random.getrandbits(64), tenggat_pekerja)
+                       for _ in range(self.jumlah_proses)]
+            slot, total = jalur_cepat()
+            terbaik_dari_pekerja = False
+            # Tanpa pengulangan sama sekali tidak ada yang bisa diperbaiki; jangan tunggu tenggat
+            selesai, belum = wait(futures, timeout=max(0.0, tenggat - time.monotonic()) if total > 0 else 0)
+            for future in belum:
+                future.cancel()
+            for future in selesai:
+                hasil = None if future.exception() is not None else future.result()
+                if hasil is not None and hasil[0] < total:
+                    total, slot = hasil[0], hasil[1]
+                    terbaik_dari_pekerja = True
+            self.jumlah_cari += 1
+            if not terbaik_dari_pekerja:
+                self.jumlah_cadangan += 1
+            return slot, total
+        finally:
+            self._kunci.release()
+
+    def tutup(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+def pasang(jumlah_proses=None, tenggat=TENGGAT_DEFAULT, min_pemain=MIN_PEMAIN_DEFAULT):
+    """Membuat MesinParalel, memanaskan pekerjanya, dan memakainya di susun_grup."""
+    mesin = MesinParalel(jumlah_proses, tenggat, min_pemain)
+    mesin.panaskan()
+    penjadwal._mesin_paralel = mesin
+    return mesin
+
+
+def lepas():
+    """Kembali ke jalur cepat saja dan menutup pool yang terpasang."""
+    mesin, penjadwal._mesin_paralel = penjadwal._mesin_paralel, None
+    if mesin is not None:
+        mesin.tutup()
@@ -0,0 +1,257 @@
+import json
+import sqlite3
+import threading
+
+from tabel import KOLOM_JADWAL, KOLOM_PEMAIN
+
+# --- Penyimpanan SQLite (WAL) ---
+# Semua query memakai SQL konstan dengan parameter, sehingga sqlite3 menyimpan
+# statement yang sudah di-prepare di cache per koneksi (cached_statements).
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS pemain (
+    id INTEGER PRIMARY KEY,
+    nama TEXT NOT NULL,
+    total_poin INTEGER NOT NULL DEFAULT 0,
+    games_played INTEGER NOT NULL DEFAULT 0,
+    total_bye INTEGER NOT NULL DEFAULT 0,
+    w INTEGER NOT NULL DEFAULT 0,
+    l INTEGER NOT NULL DEFAULT 0,
+    t INTEGER NOT NULL DEFAULT 0,
+    rating INTEGER
+);
+CREATE TABLE IF NOT EXISTS jadwal (
+    match_id INTEGER PRIMARY KEY,
+    putaran INTEGER NOT NULL,
+    lapangan INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    pemain_1_a INTEGER,
+    pemain_1_b INTEGER,
+    pemain_2_a INTEGER,
+    pemain_2_b INTEGER,
+    poin_tim_1 INTEGER NOT NULL DEFAULT 0,
+    poin_tim_2 INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    versi INTEGER NOT NULL DEFAULT 0,
+    delta_rating INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_jadwal_putaran ON jadwal (putaran);
+CREATE TABLE IF NOT EXISTS bye (
+    putaran INTEGER PRIMARY KEY,
+    pemain TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS config (
+    kunci TEXT PRIMARY KEY,
+    nilai TEXT NOT NULL
+);
+INSERT OR IGNORE INTO config (kunci, nilai) VALUES ('versi', '0');
+"""
+
+SQL_UPSERT_PEMAIN = """
+INSERT INTO pemain (id, nama, total_poin, games_played, total_bye, w, l, t)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    nama = excluded.nama, total_poin = excluded.total_poin,
+    games_played = excluded.games_played, total_bye = excluded.total_bye,
+    w = excluded.w, l = excluded.l, t = excluded.t
+"""
+SQL_HAPUS_PEMAIN = "DELETE FROM pemain WHERE id = ?"
+SQL_INSERT_MATCH = """
+INSERT OR REPLACE INTO jadwal (match_id, putaran, lapangan, mode, pemain_1_a, pemain_1_b,
+                               pemain_2_a, pemain_2_b, poin_tim_1, poin_tim_2, status, versi)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# Optimistic concurrency: baris hanya diubah jika versinya masih versi yang dibaca
+SQL_UPDATE_SKOR = """
+UPDATE jadwal SET poin_tim_1 = ?, poin_tim_2 = ?, status = ?, versi = ?
+WHERE match_id = ? AND versi = ?
+"""
+SQL_HAPUS_MATCH = "DELETE FROM jadwal WHERE match_id = ?"
+# Rating Elo (1/SATUAN, lihat rating.py) dan delta Tim 1 yang sudah diterapkan per match;
+# NULL = belum pernah disimpan (database lama), rating lalu dihitung ulang dari riwayat
+SQL_SIMPAN_RATING = "UPDATE pemain SET rating = ? WHERE id = ?"
+SQL_SIMPAN_DELTA = "UPDATE jadwal SET delta_rating = ? WHERE match_id = ?"
+# Buku bye: satu baris per putaran, ID pemain sebagai list JSON (baris ada = sudah dicatat)
+SQL_SIMPAN_BYE = "INSERT OR REPLACE INTO bye (putaran, pemain) VALUES (?, ?)"
+SQL_SIMPAN_CONFIG = "INSERT OR REPLACE INTO config (kunci, nilai) VALUES (?, ?)"
+SQL_NAIKKAN_VERSI = "UPDATE config SET nilai = CAST(nilai AS INTEGER) + 1 WHERE kunci = 'versi'"
+SQL_VERSI = "SELECT CAST(nilai AS INTEGER) FROM config WHERE kunci = 'versi'"
+
+SQL_MUAT_PEMAIN = "SELECT id, nama, total_poin, games_played, total_bye, w, l, t FROM pemain ORDER BY id"
+SQL_MUAT_PUTARAN = """
+SELECT match_id, putaran, lapangan, mode, pemain_1_a, pemain_1_b, pemain_2_a, pemain_2_b,
+       poin_tim_1, poin_tim_2, status, versi
+FROM jadwal WHERE putaran = ? ORDER BY match_id
+"""
+SQL_MUAT_SEMUA_JADWAL = """
+SELECT match_id, putaran, lapangan, mode, pemain_1_a, pemain_1_b, pemain_2_a, pemain_2_b,
+       poin_tim_1, poin_tim_2, status, versi
+FROM jadwal ORDER BY match_id
+"""
+SQL_MUAT_BYE = "SELECT putaran, pemain FROM bye WHERE putaran = ?"
+SQL_MUAT_SEMUA_BYE = "SELECT putaran, pemain FROM bye ORDER BY putaran"
+SQL_MUAT_PASANGAN = "SELECT pemain_1_a, pemain_1_b, pemain_2_a, pemain_2_b FROM jadwal"
+SQL_MUAT_RATING = "SELECT id, rating FROM pemain"
+SQL_MUAT_DELTA = "SELECT match_id, delta_rating FROM jadwal WHERE putaran = ? AND delta_rating IS NOT NULL"
+
+# Urutan kolom SELECT di atas mengikuti skema tabel.py
+KOLOM_MATCH = ['Match_ID'] + KOLOM_JADWAL
+
+
+class KonflikVersi(Exception):
+    """Baris match sudah diubah oleh proses lain sejak terakhir dibaca."""
+
+
+class PenyimpananSQLite:
+    """
+    Penyimpanan pemain, jadwal dan config turnamen di SQLite dengan mode WAL.
+    Satu koneksi per thread; pembaca tidak memblokir penulis.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lokal = threading.local()
+        # Semua koneksi yang pernah dibuka (dari thread mana pun), untuk tutup()
+        self._koneksi = []
+        self._kunci_koneksi = threading.Lock()
+        conn = self.koneksi()
+        conn.executescript(SKEMA)
+        # Migrasi database lama yang belum punya kolom versi
+        kolom = [row[1] for row in conn.execute('PRAGMA table_info(jadwal)')]
+        if 'versi' not in kolom:
+            conn.execute('ALTER TABLE jadwal ADD COLUMN versi INTEGER NOT NULL DEFAULT 0')
+        if 'delta_rating' not in kolom:
+            conn.execute('ALTER TABLE jadwal ADD COLUMN delta_rating INTEGER')
+        if 'rating' not in [row[1] for row in conn.execute('PRAGMA table_info(pemain)')]:
+            conn.execute('ALTER TABLE pemain ADD COLUMN rating INTEGER')
+
+    def koneksi(self):
+        conn = getattr(self._lokal, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._lokal.conn = conn
+            with self._kunci_koneksi:
+                self._koneksi.append(conn)
+        return conn
+
+    def tutup(self):
+        """
+        Menutup koneksi semua thread. Objek ini tetap bisa dipakai: koneksi()
+        berikutnya membuka koneksi baru.
+        """
+        with self._kunci_koneksi:
+            semua, self._koneksi = self._koneksi, []
+            self._lokal = threading.local()
+        for conn in semua:
+            conn.close()
+
+    # --- Tulis ---
+    def simpan_perubahan(self, pemain=(), pemain_hapus=(), match_baru=(), skor=(), match_hapus=(), config=None,
+                         bye=None, rating=(), delta_rating=(), kosongkan=False):
+        """
+        Menulis satu unit perubahan dalam satu transaksi dan menaikkan versi.
+        `pemain` dan `match_baru` berisi tuple baris; `skor` berisi
+        (poin_tim_1, poin_tim_2, status, versi_baru, match_id, versi_lama) dan
+        menimbulkan KonflikVersi (seluruh transaksi dibatalkan) jika baris
+        sudah diubah proses lain. `bye` (putaran -> list ID) menimpa buku bye
+        putaran tersebut. `rating` berisi (rating, id) dan `delta_rating`
+        (delta, match_id), ditulis setelah baris pemain / match baru.
+        `kosongkan=True` menghapus semua pemain dan
+        match lebih dulu (dipakai saat state dibangun ulang).
+        Mengembalikan versi baru.
+        """
+        conn = self.koneksi()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if kosongkan:
+                conn.execute('DELETE FROM pemain')
+                conn.execute('DELETE FROM jadwal')
+                conn.execute('DELETE FROM bye')
+            if pemain_hapus:
+                conn.executemany(SQL_HAPUS_PEMAIN, [(p_id,) for p_id in pemain_hapus])
+            if pemain:
+                conn.executemany(SQL_UPSERT_PEMAIN, pemain)
+            if match_hapus:
+                conn.executemany(SQL_HAPUS_MATCH, [(m_id,) for m_id in match_hapus])
+            if match_baru:
+                conn.executemany(SQL_INSERT_MATCH, match_baru)
+            for baris in skor:
+                if conn.execute(SQL_UPDATE_SKOR, baris).rowcount != 1:
+                    raise KonflikVersi(baris[4])
+            if rating:
+                conn.executemany(SQL_SIMPAN_RATING, rating)
+            if delta_rating:
+                conn.executemany(SQL_SIMPAN_DELTA, delta_rating)
+            if bye:
+                conn.executemany(SQL_SIMPAN_BYE, [(putaran, json.dumps(ids)) for putaran, ids in bye.items()])
+            if config:
+                conn.executemany(SQL_SIMPAN_CONFIG, [(k, json.dumps(v)) for k, v in config.items()])
+            conn.execute(SQL_NAIKKAN_VERSI)
+            versi = conn.execute(SQL_VERSI).fetchone()[0]
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return versi
+
+    # --- Baca ---
+    def versi(self):
+        return self.koneksi().execute(SQL_VERSI).fetchone()[0]
+
+    def muat_config(self):
+        rows = self.koneksi().execute("SELECT kunci, nilai FROM config WHERE kunci != 'versi'").fetchall()
+        return {kunci: json.loads(nilai) for kunci, nilai in rows}
+
+    def muat_pemain(self):
+        """Klasemen: satu dict per pemain."""
+        rows = self.koneksi().execute(SQL_MUAT_PEMAIN).fetchall()
+        return [dict(zip(KOLOM_PEMAIN, row)) for row in rows]
+
+    def muat_rating(self):
+        """{ID: rating} semua pemain; None untuk pemain yang ratingnya belum pernah disimpan."""
+        return dict(self.koneksi().execute(SQL_MUAT_RATING).fetchall())
+
+    def muat_delta_rating(self, putaran):
+        """{Match_ID: delta Tim 1} match satu putaran yang deltanya sudah diterapkan."""
+        return dict(self.koneksi().execute(SQL_MUAT_DELTA, (putaran,)).fetchall())
+
+    def muat_putaran(self, putaran):
+        """Match satu putaran saja (memakai indeks putaran)."""
+        rows = self.koneksi().execute(SQL_MUAT_PUTARAN, (putaran,)).fetchall()
+        return [dict(zip(KOLOM_MATCH, row)) for row in rows]
+
+    def muat_semua_jadwal(self):
+        rows = self.koneksi().execute(SQL_MUAT_SEMUA_JADWAL).fetchall()
+        return [dict(zip(KOLOM_MATCH, row)) for row in rows]
+
+    def iter_jadwal(self, ukuran=1000):
+        """
+        Seluruh jadwal urut Match_ID sebagai potongan list tuple (kolom
+        KOLOM_MATCH), paling banyak `ukuran` baris per potongan. Memakai
+        koneksi baca sendiri: satu snapshot WAL untuk seluruh iterasi, tanpa
+        menahan penulis dan tanpa memuat semua baris ke memori.
+        """
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        try:
+            cursor = conn.execute(SQL_MUAT_SEMUA_JADWAL)
+            while True:
+                rows = cursor.fetchmany(ukuran)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            conn.close()
+
+    def muat_bye(self, putaran=None):
+        """Buku bye {putaran: [ID, ...]} satu putaran, atau semua putaran jika None."""
+        if putaran is None:
+            rows = self.koneksi().execute(SQL_MUAT_SEMUA_BYE).fetchall()
+        else:
+            rows = self.koneksi().execute(SQL_MUAT_BYE, (putaran,)).fetchall()
+        return {p: json.loads(ids) for p, ids in rows}
+
+    def muat_pasangan(self):
+        """Hanya kolom ID pemain dari semua match, untuk membangun riwayat pasangan."""
+        return self.koneksi().execute(SQL_MUAT_PASANGAN).fetchall()
@@ -0,0 +1,223 @@
+import cProfile
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# --- Instrumentasi (opt-in) ---
+# Span waktu di sekitar fase yang mahal (buat_jadwal, susun_grup, view model,
+# render Jinja, simpan, ...). Jika aktif, setiap request mendapat rincian di
+# header Server-Timing, semua span masuk histogram yang dibaca lewat /metrics,
+# dan (opsional) setiap request diprofil cProfile lalu di-dump ke direktori.
+# Jika tidak aktif, `span()` mengembalikan context manager kosong bersama dan
+# `terukur` hanya menambah satu pengecekan flag per panggilan.
+
+# Batas atas bucket histogram (ms), gaya Prometheus; +Inf ditambahkan otomatis
+BUCKET_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_aktif = False
+_lokal = threading.local()
+# Hanya satu cProfile yang boleh aktif per proses (Python 3.12+: ValueError jika
+# ada profiler lain). Di server berthread, request yang datang saat request lain
+# sedang diprofil tetap dilayani dan diukur, hanya tidak mendapat file .prof.
+_kunci_cprofile = threading.Lock()
+
+
+class Histogram:
+    """Histogram kumulatif durasi (ms) untuk satu nama, aman dipakai banyak thread."""
+
+    def __init__(self, bucket=BUCKET_MS):
+        self.bucket = bucket
+        self.jumlah_per_bucket = [0] * (len(bucket) + 1)
+        self.jumlah = 0
+        self.total = 0.0
+        self._kunci = threading.Lock()
+
+    def catat(self, ms):
+        i = bisect_left(self.bucket, ms)
+        with self._kunci:
+            self.jumlah_per_bucket[i] += 1
+            self.jumlah += 1
+            self.total += ms
+
+    def baris(self, metrik, label):
+        """Baris eksposisi Prometheus (bucket kumulatif, _sum, _count)."""
+        with self._kunci:
+            per_bucket, jumlah, total = list(self.jumlah_per_bucket), self.jumlah, self.total
+        hasil, kumulatif = [], 0
+        for batas, n in zip(list(self.bucket) + ['+Inf'], per_bucket):
+            kumulatif += n
+            hasil.append(f'{metrik}_bucket{{{label},le="{batas}"}} {kumulatif}')
+        hasil.append(f'{metrik}_sum{{{label}}} {total:.3f}')
+        hasil.append(f'{metrik}_count{{{label}}} {jumlah}')
+        return hasil
+
+
+class _Registri:
+    def __init__(self):
+        self.histogram = {}
+        self._kunci = threading.Lock()
+
+    def ambil(self, kunci):
+        histogram = self.histogram.get(kunci)
+        if histogram is None:
+            with self._kunci:
+                histogram = self.histogram.setdefault(kunci, Histogram())
+        return histogram
+
+
+span_ms = _Registri()     # nama span -> Histogram
+request_ms = _Registri()  # endpoint -> Histogram
+
+
+def _catat(nama, ms):
+    span_ms.ambil(nama).catat(ms)
+    rincian = getattr(_lokal, 'rincian', None)
+    if rincian is not None:
+        rincian.append((nama, ms))
+
+
+class _Span:
+    __slots__ = ('nama', 'mulai')
+
+    def __init__(self, nama):
+        self.nama = nama
+
+    def __enter__(self):
+        self.mulai = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _catat(self.nama, (time.perf_counter() - self.mulai) * 1000)
+        return False
+
+
+class _SpanKosong:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_SPAN_KOSONG = _SpanKosong()
+
+
+def aktif():
+    return _aktif
+
+
+def span(nama):
+    """Context manager pengukur satu fase; tanpa biaya berarti jika instrumentasi mati."""
+    return _Span(nama) if _aktif else _SPAN_KOSONG
+
+
+def terukur(nama=None):
+    """Dekorator: seluruh pemanggilan fungsi menjadi satu span (default: nama fungsi)."""
+    def dekorator(f):
+        nama_span = nama or f.__name__
+
+        @functools.wraps(f)
+        def pembungkus(*args, **kwargs):
+            if not _aktif:
+                return f(*args, **kwargs)
+            with _Span(nama_span):
+                return f(*args, **kwargs)
+        return pembungkus
+    return dekorator
+
+
+def server_timing(rincian, total_ms):
+    """Nilai header Server-Timing; span bernama sama dijumlahkan."""
+    per_nama = {}
+    for nama, ms in rincian:
+        jumlah, n = per_nama.get(nama, (0.0, 0))
+        per_nama[nama] = (jumlah + ms, n + 1)
+    bagian = [f'{nama};dur={ms:.2f}' + (f';desc="{n}x"' if n > 1 else '') for nama, (ms, n) in per_nama.items()]
+    bagian.append(f'total;dur={total_ms:.2f}')
+    return ', '.join(bagian)
+
+
+def teks_metrics():
+    """Semua histogram dalam format eksposisi teks Prometheus."""
+    baris = ['# TYPE turnamen_span_ms histogram']
+    for nama, histogram in sorted(span_ms.histogram.items()):
+        baris += histogram.baris('turnamen_span_ms', f'span="{nama}"')
+    baris.append('# TYPE turnamen_request_ms histogram')
+    for endpoint, histogram in sorted(request_ms.histogram.items()):
+        baris += histogram.baris('turnamen_request_ms', f'endpoint="{endpoint}"')
+    return '\n'.join(baris) + '\n'
+
+
+def pasang(app, direktori_cprofile=None):
+    """
+    Mengaktifkan instrumentasi untuk `app`: span per request, header
+    Server-Timing, render Jinja sebagai span, route /metrics, dan jika
+    `direktori_cprofile` diberikan, satu file .prof per request (satu
+    request pada satu waktu, lihat _kunci_cprofile).
+    """
+    global _aktif
+    from flask import Response, request, before_render_template, template_rendered
+
+    _aktif = True
+    if direktori_cprofile:
+        os.makedirs(direktori_cprofile, exist_ok=True)
+
+    @app.before_request
+    def mulai_request():
+        _lokal.rincian = []
+        _lokal.mulai = time.perf_counter()
+        if direktori_cprofile and _kunci_cprofile.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Profiler lain (di luar aplikasi ini) sedang aktif
+                _kunci_cprofile.release()
+            else:
+                _lokal.profiler = profiler
+
+    @app.after_request
+    def selesai_request(respons):
+        mulai = getattr(_lokal, 'mulai', None)
+        if mulai is None:
+            return respons
+        total_ms = (time.perf_counter() - mulai) * 1000
+        profiler = getattr(_lokal, 'profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            _kunci_cprofile.release()
+            nama = f'{time.time():.6f}-{request.endpoint or "tidak_ada"}-{total_ms:.0f}ms.prof'
+            profiler.dump_stats(os.path.join(direktori_cprofile, nama))
+        request_ms.ambil(request.endpoint or 'tidak_ada').catat(total_ms)
+        respons.headers['Server-Timing'] = server_timing(_lokal.rincian, total_ms)
+        _lokal.rincian = _lokal.mulai = _lokal.profiler = None
+        return respons
+
+    def mulai_render(sender, template, context, **extra):
+        _lokal.mulai_render = time.perf_counter()
+
+    def selesai_render(sender, template, context, **extra):
+        mulai = getattr(_lokal, 'mulai_render', None)
+        if mulai is not None:
+            _catat('render', (time.perf_counter() - mulai) * 1000)
+            _lokal.mulai_render = None
+
+    @app.teardown_request
+    def bersihkan_request(exc):
+        # Request yang gagal tidak melewati after_request; profiler tetap harus dimatikan
+        profiler = getattr(_lokal, 'profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            _kunci_cprofile.release()
+        _lokal.rincian = _lokal.mulai = _lokal.profiler = None
+
+    before_render_template.connect(mulai_render, app, weak=False)
+    template_rendered.connect(selesai_render, app, weak=False)
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(teks_metrics(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,283 @@
+from bisect import bisect_left, insort
+from itertools import groupby
+
+import numpy as np
+
+from tabel import array_id
+
+# --- Rating Pemain (Elo) ---
+# Rating tim = rata-rata rating anggotanya. Hasil match adalah porsi poin tim
+# (21-15 = 0.58), dibandingkan dengan peluang menang menurut Elo; selisihnya
+# dikali K_FAKTOR dan ditambahkan ke setiap anggota tim (tim lawan dikurangi
+# sebanyak yang sama).
+#
+# Semua match dalam satu putaran memakai rating SEBELUM putaran itu, dan
+# rating disimpan sebagai bilangan bulat (seperseribu poin rating). Dengan
+# begitu, mengoreksi skor cukup dengan mengurangi delta lama yang tersimpan,
+# lalu menambahkan delta baru. Hasilnya persis sama dengan hitung ulang penuh
+# dari riwayat (hitung_rating), tanpa galat pembulatan yang menumpuk.
+# Peluang menang dibaca dari tabel (selisih rating per 0.1 poin), sehingga
+# jalur per match (Python biasa) dan jalur batch (NumPy) memberi delta yang
+# identik sampai bit terakhir.
+
+RATING_AWAL = 1500
+K_FAKTOR = 32
+SKALA_ELO = 400
+SATUAN = 1000  # rating disimpan dalam 1/SATUAN poin
+
+LANGKAH_TABEL = 100       # resolusi selisih rating di tabel, dalam 1/SATUAN (= 0.1 poin)
+SELISIH_MAKS_TABEL = 8000  # langkah; selisih di atas 800 poin dianggap 800
+# TABEL_HARAPAN[i]: peluang menang Tim 1 jika rating Tim 2 lebih tinggi (i - SELISIH_MAKS_TABEL) langkah
+TABEL_HARAPAN = 1 / (1 + 10 ** (np.arange(-SELISIH_MAKS_TABEL, SELISIH_MAKS_TABEL + 1)
+                                * LANGKAH_TABEL / (SKALA_ELO * SATUAN)))
+_HARAPAN = TABEL_HARAPAN.tolist()
+
+
+def delta_satu(jumlah_1, n_1, jumlah_2, n_2, poin_1, poin_2):
+    """
+    Delta rating Tim 1 (dalam 1/SATUAN) untuk satu match; Tim 2 mendapat
+    kebalikannya. `jumlah_x` = total rating anggota tim, `n_x` = jumlah anggota.
+    """
+    penyebut = n_1 * n_2 * LANGKAH_TABEL
+    langkah = (jumlah_2 * n_1 - jumlah_1 * n_2 + penyebut // 2) // penyebut
+    harapan = _HARAPAN[min(max(langkah, -SELISIH_MAKS_TABEL), SELISIH_MAKS_TABEL) + SELISIH_MAKS_TABEL]
+    total = poin_1 + poin_2
+    aktual = poin_1 / total if total > 0 else 0.5
+    return round(K_FAKTOR * SATUAN * (aktual - harapan))
+
+
+def delta_match(rating_slot, ada, poin_1, poin_2):
+    """
+    delta_satu untuk n match sekaligus. `rating_slot` (n, 4) rating slot
+    [1A, 1B, 2A, 2B], `ada` (n, 4) True untuk slot yang terisi.
+    """
+    rating_slot = np.where(ada, rating_slot, 0)
+    jumlah_1, jumlah_2 = rating_slot[:, :2].sum(axis=1), rating_slot[:, 2:].sum(axis=1)
+    n_1, n_2 = ada[:, :2].sum(axis=1), ada[:, 2:].sum(axis=1)
+    penyebut = n_1 * n_2 * LANGKAH_TABEL
+    langkah = (jumlah_2 * n_1 - jumlah_1 * n_2 + penyebut // 2) // penyebut
+    harapan = TABEL_HARAPAN[np.clip(langkah, -SELISIH_MAKS_TABEL, SELISIH_MAKS_TABEL) + SELISIH_MAKS_TABEL]
+    poin_1 = np.asarray(poin_1, dtype=np.int64)
+    total = poin_1 + np.asarray(poin_2, dtype=np.int64)
+    aktual = np.where(total > 0, poin_1 / np.maximum(total, 1), 0.5)
+    return np.rint(K_FAKTOR * SATUAN * (aktual - harapan)).astype(np.int64)
+
+
+def _slot_match(matches):
+    """ID slot (n, 4) float NaN seperti array_id, slot B dikosongkan untuk mode Single."""
+    slot = array_id(matches)
+    single = np.array([m.mode != 'Double' for m in matches], dtype=bool)
+    slot[single, 1] = np.nan
+    slot[single, 3] = np.nan
+    return slot
+
+
+def hitung_rating(putaran, slot, poin_1, poin_2):
+    """
+    Mode batch: rating dari seluruh riwayat match Selesai. Match diproses
+    per putaran (urut naik), satu operasi array per putaran. Mengembalikan
+    (ID unik, rating per ID, delta Tim 1 per match), rating dalam 1/SATUAN.
+    """
+    putaran = np.asarray(putaran, dtype=np.int64)
+    poin_1, poin_2 = np.asarray(poin_1, dtype=np.int64), np.asarray(poin_2, dtype=np.int64)
+    ada = ~np.isnan(slot)
+    ids, lokal = np.unique(slot[ada].astype(np.int64), return_inverse=True)
+    indeks = np.zeros(slot.shape, dtype=np.int64)
+    indeks[ada] = lokal
+    rating = np.full(len(ids), RATING_AWAL * SATUAN, dtype=np.int64)
+    delta = np.zeros(len(putaran), dtype=np.int64)
+
+    urut = np.argsort(putaran, kind='stable')
+    batas = np.flatnonzero(np.diff(putaran[urut])) + 1
+    for baris in np.split(urut, batas) if len(urut) else []:
+        d = delta_match(rating[indeks[baris]], ada[baris], poin_1[baris], poin_2[baris])
+        delta[baris] = d
+        tambahan = np.stack([d, d, -d, -d], axis=1)
+        # Setiap pemain paling banyak satu match per putaran, jadi indeksnya unik
+        rating[indeks[baris][ada[baris]]] += tambahan[ada[baris]]
+    return ids, rating, delta
+
+
+def rating_dari_jadwal_df(jadwal_df):
+    """hitung_rating dari DataFrame jadwal (kolom KOLOM_JADWAL); {ID: rating} sebagai float."""
+    selesai = jadwal_df[jadwal_df['Status'] == 'Selesai']
+    slot = selesai[['Pemain_1_A', 'Pemain_1_B', 'Pemain_2_A', 'Pemain_2_B']].to_numpy(dtype=float, na_value=np.nan)
+    single = (selesai['Mode'] != 'Double').to_numpy()
+    slot[single, 1] = np.nan
+    slot[single, 3] = np.nan
+    ids, rating, _ = hitung_rating(selesai['Putaran'].to_numpy(), slot,
+                                   selesai['Poin_Tim_1'].to_numpy(), selesai['Poin_Tim_2'].to_numpy())
+    return dict(zip(ids.tolist(), (rating / SATUAN).tolist()))
+
+
+class IndeksRating:
+    """
+    ID pemain urut rating DESC (seri: urutan pemain ditambahkan), sebagai list
+    kunci terurut yang diperbarui dengan bisect, sama seperti IndeksPrioritas.
+    """
+
+    def __init__(self):
+        self._kunci = []
+        self._milik = {}
+        self._urut = 0
+
+    def __len__(self):
+        return len(self._kunci)
+
+    def tambah(self, player_id, rating):
+        self._urut += 1
+        kunci = (-rating, self._urut, player_id)
+        insort(self._kunci, kunci)
+        self._milik[player_id] = kunci
+
+    def tambah_banyak(self, ids, rating):
+        """Banyak pemain dengan rating sama sekaligus: kunci ditambahkan lalu diurutkan sekali."""
+        baru = [(-rating, self._urut + i, player_id) for i, player_id in enumerate(ids, start=1)]
+        self._urut += len(baru)
+        self._kunci += baru
+        self._kunci.sort()
+        self._milik.update((kunci[2], kunci) for kunci in baru)
+
+    def hapus(self, player_id):
+        kunci = self._milik.pop(player_id)
+        del self._kunci[bisect_left(self._kunci, kunci)]
+
+    def perbarui(self, player_id, rating):
+        lama = self._milik[player_id]
+        if lama[0] != -rating:
+            baru = (-rating, lama[1], player_id)
+            del self._kunci[bisect_left(self._kunci, lama)]
+            insort(self._kunci, baru)
+            self._milik[player_id] = baru
+
+    def urutan(self):
+        return [kunci[2] for kunci in self._kunci]
+
+    def urutkan(self, ids):
+        """
+        `ids` urut rating DESC dengan menelusuri indeks (tanpa mengurutkan);
+        pemain dengan rating sama tetap dalam urutan `ids`.
+        """
+        posisi = {p_id: i for i, p_id in enumerate(ids)}
+        hasil = []
+        for _, kelompok in groupby((k for k in self._kunci if k[2] in posisi), key=lambda k: k[0]):
+            kelompok = [k[2] for k in kelompok]
+            if len(kelompok) > 1:
+                kelompok.sort(key=posisi.__getitem__)
+            hasil += kelompok
+        return hasil
+
+
+class MesinRating:
+    """
+    Rating semua pemain terdaftar (ID -> rating dalam 1/SATUAN) beserta
+    IndeksRating-nya. `delta` menyimpan delta Tim 1 yang sudah diterapkan per
+    Match_ID, agar skor yang dikoreksi bisa dibatalkan dengan tepat.
+    """
+
+    def __init__(self):
+        self.rating = {}
+        self.indeks = IndeksRating()
+        self.delta = {}
+
+    def __len__(self):
+        return len(self.rating)
+
+    def __contains__(self, player_id):
+        return player_id in self.rating
+
+    def nilai(self, player_id):
+        return self.rating[player_id] / SATUAN
+
+    def tambah(self, player_id, rating=RATING_AWAL * SATUAN):
+        self.rating[player_id] = rating
+        self.indeks.tambah(player_id, rating)
+
+    def tambah_banyak(self, ids, rating=RATING_AWAL * SATUAN):
+        self.rating.update(dict.fromkeys(ids, rating))
+        self.indeks.tambah_banyak(ids, rating)
+
+    def hapus(self, player_id):
+        if player_id in self.rating:
+            del self.rating[player_id]
+            self.indeks.hapus(player_id)
+
+    def _geser(self, ids, jumlah):
+        for p_id in ids:
+            if p_id in self.rating:
+                self.rating[p_id] += jumlah
+                self.indeks.perbarui(p_id, self.rating[p_id])
+
+    def batalkan(self, match_id):
+        """Membatalkan delta match ini; False jika tidak ada delta tersimpan."""
+        entri = self.delta.pop(match_id, None)
+        if entri is None:
+            return False
+        tim_1, tim_2, d = entri
+        self._geser(tim_1, -d)
+        self._geser(tim_2, d)
+        return True
+
+    def terapkan(self, matches):
+        """
+        Menerapkan skor match Selesai dari putaran yang sama (setiap pemain
+        paling banyak di satu match, semuanya terdaftar), menggantikan delta
+        lama jika ada.
+        """
+        for m in matches:
+            self.batalkan(m.match_id)
+        # Semua delta dihitung dulu dari rating sebelum putaran, baru diterapkan
+        rating = self.rating
+        tim = [m.tim() for m in matches]
+        delta = [delta_satu(sum(rating[p] for p in tim_1), len(tim_1), sum(rating[p] for p in tim_2), len(tim_2),
+                            m.poin_1, m.poin_2)
+                 for m, (tim_1, tim_2) in zip(matches, tim)]
+        for m, (tim_1, tim_2), d in zip(matches, tim, delta):
+            self.delta[m.match_id] = (tim_1, tim_2, d)
+            self._geser(tim_1, d)
+            self._geser(tim_2, -d)
+
+    def urutkan(self, ids):
+        return self.indeks.urutkan(ids)
+
+    def baris(self):
+        """(ID, rating) semua pemain, urut rating DESC."""
+        return [(p_id, self.nilai(p_id)) for p_id in self.indeks.urutan()]
+
+    @classmethod
+    def dari_tersimpan(cls, rating, matches, delta):
+        """
+        Dari rating tersimpan ({ID: rating}, urutan = urutan seri di indeks)
+        dan delta Tim 1 match putaran aktif ({Match_ID: delta}), tanpa
+        membaca riwayat. `matches` = match putaran aktif.
+        """
+        mesin = cls()
+        for p_id, nilai in rating.items():
+            mesin.tambah(p_id, nilai)
+        for m in matches:
+            if m.selesai and m.match_id in delta:
+                tim_1, tim_2 = m.tim()
+                mesin.delta[m.match_id] = (tim_1, tim_2, delta[m.match_id])
+        return mesin
+
+    @classmethod
+    def dari_matches(cls, ids_aktif, matches, putaran_aktif=None):
+        """
+        Mode batch: dari seluruh riwayat Match (yang belum Selesai diabaikan).
+        Delta disimpan hanya untuk match `putaran_aktif`, satu-satunya
+        putaran yang skornya dikoreksi secara inkremental.
+        """
+        selesai = [m for m in matches if m.selesai]
+        slot = _slot_match(selesai)
+        ids, rating, delta = hitung_rating([m.putaran for m in selesai], slot,
+                                           np.array([m.poin_1 for m in selesai], dtype=np.int64),
+                                           np.array([m.poin_2 for m in selesai], dtype=np.int64))
+        dari_riwayat = dict(zip(ids.tolist(), rating.tolist()))
+        mesin = cls()
+        for p_id in ids_aktif:
+            mesin.tambah(p_id, dari_riwayat.get(p_id, RATING_AWAL * SATUAN))
+        for m, d in zip(selesai, delta.tolist()):
+            if m.putaran == putaran_aktif:
+                tim_1, tim_2 = m.tim()
+                mesin.delta[m.match_id] = (tim_1, tim_2, d)
+        return mesin
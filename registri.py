@@ -0,0 +1,145 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from log_event import LogEvent
+from penyimpanan import PenyimpananSQLite
+from turnamen import Turnamen
+
+# --- Registri Multi-Turnamen ---
+# Satu proses melayani banyak turnamen sekaligus, masing-masing dengan state,
+# kunci dan penyimpanannya sendiri. Turnamen baru hanya dibuat secara eksplisit
+# (buat()); ambil() untuk ID yang tidak dikenal gagal, agar request GET biasa
+# tidak bisa membuat turnamen (dan direktori di disk). Turnamen yang lama tidak
+# diakses dikeluarkan dari memori (LRU); karena penyimpanan bersifat
+# write-through, turnamen tersebut cukup dimuat ulang saat diakses kembali.
+
+TURNAMEN_UTAMA = 'utama'
+MAKS_AKTIF_DEFAULT = 64
+
+POLA_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def id_valid(turnamen_id):
+    """ID dipakai sebagai nama direktori, jadi hanya huruf, angka, '_' dan '-'."""
+    return bool(POLA_ID.match(turnamen_id or ''))
+
+
+class RegistriTurnamen:
+    """
+    Peta turnamen_id -> Turnamen dengan batas jumlah turnamen aktif di memori.
+
+    `direktori` (opsional) adalah direktori data: tiap turnamen memakai
+    `<direktori>/<id>/turnamen.db` dan, jika `pakai_log`, log event di
+    `<direktori>/<id>/log`. Tanpa direktori, turnamen hanya hidup di memori;
+    turnamen seperti itu tetap dihitung dalam `maks_aktif` dan hilang saat
+    dikeluarkan (kecuali turnamen utama, yang selalu ada).
+    `penyimpanan_utama` / `log_utama` (opsional) dipakai untuk turnamen
+    utama, agar konfigurasi satu-turnamen yang lama tetap berlaku.
+    `saat_dibuat(turnamen_id, turnamen)` (opsional) dipanggil setiap kali
+    turnamen dibuat atau dimuat ulang ke memori, mis. untuk memasang pendengar;
+    `saat_dikeluarkan(turnamen_id, turnamen)` saat turnamen keluar dari memori.
+    `seeding_mexicano` diteruskan ke setiap Turnamen.
+    """
+
+    def __init__(self, direktori=None, pakai_log=False, maks_aktif=MAKS_AKTIF_DEFAULT, max_pemain=32,
+                 penyimpanan_utama=None, log_utama=None, saat_dibuat=None, saat_dikeluarkan=None,
+                 seeding_mexicano='poin'):
+        self.direktori = direktori
+        self.pakai_log = pakai_log
+        self.maks_aktif = maks_aktif
+        self.max_pemain = max_pemain
+        self.seeding_mexicano = seeding_mexicano
+        self.penyimpanan_utama = penyimpanan_utama
+        self.log_utama = log_utama
+        self.saat_dibuat = saat_dibuat
+        self.saat_dikeluarkan = saat_dikeluarkan
+        self._aktif = OrderedDict()
+        self._kunci = threading.Lock()
+
+    def _buat(self, turnamen_id):
+        if turnamen_id == TURNAMEN_UTAMA and (self.penyimpanan_utama or self.log_utama):
+            return Turnamen(max_pemain=self.max_pemain, penyimpanan=self.penyimpanan_utama,
+                            log_event=self.log_utama, seeding_mexicano=self.seeding_mexicano)
+        if self.direktori is None:
+            return Turnamen(max_pemain=self.max_pemain, seeding_mexicano=self.seeding_mexicano)
+
+        direktori = os.path.join(self.direktori, turnamen_id)
+        os.makedirs(direktori, exist_ok=True)
+        return Turnamen(
+            max_pemain=self.max_pemain,
+            penyimpanan=PenyimpananSQLite(os.path.join(direktori, 'turnamen.db')),
+            log_event=LogEvent(os.path.join(direktori, 'log')) if self.pakai_log else None,
+            seeding_mexicano=self.seeding_mexicano
+        )
+
+    def _tersimpan(self, turnamen_id):
+        if turnamen_id == TURNAMEN_UTAMA:
+            return True
+        return self.direktori is not None and os.path.isdir(os.path.join(self.direktori, turnamen_id))
+
+    def ada(self, turnamen_id):
+        """True jika turnamen ini aktif di memori atau tersimpan di direktori data."""
+        with self._kunci:
+            return turnamen_id in self._aktif or (id_valid(turnamen_id) and self._tersimpan(turnamen_id))
+
+    def ambil(self, turnamen_id, buat=False):
+        """
+        Turnamen dengan ID ini, dimuat dari penyimpanan jika belum aktif.
+        KeyError jika ID tidak valid, atau turnamennya belum ada dan `buat`
+        tidak diminta.
+        """
+        if not id_valid(turnamen_id):
+            raise KeyError(turnamen_id)
+        with self._kunci:
+            turnamen = self._aktif.get(turnamen_id)
+            if turnamen is not None:
+                self._aktif.move_to_end(turnamen_id)
+                return turnamen
+            if not buat and not self._tersimpan(turnamen_id):
+                raise KeyError(turnamen_id)
+            turnamen = self._buat(turnamen_id)
+            if self.saat_dibuat is not None:
+                self.saat_dibuat(turnamen_id, turnamen)
+            self._aktif[turnamen_id] = turnamen
+            self._keluarkan_lru()
+            return turnamen
+
+    def buat(self, turnamen_id):
+        """ambil() yang membuat turnamen baru jika belum ada."""
+        return self.ambil(turnamen_id, buat=True)
+
+    def _keluarkan_lru(self):
+        """
+        Mengeluarkan turnamen paling lama tidak diakses sampai jumlahnya
+        `maks_aktif`. Turnamen utama tanpa penyimpanan tidak pernah dikeluarkan.
+        """
+        while len(self._aktif) > self.maks_aktif:
+            korban = next((t_id for t_id, t in self._aktif.items()
+                           if t_id != TURNAMEN_UTAMA or t.penyimpanan is not None or t.log_event is not None), None)
+            if korban is None:
+                return
+            turnamen = self._aktif.pop(korban)
+            # Tunggu mutasi yang sedang berjalan; setelah itu semuanya sudah di penyimpanan
+            # dan koneksi/berkasnya bisa ditutup (tanpa ini fd bocor di setiap pengeluaran)
+            with turnamen.kunci:
+                if turnamen.penyimpanan is not None:
+                    turnamen.penyimpanan.tutup()
+                if turnamen.log_event is not None:
+                    turnamen.log_event.tutup()
+            if self.saat_dikeluarkan is not None:
+                self.saat_dikeluarkan(korban, turnamen)
+
+    def aktif(self):
+        """ID turnamen yang sedang di memori, terlama diakses lebih dulu."""
+        with self._kunci:
+            return list(self._aktif)
+
+    def semua_id(self):
+        """ID turnamen aktif ditambah yang tersimpan di direktori data."""
+        ids = set(self.aktif())
+        if self.direktori is not None and os.path.isdir(self.direktori):
+            ids.update(nama for nama in os.listdir(self.direktori)
+                       if id_valid(nama) and os.path.isdir(os.path.join(self.direktori, nama)))
+        return sorted(ids)
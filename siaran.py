@@ -0,0 +1,175 @@
+import json
+import logging
+import queue
+import threading
+from collections import deque
+from itertools import islice
+
+from tampilan import data_jadwal, data_peringkat, data_putaran, peringkat_berubah
+
+# --- Siaran Live (Server-Sent Events) ---
+# Setiap mutasi turnamen diubah SEKALI menjadi pesan SSE (diff klasemen + match
+# yang berubah), lalu dibagikan ke semua layar yang terhubung. Thread yang
+# mencatat skor hanya menyalin state yang dibutuhkan dan memasukkannya ke
+# antrian; diff, serialisasi JSON dan membangunkan penonton dikerjakan thread
+# penyiar. Biaya per skor karena itu tidak bergantung pada jumlah penonton.
+
+BUFFER_PESAN = 256
+JEDA_KEEP_ALIVE = 15.0  # detik
+PESAN_MUAT_ULANG = b'event: muat_ulang\ndata: {}\n\n'
+
+log = logging.getLogger(__name__)
+
+
+class Penyiar:
+    """Fan-out satu penerbit ke banyak pelanggan SSE, dengan buffer pesan terakhir."""
+
+    def __init__(self, buffer_pesan=BUFFER_PESAN):
+        self._kondisi = threading.Condition()
+        self._pesan = deque(maxlen=buffer_pesan)
+        self._antrian = queue.SimpleQueue()
+        self._pompa = None
+        self._tutup = False
+        self.seq = 0
+        self.pelanggan = 0
+
+    def kirim(self, jenis, data):
+        """
+        Mengantrekan satu pesan. `data` boleh berupa fungsi tanpa argumen yang
+        baru dipanggil di thread penyiar (hasil None = tidak ada yang dikirim).
+        """
+        if self._tutup:
+            return
+        if self._pompa is None:
+            with self._kondisi:
+                if self._pompa is None and not self._tutup:
+                    self._pompa = threading.Thread(target=self._jalankan, name='penyiar', daemon=True)
+                    self._pompa.start()
+        self._antrian.put((jenis, data))
+
+    def _jalankan(self):
+        while True:
+            pesan = self._antrian.get()
+            if pesan is None:
+                return
+            jenis, data = pesan
+            try:
+                if callable(data):
+                    data = data()
+                if data is None:
+                    continue
+                badan = f'event: {jenis}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'.encode()
+            except Exception:
+                log.exception('Gagal menyiapkan pesan siaran %r', jenis)
+                continue
+            with self._kondisi:
+                self.seq += 1
+                self._pesan.append(b'id: %d\n' % self.seq + badan)
+                self._kondisi.notify_all()
+
+    def tutup(self):
+        """
+        Menghentikan thread penyiar. Pelanggan yang masih tersambung menerima
+        pesan muat_ulang lalu diputus; kirim() sesudahnya diabaikan.
+        """
+        with self._kondisi:
+            self._tutup = True
+            self._kondisi.notify_all()
+        self._antrian.put(None)
+
+    def langganan(self, terakhir=None, jeda=JEDA_KEEP_ALIVE):
+        """
+        Generator byte SSE. `terakhir` adalah Last-Event-ID dari klien (untuk
+        menyambung tanpa kehilangan pesan); jika pesan itu sudah keluar dari
+        buffer, klien diminta memuat ulang.
+        """
+        with self._kondisi:
+            if terakhir is None or terakhir > self.seq:
+                terakhir = self.seq
+            self.pelanggan += 1
+        try:
+            yield b'retry: 3000\n\n'
+            while True:
+                with self._kondisi:
+                    if self.seq == terakhir and not self._tutup:
+                        self._kondisi.wait(jeda)
+                    jumlah_baru = self.seq - terakhir
+                    if self._tutup or jumlah_baru > len(self._pesan):
+                        baru = [PESAN_MUAT_ULANG]
+                    else:
+                        baru = list(islice(self._pesan, len(self._pesan) - jumlah_baru, None))
+                    terakhir, tutup = self.seq, self._tutup
+
+                if tutup:
+                    # Turnamen dikeluarkan dari registri: klien memuat ulang dan tersambung ke siaran baru
+                    yield PESAN_MUAT_ULANG
+                    return
+                if not baru:
+                    yield b': keep-alive\n\n'
+                for pesan in baru:
+                    yield pesan
+        finally:
+            with self._kondisi:
+                self.pelanggan -= 1
+
+
+class SiaranTurnamen:
+    """
+    Pendengar event Turnamen (lihat Turnamen.pendengar) untuk satu ID turnamen.
+    Pesan yang dikirim:
+      skor      {matches, pemain, urutan, putaran}        skor (satu atau batch) dicatat, putaran belum selesai
+      putaran   {jadwal, pemain_bye, pemain, urutan, ...} putaran baru / kocok ulang
+      klasemen  {pemain, urutan, putaran}                 roster berubah atau undo
+    `pemain` hanya berisi baris klasemen yang berubah sejak pesan sebelumnya.
+    """
+
+    def __init__(self):
+        self.penyiar = Penyiar()
+        # Klasemen terakhir yang disiarkan; hanya dibaca/diubah di thread penyiar
+        self._peringkat = None
+        self._terlupa = True
+
+    def pasang(self, turnamen):
+        """Dipanggil setiap kali turnamen (baru atau dimuat ulang) dibuat oleh registri."""
+        self._lupakan_klasemen()
+        turnamen.pendengar.append(self)
+
+    def tutup(self):
+        """Dipanggil saat turnamennya dikeluarkan dari registri."""
+        self.penyiar.tutup()
+
+    def _lupakan_klasemen(self):
+        # Lewat antrian agar urut dengan diff yang mungkin masih menunggu
+        if not self._terlupa:
+            self._terlupa = True
+            self.penyiar.kirim(None, self._reset)
+
+    def _reset(self):
+        self._peringkat = None
+
+    def __call__(self, turnamen, event):
+        if not self.penyiar.pelanggan:
+            # Tidak ada yang menonton: tidak ada yang dihitung, diff berikutnya dikirim penuh
+            self._lupakan_klasemen()
+            return
+        self._terlupa = False
+
+        # Di bawah kunci turnamen: cukup salin state yang dibutuhkan
+        pemain, putaran = turnamen.pemain.salin(), turnamen.putaran_saat_ini
+        jenis = event[0]
+        if jenis in ('S', 'B') and event[-1] is None:
+            match_ids = [event[1]] if jenis == 'S' else [skor[0] for skor in event[1]]
+            matches = [turnamen.jadwal.get(m_id).salin() for m_id in match_ids]
+            self.penyiar.kirim('skor', lambda: self._diff(pemain, putaran, {'matches': data_jadwal(matches, pemain)}))
+        elif jenis in ('S', 'B', 'R', 'K'):
+            data = data_putaran(turnamen, putaran)
+            self.penyiar.kirim('putaran', lambda: self._diff(pemain, putaran, data))
+        else:
+            self.penyiar.kirim('klasemen', lambda: self._diff(pemain, putaran, {}))
+
+    def _diff(self, pemain, putaran, data):
+        sesudah = data_peringkat(pemain)
+        berubah = sesudah if self._peringkat is None else peringkat_berubah(self._peringkat, sesudah)
+        self._peringkat = sesudah
+        data.update(pemain=berubah, urutan=[p['ID'] for p in sesudah], putaran=putaran)
+        return data
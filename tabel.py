@@ -0,0 +1,353 @@
+import random
+from bisect import bisect_left, bisect_right, insort
+
+import numpy as np
+
+from klasemen import hasil_match
+
+# --- Tabel Pemain & Match (Array-Backed) ---
+# State yang sering diubah (klasemen, match putaran aktif) disimpan di array
+# NumPy dan objek __slots__, bukan DataFrame: satu update skor hanya beberapa
+# operasi indeks integer. DataFrame dibuat sebagai view untuk analisis saja
+# (ke_dataframe); pandas baru diimpor saat view pertama kali diminta.
+
+KOLOM_PEMAIN = ['ID', 'Nama', 'Total_Poin', 'Games_Played', 'Total_Bye', 'W', 'L', 'T']
+KOLOM_JADWAL = ['Putaran', 'Lapangan', 'Mode', 'Pemain_1_A', 'Pemain_1_B', 'Pemain_2_A', 'Pemain_2_B',
+                'Poin_Tim_1', 'Poin_Tim_2', 'Status', 'Versi']
+
+# Kolom angka pemain, urut sesuai KOLOM_PEMAIN[2:]
+K_POIN, K_GAMES, K_BYE, K_W, K_L, K_T = range(6)
+K_WLT = {'W': K_W, 'L': K_L, 'T': K_T}
+# Kolom yang menentukan prioritas penjadwalan (lihat IndeksPrioritas)
+K_PRIORITAS = (K_POIN, K_GAMES, K_BYE)
+
+
+def kunci_pemain(nama):
+    """Identitas pemain dari nama: tanpa spasi berlebih, tanpa beda huruf besar/kecil."""
+    return ' '.join(nama.split()).casefold()
+
+
+class IndeksPrioritas:
+    """
+    ID pemain urut prioritas penjadwalan: Total_Bye DESC, Games_Played ASC,
+    Total_Poin DESC, lalu urutan pemain ditambahkan. Disimpan sebagai list
+    kunci terurut yang diperbarui dengan bisect saat angka pemain berubah,
+    sehingga k pemain teratas bisa diambil tanpa mengurutkan seluruh roster.
+    """
+
+    def __init__(self):
+        self._kunci = []
+        self._milik = {}
+        self._urut = 0
+
+    def __len__(self):
+        return len(self._kunci)
+
+    def tambah(self, player_id, poin, games, bye):
+        self._urut += 1
+        kunci = (-bye, games, -poin, self._urut, player_id)
+        insort(self._kunci, kunci)
+        self._milik[player_id] = kunci
+
+    def tambah_banyak(self, ids):
+        """Pemain baru (angka 0) sekaligus: kunci ditambahkan lalu diurutkan sekali."""
+        baru = [(0, 0, 0, self._urut + i, player_id) for i, player_id in enumerate(ids, start=1)]
+        self._urut += len(baru)
+        self._kunci += baru
+        self._kunci.sort()
+        self._milik.update((kunci[4], kunci) for kunci in baru)
+
+    def hapus(self, player_id):
+        kunci = self._milik.pop(player_id)
+        del self._kunci[bisect_left(self._kunci, kunci)]
+
+    def perbarui(self, player_id, poin, games, bye):
+        lama = self._milik[player_id]
+        baru = (-bye, games, -poin, lama[3], player_id)
+        if baru != lama:
+            del self._kunci[bisect_left(self._kunci, lama)]
+            insort(self._kunci, baru)
+            self._milik[player_id] = baru
+
+    def teratas(self, k):
+        """k ID berprioritas tertinggi; seri diputus urutan pemain ditambahkan."""
+        return [kunci[4] for kunci in self._kunci[:k]]
+
+    def teratas_acak(self, k, acak=random):
+        """
+        k ID berprioritas tertinggi; pemain dengan (bye, games, poin) sama
+        diurutkan acak. Hanya k kunci teratas yang dibaca; kelompok seri yang
+        terpotong di posisi k diambil dengan sampel dari rentang indeksnya.
+        """
+        kunci = self._kunci
+        k = min(k, len(kunci))
+        if k <= 0:
+            return []
+        batas = kunci[k - 1][:3]
+        awal = bisect_left(kunci, batas)
+        akhir = bisect_right(kunci, batas + (float('inf'),), k - 1)
+        # Kunci acak menggantikan urutan pemain sebagai pemutus seri
+        angka_acak = acak.random
+        depan = sorted([(x[0], x[1], x[2], angka_acak(), x[4]) for x in kunci[:awal]])
+        hasil = [x[4] for x in depan]
+        hasil += [kunci[j][4] for j in acak.sample(range(awal, akhir), k - awal)]
+        return hasil
+
+    def salin(self):
+        indeks = IndeksPrioritas()
+        indeks._kunci, indeks._milik, indeks._urut = list(self._kunci), dict(self._milik), self._urut
+        return indeks
+
+
+class TabelPemain:
+    """
+    Klasemen pemain: ID, nama, dan matriks angka (baris = pemain, kolom =
+    Total_Poin, Games_Played, Total_Bye, W, L, T). `baris` memetakan ID ke
+    indeks baris (O(1)); urutan baris = urutan pemain ditambahkan.
+    `prioritas` (IndeksPrioritas) ikut diperbarui setiap kali poin, games
+    atau bye berubah lewat metode tabel ini.
+    """
+
+    def __init__(self, kapasitas=64):
+        self.ids = np.zeros(kapasitas, dtype=np.int64)
+        self.angka = np.zeros((kapasitas, len(KOLOM_PEMAIN) - 2), dtype=np.int64)
+        self.nama = []
+        self.baris = {}
+        self.prioritas = IndeksPrioritas()
+
+    def __len__(self):
+        return len(self.nama)
+
+    def __contains__(self, player_id):
+        return player_id in self.baris
+
+    def id_aktif(self):
+        return self.ids[:len(self)]
+
+    def kolom(self, k):
+        """View (tanpa salin) satu kolom angka untuk semua pemain."""
+        return self.angka[:len(self), k]
+
+    def tambah(self, player_id, nama, angka=(0, 0, 0, 0, 0, 0)):
+        n = len(self)
+        if n == len(self.ids):
+            self.ids = np.concatenate([self.ids, np.zeros(n, dtype=np.int64)])
+            self.angka = np.concatenate([self.angka, np.zeros_like(self.angka)])
+        self.ids[n] = player_id
+        self.angka[n] = angka
+        self.nama.append(nama)
+        self.baris[player_id] = n
+        self.prioritas.tambah(player_id, *(int(x) for x in self.angka[n, :3]))
+
+    def tambah_banyak(self, ids, nama):
+        """Pemain baru (semua angka 0) sekaligus: satu penulisan slice array, bukan satu baris per pemain."""
+        n, k = len(self), len(ids)
+        if n + k > len(self.ids):
+            kapasitas = max(2 * len(self.ids), n + k)
+            self.ids = np.concatenate([self.ids, np.zeros(kapasitas - len(self.ids), dtype=np.int64)])
+            self.angka = np.concatenate([self.angka, np.zeros((kapasitas - len(self.angka), self.angka.shape[1]),
+                                                              dtype=np.int64)])
+        self.ids[n:n + k] = ids
+        self.angka[n:n + k] = 0
+        self.nama.extend(nama)
+        self.baris.update(zip(ids, range(n, n + k)))
+        self.prioritas.tambah_banyak(ids)
+
+    def hapus(self, player_id):
+        """Menghapus satu pemain; baris sesudahnya bergeser agar urutan tetap."""
+        i = self.baris.pop(player_id)
+        n = len(self)
+        self.ids[i:n - 1] = self.ids[i + 1:n]
+        self.angka[i:n - 1] = self.angka[i + 1:n]
+        del self.nama[i]
+        for j in range(i, n - 1):
+            self.baris[int(self.ids[j])] = j
+        self.prioritas.hapus(player_id)
+
+    def _perbarui_prioritas(self, baris):
+        perbarui = self.prioritas.perbarui
+        for player_id, (poin, games, bye) in zip(self.ids[baris].tolist(), self.angka[baris, :3].tolist()):
+            perbarui(player_id, poin, games, bye)
+
+    def baris_dari(self, ids):
+        """Indeks baris untuk ID yang masih terdaftar (ID lain diabaikan)."""
+        baris = self.baris
+        return [baris[p_id] for p_id in ids if p_id in baris]
+
+    def tambah_nilai(self, ids, k, jumlah):
+        """Menambah `jumlah` ke kolom `k` untuk semua pemain `ids` sekaligus."""
+        baris = self.baris_dari(ids)
+        self.angka[baris, k] += jumlah
+        if k in K_PRIORITAS:
+            self._perbarui_prioritas(baris)
+
+    def terapkan_wlt(self, tim_1, tim_2, poin1, poin2, arah=1):
+        """Menambah (arah=1) atau membatalkan (arah=-1) kontribusi W/L/T satu match."""
+        kol_1, kol_2 = hasil_match(poin1, poin2)
+        self.angka[self.baris_dari(tim_1), K_WLT[kol_1]] += arah
+        self.angka[self.baris_dari(tim_2), K_WLT[kol_2]] += arah
+
+    def terapkan_skor(self, tim_1, tim_2, poin1, poin2, arah=1):
+        """Poin, Games_Played dan W/L/T satu match (arah=-1 untuk membatalkan)."""
+        baris_1, baris_2 = self.baris_dari(tim_1), self.baris_dari(tim_2)
+        self.angka[baris_1, K_POIN] += arah * poin1
+        self.angka[baris_2, K_POIN] += arah * poin2
+        self.angka[baris_1 + baris_2, K_GAMES] += arah
+        self.terapkan_wlt(tim_1, tim_2, poin1, poin2, arah)
+        self._perbarui_prioritas(baris_1 + baris_2)
+
+    def terapkan_skor_batch(self, daftar):
+        """
+        terapkan_skor untuk banyak match sekaligus; `daftar` berisi
+        (tim_1, tim_2, poin1, poin2, arah). Semua perubahan poin, games dan
+        W/L/T dikumpulkan lalu ditambahkan dengan satu np.add.at.
+        """
+        baris, kolom, nilai = [], [], []
+        for tim_1, tim_2, poin1, poin2, arah in daftar:
+            kol_1, kol_2 = hasil_match(poin1, poin2)
+            for tim, poin, kol in ((tim_1, poin1, K_WLT[kol_1]), (tim_2, poin2, K_WLT[kol_2])):
+                for i in self.baris_dari(tim):
+                    baris += (i, i, i)
+                    kolom += (K_POIN, K_GAMES, kol)
+                    nilai += (arah * poin, arah, arah)
+        np.add.at(self.angka, (np.array(baris, dtype=np.intp), np.array(kolom, dtype=np.intp)), nilai)
+        self._perbarui_prioritas(sorted(set(baris)))
+
+    def baris_tuple(self, player_id):
+        """(id, nama, poin, games, bye, w, l, t) untuk penyimpanan / state."""
+        i = self.baris[player_id]
+        return (int(player_id), self.nama[i]) + tuple(int(x) for x in self.angka[i])
+
+    def salin(self):
+        """Salinan independen (mis. untuk dibaca thread lain di luar kunci turnamen)."""
+        tabel = TabelPemain.__new__(TabelPemain)
+        tabel.ids, tabel.angka = self.ids.copy(), self.angka.copy()
+        tabel.nama, tabel.baris = list(self.nama), dict(self.baris)
+        tabel.prioritas = self.prioritas.salin()
+        return tabel
+
+    def ke_dataframe(self):
+        """View DataFrame (salinan) berindeks ID, kolom sama dengan pemain_df lama."""
+        import pandas as pd
+        n = len(self)
+        data = {'Nama': list(self.nama)}
+        for k, nama_kolom in enumerate(KOLOM_PEMAIN[2:]):
+            data[nama_kolom] = self.angka[:n, k].copy()
+        return pd.DataFrame(data, index=pd.Index(self.ids[:n].copy(), name='ID'))
+
+    @classmethod
+    def dari_baris(cls, rows):
+        """Dari baris (id, nama, poin, games, bye, w, l, t)."""
+        tabel = cls(kapasitas=max(64, len(rows)))
+        for row in rows:
+            tabel.tambah(int(row[0]), row[1], row[2:])
+        return tabel
+
+
+class Match:
+    """Satu baris jadwal. `__slots__` agar ringan dan akses atributnya cepat."""
+
+    __slots__ = ('match_id', 'putaran', 'lapangan', 'mode', 'p1a', 'p1b', 'p2a', 'p2b',
+                 'poin_1', 'poin_2', 'selesai', 'versi')
+
+    def __init__(self, match_id, putaran, lapangan, mode, p1a, p1b, p2a, p2b,
+                 poin_1=0, poin_2=0, selesai=False, versi=0):
+        self.match_id = match_id
+        self.putaran = putaran
+        self.lapangan = lapangan
+        self.mode = mode
+        self.p1a, self.p1b, self.p2a, self.p2b = p1a, p1b, p2a, p2b
+        self.poin_1 = poin_1
+        self.poin_2 = poin_2
+        self.selesai = selesai
+        self.versi = versi
+
+    @property
+    def status(self):
+        return 'Selesai' if self.selesai else 'Belum Selesai'
+
+    def tim(self):
+        """Daftar ID pemain (Tim 1, Tim 2); slot B hanya dipakai di mode Double."""
+        if self.mode == 'Double':
+            tim_1, tim_2 = (self.p1a, self.p1b), (self.p2a, self.p2b)
+        else:
+            tim_1, tim_2 = (self.p1a,), (self.p2a,)
+        return [p for p in tim_1 if p is not None], [p for p in tim_2 if p is not None]
+
+    def pemain(self):
+        """Semua ID pemain yang terisi di match ini."""
+        return [p for p in (self.p1a, self.p1b, self.p2a, self.p2b) if p is not None]
+
+    def salin(self):
+        return Match(*(getattr(self, atribut) for atribut in self.__slots__))
+
+    def ke_baris(self):
+        """Tuple kolom KOLOM_JADWAL (tanpa Match_ID)."""
+        return (self.putaran, self.lapangan, self.mode, self.p1a, self.p1b, self.p2a, self.p2b,
+                self.poin_1, self.poin_2, self.status, self.versi)
+
+    @classmethod
+    def dari_dict(cls, d):
+        """Dari dict berkunci Match_ID + KOLOM_JADWAL (buat_match_dari_grup / penyimpanan)."""
+        def id_atau_none(nilai):
+            # NaN (dari DataFrame) != NaN
+            return int(nilai) if nilai is not None and nilai == nilai else None
+        return cls(int(d['Match_ID']), int(d['Putaran']), int(d['Lapangan']), d['Mode'],
+                   id_atau_none(d['Pemain_1_A']), id_atau_none(d['Pemain_1_B']),
+                   id_atau_none(d['Pemain_2_A']), id_atau_none(d['Pemain_2_B']),
+                   int(d['Poin_Tim_1']), int(d['Poin_Tim_2']), d['Status'] == 'Selesai', int(d.get('Versi', 0)))
+
+
+class TabelJadwal:
+    """Match berdasarkan Match_ID, plus indeks match per putaran."""
+
+    def __init__(self, matches=()):
+        self.match = {}
+        self._per_putaran = {}
+        for match in matches:
+            self.tambah(match)
+
+    def __len__(self):
+        return len(self.match)
+
+    def __contains__(self, match_id):
+        return match_id in self.match
+
+    def __iter__(self):
+        return iter(self.match.values())
+
+    def get(self, match_id):
+        return self.match.get(match_id)
+
+    def tambah(self, match):
+        self.match[match.match_id] = match
+        self._per_putaran.setdefault(match.putaran, {})[match.match_id] = match
+
+    def hapus(self, match_id):
+        match = self.match.pop(match_id)
+        per_putaran = self._per_putaran[match.putaran]
+        del per_putaran[match_id]
+        if not per_putaran:
+            del self._per_putaran[match.putaran]
+        return match
+
+    def putaran(self, putaran):
+        """Match satu putaran, urut Match_ID."""
+        return list(self._per_putaran.get(putaran, {}).values())
+
+    def ke_dataframe(self):
+        return match_ke_dataframe(self.match.values())
+
+
+def array_id(matches):
+    """ID pemain (n, 4) float dengan NaN untuk slot kosong, untuk RiwayatPasangan.catat_array."""
+    return np.array([[np.nan if p is None else p for p in (m.p1a, m.p1b, m.p2a, m.p2b)] for m in matches],
+                    dtype=float).reshape(-1, 4)
+
+
+def match_ke_dataframe(matches):
+    """View DataFrame (indeks Match_ID, kolom KOLOM_JADWAL) dari kumpulan Match."""
+    import pandas as pd
+    matches = list(matches)
+    return pd.DataFrame([m.ke_baris() for m in matches], columns=KOLOM_JADWAL,
+                        index=pd.Index([m.match_id for m in matches], name='Match_ID'))
@@ -0,0 +1,178 @@
+from profil import terukur
+from tabel import KOLOM_PEMAIN
+
+# --- View-Model Halaman ---
+# Data untuk template dibangun langsung dari TabelPemain / TabelJadwal dengan
+# Python biasa, tanpa pandas, sehingga request halaman tidak perlu memuat
+# pandas sama sekali (penting untuk cold start serverless).
+
+WLT_TEKS = {'W': '1/0/0', 'L': '0/1/0', 'T': '0/0/1'}
+
+
+def kelas_wlt(wlt):
+    """Kelas CSS untuk teks W/L/T match (sama dengan getWltClass di index.html)."""
+    if wlt.startswith('1'):
+        return 'wlt-match-win'
+    if wlt.startswith('0/1'):
+        return 'wlt-match-lose'
+    if wlt.startswith('0/0/1'):
+        return 'wlt-match-tie'
+    return ''
+
+
+def hitung_status_match(poin1, poin2):
+    if poin1 > poin2: return 'W'
+    if poin2 > poin1: return 'L'
+    return 'T'
+
+
+@terukur()
+def data_peringkat(pemain):
+    """
+    Baris klasemen untuk template, urut Total_Poin DESC (stabil terhadap urutan
+    pemain). Peringkat memakai aturan 'min': poin sama = peringkat sama.
+    """
+    # Satu konversi array -> list untuk semua pemain, bukan baris_tuple per pemain
+    baris = [dict(zip(KOLOM_PEMAIN, (p_id, nama, *angka)))
+             for p_id, nama, angka in zip(pemain.id_aktif().tolist(), pemain.nama, pemain.angka[:len(pemain)].tolist())]
+    baris.sort(key=lambda p: -p['Total_Poin'])
+
+    peringkat, poin_sebelumnya = 0, None
+    for posisi, p in enumerate(baris, start=1):
+        if p['Total_Poin'] != poin_sebelumnya:
+            peringkat, poin_sebelumnya = posisi, p['Total_Poin']
+        p['Peringkat'] = peringkat
+        # Ranking_W_L sama dengan Total_Poin, untuk menyesuaikan nama variabel di HTML
+        p['Ranking_W_L'] = p['Total_Poin']
+    return baris
+
+
+def tersimpan(turnamen, kunci, hitung):
+    """
+    Hasil `hitung()` yang di-cache di turnamen.cache_tampilan; cache itu
+    dibuang setiap kali versi_state naik. Panggil di bawah kunci turnamen.
+    """
+    cache = turnamen.cache_tampilan
+    nilai = cache.get(kunci)
+    if nilai is None:
+        nilai = cache[kunci] = hitung()
+    return nilai
+
+
+def peringkat_turnamen(turnamen):
+    """data_peringkat turnamen, di-cache per versi state."""
+    return tersimpan(turnamen, 'peringkat', lambda: data_peringkat(turnamen.pemain))
+
+
+def data_match(match, nama):
+    """Satu match untuk template: kolom jadwal, nama pemain per slot dan W/L/T per tim."""
+    p1a, p1b, p2a, p2b = match.p1a, match.p1b, match.p2a, match.p2b
+    poin_1, poin_2, selesai = match.poin_1, match.poin_2, match.selesai
+    # Dict literal (urutan kunci = Match_ID + KOLOM_JADWAL), bukan zip(KOLOM_JADWAL, ke_baris())
+    data = {
+        'Match_ID': match.match_id, 'Putaran': match.putaran, 'Lapangan': match.lapangan, 'Mode': match.mode,
+        'Pemain_1_A': p1a, 'Pemain_1_B': p1b, 'Pemain_2_A': p2a, 'Pemain_2_B': p2b,
+        'Poin_Tim_1': poin_1, 'Poin_Tim_2': poin_2, 'Status': 'Selesai' if selesai else 'Belum Selesai',
+        'Versi': match.versi,
+    }
+    if p1a is not None: data['Pemain_1_A_Nama'] = nama.get(p1a, '')
+    if p1b is not None: data['Pemain_1_B_Nama'] = nama.get(p1b, '')
+    if p2a is not None: data['Pemain_2_A_Nama'] = nama.get(p2a, '')
+    if p2b is not None: data['Pemain_2_B_Nama'] = nama.get(p2b, '')
+
+    if selesai:
+        data['Status_Tim_1'] = WLT_TEKS[hitung_status_match(poin_1, poin_2)]
+        data['Status_Tim_2'] = WLT_TEKS[hitung_status_match(poin_2, poin_1)]
+    else:
+        data['Status_Tim_1'] = '-'
+        data['Status_Tim_2'] = '-'
+    return data
+
+
+def peta_nama(pemain):
+    """ID -> nama untuk semua pemain terdaftar (satu tabel lookup per view)."""
+    return dict(zip(pemain.id_aktif().tolist(), pemain.nama))
+
+
+@terukur()
+def data_jadwal(matches, pemain):
+    """Semua match untuk template dalam satu lintasan, dengan satu tabel nama bersama."""
+    nama = peta_nama(pemain)
+    return [data_match(m, nama) for m in matches]
+
+
+def nama_bye(pemain, bye_ids):
+    """Nama pemain yang duduk di luar menurut buku bye (yang masih terdaftar)."""
+    return [pemain.nama[pemain.baris[p_id]] for p_id in bye_ids if p_id in pemain]
+
+
+@terukur()
+def data_index(turnamen):
+    """Semua variabel template index.html yang bergantung pada state turnamen."""
+    pemain, last_config = turnamen.pemain, turnamen.last_config
+    putaran_saat_ini = turnamen.putaran_saat_ini
+    matches = turnamen.jadwal.putaran(putaran_saat_ini)
+
+    current_mode = last_config['mode_permainan']
+    can_reshuffle = False
+    pemain_bye = []
+    jadwal = []
+
+    if matches:
+        current_mode = matches[0].mode
+        pemain_bye = nama_bye(pemain, turnamen.buku_bye.get(putaran_saat_ini, ()))
+        can_reshuffle = not any(m.selesai for m in matches)
+
+        if len(pemain):
+            jadwal = data_jadwal(matches, pemain)
+
+    if putaran_saat_ini == 0:
+        pemain_bye = []
+
+    return {
+        'peringkat': peringkat_turnamen(turnamen) if len(pemain) else [],
+        'jadwal': jadwal,
+        'putaran': putaran_saat_ini,
+        'can_reshuffle': can_reshuffle,
+        'current_mode': current_mode,
+        'current_format': last_config['format_turnamen'],
+        'pemain_bye': pemain_bye,
+        'sisa_rencana': len(turnamen.rencana_jadwal['putaran']) if turnamen.rencana_jadwal else 0,
+    }
+
+
+def data_putaran(turnamen, putaran):
+    """Match satu putaran (format sama dengan `jadwal` di index) dan bye jika putaran aktif."""
+    matches = turnamen.matches_putaran(putaran)
+    pemain = turnamen.pemain
+    aktif = putaran == turnamen.putaran_saat_ini and putaran > 0
+    pemain_bye = []
+    if aktif and matches:
+        pemain_bye = nama_bye(pemain, turnamen.buku_bye.get(putaran, ()))
+    return {
+        'putaran': putaran,
+        'aktif': aktif,
+        'jadwal': data_jadwal(matches, pemain),
+        'pemain_bye': pemain_bye,
+    }
+
+
+def data_rating(turnamen):
+    """Rating pemain urut tertinggi: [{ID, Nama, Rating}], di-cache per versi state."""
+    def hitung():
+        nama = peta_nama(turnamen.pemain)
+        return [{'ID': p_id, 'Nama': nama.get(p_id, ''), 'Rating': nilai} for p_id, nilai in turnamen.rating.baris()]
+    return tersimpan(turnamen, 'rating', hitung)
+
+
+def peringkat_berubah(sebelum, sesudah):
+    """Baris `sesudah` yang berbeda dari `sebelum` (keduanya hasil data_peringkat)."""
+    lama = {p['ID']: p for p in sebelum}
+    return [p for p in sesudah if lama.get(p['ID']) != p]
+
+
+@terukur()
+def data_rekap(peringkat):
+    """Baris rekap final (rekap.html) dari hasil data_peringkat."""
+    kolom_rekap = ['Peringkat', 'Nama', 'Ranking_W_L', 'W', 'L', 'T', 'Games_Played']
+    return [{k: p[k] for k in kolom_rekap} for p in peringkat]
@@ -0,0 +1,55 @@
+import itertools
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Modul aplikasi berada di root repo (seperti benchmark/)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Variabel lingkungan yang dibaca app.py saat diimpor
+ENV_TURNAMEN = ('TURNAMEN_DB', 'TURNAMEN_LOG', 'TURNAMEN_DIR', 'TURNAMEN_MUSIM', 'TURNAMEN_AKTIF_MAKS',
+                'TURNAMEN_PARALEL', 'TURNAMEN_PROFIL', 'TURNAMEN_PROFIL_DIR', 'MAX_PEMAIN')
+
+
+@pytest.fixture
+def jalankan_app():
+    """
+    Menjalankan `kode` di proses Python baru dengan lingkungan `env`
+    (konfigurasi app.py dibaca sekali saat diimpor). Gagal jika prosesnya
+    gagal; mengembalikan stdout.
+    """
+    def jalankan(kode, **env):
+        lingkungan = {k: v for k, v in os.environ.items() if k not in ENV_TURNAMEN}
+        lingkungan.update(env)
+        hasil = subprocess.run([sys.executable, '-c', kode], cwd=ROOT, env=lingkungan,
+                               capture_output=True, text=True, timeout=120)
+        assert hasil.returncode == 0, hasil.stderr
+        return hasil.stdout
+    return jalankan
+
+
+_nomor_turnamen = itertools.count(1)
+
+
+@pytest.fixture(scope='session')
+def aplikasi():
+    """Modul app diimpor sekali dalam mode memori (tanpa TURNAMEN_DB/LOG/DIR)."""
+    for kunci in ENV_TURNAMEN:
+        os.environ.pop(kunci, None)
+    # Turnamen per tes tidak boleh saling mengeluarkan dari registri
+    os.environ['TURNAMEN_AKTIF_MAKS'] = '10000'
+    import app
+    return app
+
+
+@pytest.fixture
+def turnamen_baru(aplikasi):
+    """(client, awalan URL, Turnamen) untuk turnamen baru yang dibuat lewat API."""
+    turnamen_id = f'tes-{next(_nomor_turnamen)}'
+    client = aplikasi.app.test_client()
+    awalan = f'/t/{turnamen_id}'
+    assert client.post(awalan + '/api/v1/tournament').status_code == 201
+    return client, awalan, aplikasi.registri.ambil(turnamen_id)
@@ -0,0 +1,102 @@
+import pytest
+
+API = '/api/v1'
+
+
+def siapkan(turnamen):
+    for i in range(8):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(2, 'Americano', 'Double')
+    return turnamen.jadwal.putaran(1)[0]
+
+
+def test_buat_turnamen_201_lalu_200(aplikasi):
+    client = aplikasi.app.test_client()
+    respons = client.post('/t/api-baru' + API + '/tournament')
+    assert respons.status_code == 201
+    assert respons.get_json()['turnamen'] == 'api-baru'
+    assert client.get(respons.get_json()['url']).status_code == 200
+    assert client.post('/t/api-baru' + API + '/tournament').status_code == 200
+
+
+@pytest.mark.parametrize('turnamen_id', ['a.b', 'x' * 65])
+def test_buat_turnamen_id_tidak_valid_400(aplikasi, turnamen_id):
+    respons = aplikasi.app.test_client().post(f'/t/{turnamen_id}{API}/tournament')
+    assert respons.status_code == 400
+    assert 'galat' in respons.get_json()
+
+
+@pytest.mark.parametrize('metode,jalur', [
+    ('get', '/'),
+    ('get', API + '/standings'),
+    ('get', API + '/rounds/1'),
+    ('get', API + '/export/matches.csv'),
+    ('post', API + '/matches/1/score'),
+    ('post', API + '/scores'),
+    ('post', API + '/players/import'),
+    ('post', API + '/season/fold'),
+])
+def test_turnamen_tidak_dikenal_404(aplikasi, metode, jalur):
+    client = aplikasi.app.test_client()
+    assert getattr(client, metode)('/t/tidak-ada' + jalur).status_code == 404
+    assert not aplikasi.registri.ada('tidak-ada')
+
+
+@pytest.mark.parametrize('body', [
+    None,
+    {},
+    {'skor_tim_1': 21},
+    {'skor_tim_1': 'dua puluh satu', 'skor_tim_2': 10},
+    {'skor_tim_1': 21, 'skor_tim_2': -1},
+    {'skor_tim_1': 21, 'skor_tim_2': 10, 'versi': 'terbaru'},
+], ids=['tanpa-body', 'kosong', 'skor-kurang', 'bukan-angka', 'negatif', 'versi-bukan-angka'])
+def test_skor_payload_buruk_400(turnamen_baru, body):
+    client, awalan, turnamen = turnamen_baru
+    match = siapkan(turnamen)
+    respons = client.post(f'{awalan}{API}/matches/{match.match_id}/score', json=body)
+    assert respons.status_code == 400
+    assert not match.selesai
+
+
+def test_skor_versi_basi_409(turnamen_baru):
+    client, awalan, turnamen = turnamen_baru
+    match = siapkan(turnamen)
+    url = f'{awalan}{API}/matches/{match.match_id}/score'
+
+    respons = client.post(url, json={'skor_tim_1': 21, 'skor_tim_2': 15, 'versi': 0})
+    assert respons.status_code == 200
+    assert respons.get_json()['match']['Versi'] == 1
+
+    basi = client.post(url, json={'skor_tim_1': 10, 'skor_tim_2': 21, 'versi': 0})
+    assert basi.status_code == 409
+    # Respons 409 membawa match terbaru agar klien bisa mencoba lagi
+    assert basi.get_json()['match']['Versi'] == 1
+    assert (match.poin_1, match.poin_2) == (21, 15)
+    assert client.post(url, json={'skor_tim_1': 10, 'skor_tim_2': 21, 'versi': 1}).status_code == 200
+
+
+def test_match_dan_putaran_tidak_ada_404(turnamen_baru):
+    client, awalan, turnamen = turnamen_baru
+    siapkan(turnamen)
+    assert client.post(f'{awalan}{API}/matches/9999/score', json={'skor_tim_1': 1, 'skor_tim_2': 0}).status_code == 404
+    assert client.get(f'{awalan}{API}/rounds/1').status_code == 200
+    assert client.get(f'{awalan}{API}/rounds/99').status_code == 404
+
+
+def test_endpoint_baca_200(turnamen_baru):
+    client, awalan, turnamen = turnamen_baru
+    siapkan(turnamen)
+    for jalur in ('/standings', '/fairness', '/ratings'):
+        respons = client.get(awalan + API + jalur)
+        assert respons.status_code == 200, jalur
+        assert respons.get_json()['api']
+
+
+def test_musim_400_dan_404(turnamen_baru):
+    client, awalan, turnamen = turnamen_baru
+    siapkan(turnamen)
+    assert client.get(API + '/season/leaderboard?batas=0').status_code == 400
+    assert client.get(API + '/season/leaderboard?offset=-1').status_code == 400
+    assert client.delete(awalan + API + '/season/fold').status_code == 404
+    assert client.post(awalan + API + '/season/fold').status_code == 200
+    assert client.delete(awalan + API + '/season/fold').status_code == 200
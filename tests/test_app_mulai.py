@@ -0,0 +1,33 @@
+import os
+
+# Perilaku saat app.py diimpor: dijalankan di proses baru lewat fixture jalankan_app
+
+
+def test_app_mulai_dengan_turnamen_dir_baru(jalankan_app, tmp_path):
+    direktori = tmp_path / 'data' / 'turnamen'
+    keluaran = jalankan_app(
+        "import app\n"
+        "c = app.app.test_client()\n"
+        "assert c.get('/').status_code == 200\n"
+        "assert c.post('/t/liga/api/v1/tournament').status_code == 201\n"
+        "assert c.post('/t/liga/api/v1/season/fold').status_code == 200\n"
+        "print(app.musim.jumlah()[1])\n",
+        TURNAMEN_DIR=str(direktori),
+    )
+    assert keluaran.split() == ['1']
+    assert os.path.isfile(direktori / 'musim.db')
+    assert os.path.isfile(direktori / 'liga' / 'turnamen.db')
+
+
+def test_halaman_utama_tanpa_impor_pandas(jalankan_app):
+    # pandas hanya diimpor lazy (ekspor/rekap); cold start dan GET / tidak boleh memuatnya
+    keluaran = jalankan_app(
+        "import sys\n"
+        "import app\n"
+        "print('pandas' in sys.modules)\n"
+        "c = app.app.test_client()\n"
+        "c.post('/tambah_pemain', data={'nama_pemain': 'Ani'})\n"
+        "assert c.get('/').status_code == 200\n"
+        "print('pandas' in sys.modules)\n"
+    )
+    assert keluaran.split() == ['False', 'False']
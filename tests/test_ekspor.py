@@ -0,0 +1,118 @@
+import csv
+import importlib.util
+import io
+import json
+import random
+
+import pytest
+
+from ekspor import KOLOM_EKSPOR, ekspor
+from penyimpanan import PenyimpananSQLite
+from turnamen import Turnamen
+
+ADA_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+
+def mainkan(turnamen, jumlah_putaran=4, jumlah_pemain=10):
+    acak = random.Random(11)
+    for i in range(jumlah_pemain):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(2, 'Americano', 'Double')
+    for _ in range(jumlah_putaran):
+        for match in turnamen.jadwal.putaran(turnamen.putaran_saat_ini):
+            turnamen.input_skor(match.match_id, acak.randint(0, 21), acak.randint(0, 21))
+    # Putaran terakhir setengah jalan: ada match Belum Selesai di ekspor
+    match = turnamen.jadwal.putaran(turnamen.putaran_saat_ini)[0]
+    turnamen.input_skor(match.match_id, 21, 19)
+
+
+def baca_csv(isi):
+    return list(csv.DictReader(io.StringIO(isi.decode())))
+
+
+def baca_jsonl(isi):
+    return [json.loads(baris) for baris in isi.decode().splitlines()]
+
+
+def match_diharapkan(turnamen):
+    return turnamen.semua_jadwal().reset_index().to_dict('records')
+
+
+def klasemen_diharapkan(turnamen):
+    pemain = turnamen.pemain_df
+    return {p_id: dict(ID=p_id, **row.to_dict(), Rating=turnamen.rating.nilai(p_id))
+            for p_id, row in pemain.iterrows()}
+
+
+def cek_match(baris, turnamen, teks):
+    diharapkan = match_diharapkan(turnamen)
+    if teks:
+        diharapkan = [{k: str(v) for k, v in row.items()} for row in diharapkan]
+    assert baris == diharapkan
+    assert list(baris[0]) == KOLOM_EKSPOR['matches']
+
+
+def cek_klasemen(baris, turnamen, teks):
+    diharapkan = klasemen_diharapkan(turnamen)
+    assert list(baris[0]) == KOLOM_EKSPOR['standings']
+    assert len(baris) == len(diharapkan)
+    peringkat = [int(row['Peringkat']) for row in baris]
+    assert peringkat == sorted(peringkat) and peringkat[0] == 1
+    poin = [int(row['Total_Poin']) for row in baris]
+    assert poin == sorted(poin, reverse=True)
+    for row in baris:
+        row = {k: v for k, v in row.items() if k != 'Peringkat'}
+        harapan = diharapkan[int(row['ID'])]
+        if teks:
+            harapan = {k: str(v) for k, v in harapan.items()}
+        assert row == harapan
+
+
+CEK = {'matches': cek_match, 'standings': cek_klasemen}
+BACA = {'csv': baca_csv, 'jsonl': baca_jsonl}
+
+
+@pytest.mark.parametrize('data', ['matches', 'standings'])
+@pytest.mark.parametrize('format_ekspor', ['csv', 'jsonl'])
+def test_ekspor_api_sama_dengan_state(turnamen_baru, data, format_ekspor):
+    client, awalan, turnamen = turnamen_baru
+    mainkan(turnamen)
+
+    respons = client.get(f'{awalan}/api/v1/export/{data}.{format_ekspor}')
+
+    assert respons.status_code == 200
+    assert respons.headers['Cache-Control'] == 'no-store'
+    assert f'-{data}.{format_ekspor}' in respons.headers['Content-Disposition']
+    CEK[data](BACA[format_ekspor](respons.get_data()), turnamen, format_ekspor == 'csv')
+
+
+@pytest.mark.parametrize('format_ekspor', ['csv', 'jsonl'])
+def test_ekspor_sqlite_per_potongan(tmp_path, format_ekspor):
+    turnamen = Turnamen(max_pemain=10, penyimpanan=PenyimpananSQLite(str(tmp_path / 'turnamen.db')))
+    mainkan(turnamen, jumlah_putaran=6)
+
+    # Potongan kecil: riwayat dibaca lewat cursor dalam beberapa potongan
+    potongan = list(ekspor(turnamen, 'matches', format_ekspor, ukuran=3))
+    assert len(potongan) > 3
+    cek_match(BACA[format_ekspor](b''.join(potongan)), turnamen, format_ekspor == 'csv')
+    cek_klasemen(BACA[format_ekspor](b''.join(ekspor(turnamen, 'standings', format_ekspor, ukuran=3))),
+                 turnamen, format_ekspor == 'csv')
+
+
+@pytest.mark.skipif(ADA_PYARROW, reason='pyarrow terpasang')
+def test_parquet_tanpa_pyarrow_501(turnamen_baru):
+    client, awalan, turnamen = turnamen_baru
+    mainkan(turnamen)
+    for data in ('matches', 'standings'):
+        respons = client.get(f'{awalan}/api/v1/export/{data}.parquet')
+        assert respons.status_code == 501
+        assert 'pyarrow' in respons.get_json()['galat']
+
+
+def test_parquet_dengan_pyarrow(turnamen_baru):
+    pq = pytest.importorskip('pyarrow.parquet')
+    client, awalan, turnamen = turnamen_baru
+    mainkan(turnamen)
+    respons = client.get(f'{awalan}/api/v1/export/matches.parquet')
+    assert respons.status_code == 200
+    cek_match(pq.read_table(io.BytesIO(respons.get_data())).to_pylist(), turnamen, False)
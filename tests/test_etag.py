@@ -0,0 +1,28 @@
+import pytest
+
+
+@pytest.mark.parametrize('jalur', ['/', '/api/v1/standings'])
+def test_etag_304_sampai_state_berubah(turnamen_baru, jalur):
+    client, awalan, turnamen = turnamen_baru
+    for i in range(8):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(2, 'Americano', 'Double')
+
+    pertama = client.get(awalan + jalur)
+    assert pertama.status_code == 200
+    etag = pertama.headers['ETag']
+    assert pertama.headers['Cache-Control'] == 'no-cache'
+
+    tetap = client.get(awalan + jalur, headers={'If-None-Match': etag})
+    assert tetap.status_code == 304
+    assert tetap.headers['ETag'] == etag
+    assert tetap.get_data() == b''
+
+    match = turnamen.jadwal.putaran(1)[0]
+    assert turnamen.input_skor(match.match_id, 21, 12)
+
+    baru = client.get(awalan + jalur, headers={'If-None-Match': etag})
+    assert baru.status_code == 200
+    assert baru.headers['ETag'] != etag
+    assert baru.get_data() != pertama.get_data()
+    assert client.get(awalan + jalur, headers={'If-None-Match': baru.headers['ETag']}).status_code == 304
@@ -0,0 +1,71 @@
+import pytest
+
+from impor import baca_nama
+from turnamen import Turnamen
+
+
+@pytest.mark.parametrize('teks,format_csv,nama', [
+    ('Ani\nBudi\nCitra', False, ['Ani', 'Budi', 'Citra']),
+    ('  Ani  \r\n\r\n\tBudi\n   \nCitra\n', False, ['Ani', 'Budi', 'Citra']),
+    # Tanpa header: koma adalah bagian nama
+    ('Budi, S.Kom\nAni', False, ['Budi, S.Kom', 'Ani']),
+    ('\ufeffAni\nBudi', False, ['Ani', 'Budi']),
+    ('', False, []),
+    # CSV dengan header kolom nama, di kolom mana pun
+    ('nama,kota\nAni,Bandung\nBudi,Solo', False, ['Ani', 'Budi']),
+    ('id,Player,klub\n1,Ani,A\n2,"Budi, Jr.",B\n3,,C\n4', False, ['Ani', 'Budi, Jr.']),
+    ('\ufeffNama_Pemain\r\nAni\r\n\r\n Budi \r\n', False, ['Ani', 'Budi']),
+    # CSV tanpa header (mis. berkas .csv): kolom pertama
+    ('Ani,Bandung\nBudi,Solo\n,Kosong', True, ['Ani', 'Budi']),
+    ('"Budi, Jr.",Solo', True, ['Budi, Jr.']),
+    ('name\nAni', True, ['Ani']),
+], ids=['per-baris', 'baris-kosong', 'koma-tanpa-header', 'bom', 'kosong', 'header-nama',
+        'header-kolom-tengah', 'header-crlf-bom', 'csv-tanpa-header', 'csv-kutip', 'csv-header'])
+def test_baca_nama(teks, format_csv, nama):
+    assert baca_nama(teks, format_csv=format_csv) == nama
+
+
+@pytest.mark.parametrize('roster,max_pemain,nama,ditambah,dilewati', [
+    ([], 8, ['Ani', 'Budi'], ['Ani', 'Budi'], []),
+    ([], 8, ['Ani', '', '   ', 'Budi'], ['Ani', 'Budi'], [('', 'kosong'), ('', 'kosong')]),
+    # Duplikat terhadap roster dan sesama daftar, tanpa beda huruf/spasi
+    (['Ani'], 8, ['ani', 'Budi', ' BUDI ', 'Ani  Putri', 'ani putri'], ['Budi', 'Ani  Putri'],
+     [('ani', 'duplikat'), ('BUDI', 'duplikat'), ('ani putri', 'duplikat')]),
+    (['Ani', 'Budi'], 4, ['Citra', 'Dewi', 'Eko', 'Ani', 'Fajar'], ['Citra', 'Dewi'],
+     [('Eko', 'roster penuh'), ('Ani', 'duplikat'), ('Fajar', 'roster penuh')]),
+    (['Ani', 'Budi'], 2, ['Citra'], [], [('Citra', 'roster penuh')]),
+], ids=['semua-baru', 'kosong', 'duplikat', 'melebihi-max', 'roster-penuh'])
+def test_tambah_pemain_banyak(roster, max_pemain, nama, ditambah, dilewati):
+    turnamen = Turnamen(max_pemain=max_pemain)
+    for n in roster:
+        turnamen.tambah_pemain(n)
+
+    hasil_ditambah, hasil_dilewati = turnamen.tambah_pemain_banyak(nama)
+
+    assert [n for _, n in hasil_ditambah] == ditambah
+    assert [p_id for p_id, _ in hasil_ditambah] == list(range(len(roster) + 1, len(roster) + len(ditambah) + 1))
+    assert hasil_dilewati == dilewati
+    assert list(turnamen.pemain.nama) == roster + ditambah
+
+
+def test_api_impor_pemain(aplikasi, turnamen_baru):
+    client, awalan, turnamen = turnamen_baru
+    turnamen.tambah_pemain('Ani')
+
+    respons = client.post(awalan + '/api/v1/players/import', data='nama,kota\nBudi,Solo\nani,Bandung\n,Medan\n',
+                          content_type='text/csv')
+    assert respons.status_code == 200
+    hasil = respons.get_json()
+    assert hasil['ditambah'] == [{'ID': 2, 'Nama': 'Budi'}]
+    assert hasil['dilewati'] == [{'Nama': 'ani', 'alasan': 'duplikat'}]
+    assert hasil['jumlah_pemain'] == 2
+
+    # JSON: sisa roster diisi, kelebihannya dilewati
+    nama = [f'Pemain {i}' for i in range(aplikasi.MAX_PEMAIN)] + ['']
+    hasil = client.post(awalan + '/api/v1/players/import', json={'nama': nama}).get_json()
+    assert len(hasil['ditambah']) == aplikasi.MAX_PEMAIN - 2
+    assert [d['alasan'] for d in hasil['dilewati']] == ['roster penuh'] * 2 + ['kosong']
+    assert hasil['jumlah_pemain'] == len(turnamen.pemain) == aplikasi.MAX_PEMAIN
+
+    assert client.post(awalan + '/api/v1/players/import', json={'nama': 'Ani'}).status_code == 400
+    assert client.post(awalan + '/api/v1/players/import', json={'nama': ['Ani', 3]}).status_code == 400
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from klasemen import cek_konsistensi_wlt
+from log_event import LogEvent
+from penyimpanan import PenyimpananSQLite
+from turnamen import Turnamen
+
+
+def skor_acak(acak):
+    return acak.randint(0, 21), acak.randint(0, 21)
+
+
+def buat_turnamen(jenis, tmp_path, jumlah_pemain):
+    penyimpanan = PenyimpananSQLite(str(tmp_path / 'turnamen.db')) if jenis == 'sqlite' else None
+    turnamen = Turnamen(max_pemain=jumlah_pemain, penyimpanan=penyimpanan)
+    for i in range(jumlah_pemain):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    return turnamen
+
+
+def mainkan(turnamen, acak, jumlah_putaran, koreksi=0.3, hapus=0.2):
+    """Putaran acak: skor, koreksi skor (juga putaran lama di memori) dan hapus_pemain di tengah putaran."""
+    for _ in range(jumlah_putaran):
+        putaran = turnamen.putaran_saat_ini
+        matches = [m.match_id for m in turnamen.jadwal.putaran(putaran)]
+        for match_id in matches[:-1]:
+            turnamen.input_skor(match_id, *skor_acak(acak))
+        if acak.random() < koreksi:
+            selesai = [m.match_id for m in turnamen.jadwal if m.selesai]
+            if selesai:
+                turnamen.input_skor(acak.choice(selesai), *skor_acak(acak))
+        if acak.random() < hapus and len(turnamen.pemain) > 6:
+            turnamen.hapus_pemain(acak.choice(turnamen.pemain.id_aktif().tolist()))
+        # Match terakhir menutup putaran dan menjadwalkan putaran berikutnya
+        for match in turnamen.jadwal.putaran(putaran):
+            if not match.selesai:
+                turnamen.input_skor(match.match_id, *skor_acak(acak))
+
+
+@pytest.mark.parametrize('jenis', ['memori', 'sqlite'])
+@pytest.mark.parametrize('format_turnamen,mode_permainan', [
+    ('Americano', 'Double'), ('Mexicano', 'Double'), ('Mexicano', 'Single'),
+])
+@pytest.mark.parametrize('seed', range(5))
+def test_klasemen_inkremental_sama_dengan_hitung_ulang(jenis, format_turnamen, mode_permainan, seed, tmp_path):
+    acak = random.Random(seed)
+    turnamen = buat_turnamen(jenis, tmp_path, acak.randint(8, 14))
+    turnamen.mulai_putaran(acak.randint(1, 3), format_turnamen, mode_permainan)
+
+    mainkan(turnamen, acak, jumlah_putaran=8)
+
+    beda = cek_konsistensi_wlt(turnamen.pemain_df, turnamen.semua_jadwal())
+    assert beda.empty, beda.to_string()
+
+
+def test_klasemen_konsisten_setelah_dimuat_ulang(tmp_path):
+    acak = random.Random(7)
+    turnamen = buat_turnamen('sqlite', tmp_path, 12)
+    turnamen.mulai_putaran(3, 'Americano', 'Double')
+    mainkan(turnamen, acak, jumlah_putaran=6, koreksi=0.5, hapus=0.3)
+
+    dimuat = Turnamen(max_pemain=12, penyimpanan=PenyimpananSQLite(str(tmp_path / 'turnamen.db')))
+    beda = cek_konsistensi_wlt(dimuat.pemain_df, dimuat.semua_jadwal())
+    assert beda.empty, beda.to_string()
+    assert dimuat.pemain_df[['W', 'L', 'T']].equals(turnamen.pemain_df[['W', 'L', 'T']])
+
+
+@pytest.mark.parametrize('selesai', [True, False])
+def test_hapus_pemain_bye_hanya_dari_match_belum_selesai(selesai, tmp_path):
+    turnamen = Turnamen(max_pemain=8, log_event=LogEvent(str(tmp_path / 'log')))
+    for i in range(8):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(2, 'Americano', 'Double')
+    match, lain = turnamen.jadwal.putaran(1)
+    if selesai:
+        turnamen.input_skor(match.match_id, 21, 15)
+    korban, *rekan = match.pemain()
+    turnamen.hapus_pemain(korban)
+
+    bye = turnamen.buku_bye[1]
+    assert (set(rekan) <= set(bye)) is not selesai
+    # Replay log memakai aturan yang sama
+    assert Turnamen(max_pemain=8, log_event=LogEvent(str(tmp_path / 'log'))).buku_bye[1] == bye
+
+    turnamen.input_skor(lain.match_id, 10, 21)
+    total_bye = turnamen.pemain_df['Total_Bye']
+    assert (total_bye[rekan] == (0 if selesai else 1)).all()
@@ -0,0 +1,57 @@
+import copy
+import os
+import random
+
+from log_event import SNAPSHOT_SETIAP, LogEvent
+from turnamen import Turnamen
+
+JUMLAH_PEMAIN = 12
+
+
+def dimuat(direktori):
+    return Turnamen(max_pemain=JUMLAH_PEMAIN, log_event=LogEvent(direktori))
+
+
+def mainkan(turnamen, jumlah_event, acak):
+    """
+    Mencatat skor (termasuk koreksi) sampai log berisi `jumlah_event` event;
+    mengembalikan state setelah setiap event (indeks = jumlah event).
+    """
+    log = turnamen.log_event
+    riwayat = {log.jumlah_event: copy.deepcopy(turnamen.ke_state())}
+    while log.jumlah_event < jumlah_event:
+        putaran = turnamen.jadwal.putaran(turnamen.putaran_saat_ini)
+        if acak.random() < 0.2 and any(m.selesai for m in putaran):
+            match = acak.choice([m for m in putaran if m.selesai])
+        else:
+            match = next(m for m in putaran if not m.selesai)
+        turnamen.input_skor(match.match_id, acak.randint(0, 21), acak.randint(0, 21))
+        riwayat[log.jumlah_event] = copy.deepcopy(turnamen.ke_state())
+    return riwayat
+
+
+def test_replay_snapshot_dan_undo_melewati_snapshot(tmp_path):
+    direktori = str(tmp_path / 'log')
+    turnamen = dimuat(direktori)
+    for i in range(JUMLAH_PEMAIN):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(3, 'Americano', 'Double')
+    riwayat = mainkan(turnamen, SNAPSHOT_SETIAP + 20, random.Random(5))
+    total = turnamen.log_event.jumlah_event
+
+    snapshot = sorted(nama for nama in os.listdir(direktori) if nama.startswith('snapshot-'))
+    assert [int(nama.split('-')[1]) for nama in snapshot] == [SNAPSHOT_SETIAP]
+
+    # Cold start: snapshot + ekor log
+    assert dimuat(direktori).ke_state() == turnamen.ke_state() == riwayat[total]
+
+    # Undo melewati batas snapshot: replay mulai dari state kosong lagi
+    n = total - SNAPSHOT_SETIAP + 5
+    turnamen.undo(n)
+    assert turnamen.ke_state() == riwayat[total - n]
+    assert dimuat(direktori).ke_state() == riwayat[total - n]
+
+    # Setelah undo, skor baru tercatat dan tetap bisa dimuat ulang
+    match = next(m for m in turnamen.jadwal.putaran(turnamen.putaran_saat_ini) if not m.selesai)
+    turnamen.input_skor(match.match_id, 21, 0)
+    assert dimuat(direktori).ke_state() == turnamen.ke_state()
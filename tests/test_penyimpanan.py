@@ -0,0 +1,78 @@
+import pytest
+
+from klasemen import cek_konsistensi_wlt
+from penyimpanan import KonflikVersi, PenyimpananSQLite
+from turnamen import Turnamen
+
+
+@pytest.fixture
+def dua_instance(tmp_path):
+    """Dua Turnamen (mis. dua proses) pada satu file SQLite yang sama."""
+    path = str(tmp_path / 'turnamen.db')
+    a = Turnamen(max_pemain=8, penyimpanan=PenyimpananSQLite(path))
+    for i in range(8):
+        a.tambah_pemain(f'Pemain {i + 1}')
+    a.mulai_putaran(2, 'Americano', 'Double')
+    b = Turnamen(max_pemain=8, penyimpanan=PenyimpananSQLite(path))
+    return a, b
+
+
+def skor(turnamen, match_id):
+    match = turnamen.jadwal.get(match_id)
+    return match.poin_1, match.poin_2, match.selesai, match.versi
+
+
+def test_versi_basi_dari_instance_lain_konflik(dua_instance, monkeypatch):
+    a, b = dua_instance
+    match_id = a.jadwal.putaran(1)[0].match_id
+    assert skor(b, match_id) == (0, 0, False, 0)
+
+    assert a.input_skor(match_id, 21, 15, versi=0)
+    # A menulis tepat setelah B sinkron (B belum melihatnya): B masih memegang
+    # versi 0 di memori, baris di SQLite sudah versi 1
+    with monkeypatch.context() as m:
+        m.setattr(b, 'sinkronkan', lambda: None)
+        with pytest.raises(KonflikVersi):
+            b.input_skor(match_id, 10, 21, versi=0)
+
+    # B memuat ulang saat konflik: skor A yang berlaku, skor B tidak tersimpan
+    assert skor(b, match_id) == skor(a, match_id) == (21, 15, True, 1)
+    b.sinkronkan()
+    assert skor(b, match_id) == (21, 15, True, 1)
+    assert b.pemain_df.equals(a.pemain_df)
+    beda = cek_konsistensi_wlt(b.pemain_df, b.semua_jadwal())
+    assert beda.empty, beda.to_string()
+
+    # Dengan versi terbaru, koreksi dari B diterima dan terlihat oleh A
+    assert b.input_skor(match_id, 10, 21, versi=1)
+    a.sinkronkan()
+    assert skor(a, match_id) == (10, 21, True, 2)
+    assert a.pemain_df.equals(b.pemain_df)
+
+
+def test_versi_basi_ditolak_setelah_sinkron(dua_instance):
+    a, b = dua_instance
+    match_id = a.jadwal.putaran(1)[0].match_id
+    assert a.input_skor(match_id, 21, 15, versi=0)
+
+    # input_skor sinkron lebih dulu, sehingga versi basi ditolak tanpa menulis
+    assert not b.input_skor(match_id, 10, 21, versi=0)
+    assert skor(b, match_id) == (21, 15, True, 1)
+    assert b.penyimpanan.versi() == a.penyimpanan.versi()
+
+
+def test_sinkronkan_memuat_skor_instance_lain(dua_instance):
+    a, b = dua_instance
+    matches = [m.match_id for m in a.jadwal.putaran(1)]
+    a.input_skor(matches[0], 21, 18)
+    assert skor(b, matches[0]) == (0, 0, False, 0)
+
+    b.sinkronkan()
+    assert skor(b, matches[0]) == (21, 18, True, 1)
+    assert b.pemain_df.equals(a.pemain_df)
+
+    # Skor yang menutup putaran di A membawa putaran baru ke B
+    a.input_skor(matches[1], 21, 5)
+    b.sinkronkan()
+    assert b.putaran_saat_ini == a.putaran_saat_ini == 2
+    assert [m.pemain() for m in b.jadwal.putaran(2)] == [m.pemain() for m in a.jadwal.putaran(2)]
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from registri import RegistriTurnamen
+
+ADA_PROC_FD = os.path.isdir('/proc/self/fd')
+
+
+def jumlah_fd():
+    return len(os.listdir('/proc/self/fd'))
+
+
+def isi(turnamen, jumlah_pemain=8):
+    for i in range(jumlah_pemain):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(2, 'Americano', 'Double')
+    match = turnamen.jadwal.putaran(1)[0]
+    turnamen.input_skor(match.match_id, 21, 12)
+
+
+def test_ambil_id_tidak_dikenal_gagal_buat_membuat(tmp_path):
+    registri = RegistriTurnamen(direktori=str(tmp_path))
+    with pytest.raises(KeyError):
+        registri.ambil('liga')
+    with pytest.raises(KeyError):
+        registri.buat('../liga')
+    assert not os.path.exists(tmp_path / 'liga')
+
+    turnamen = registri.buat('liga')
+    assert registri.ambil('liga') is turnamen
+    assert registri.ada('liga')
+    assert os.path.isfile(tmp_path / 'liga' / 'turnamen.db')
+
+
+def test_api_404_untuk_id_tidak_dikenal_201_saat_dibuat(aplikasi):
+    client = aplikasi.app.test_client()
+    assert client.get('/t/belum-dibuat/').status_code == 404
+    assert client.get('/t/belum-dibuat/api/v1/standings').status_code == 404
+    assert client.post('/t/belum-dibuat/api/v1/matches/1/score', json={'skor_tim_1': 1, 'skor_tim_2': 0}).status_code == 404
+    assert not aplikasi.registri.ada('belum-dibuat')
+
+    assert client.post('/t/belum-dibuat/api/v1/tournament').status_code == 201
+    assert client.post('/t/belum-dibuat/api/v1/tournament').status_code == 200
+    assert client.get('/t/belum-dibuat/').status_code == 200
+    assert client.post('/t/id.tidak.valid/api/v1/tournament').status_code == 400
+
+
+def test_turnamen_dikeluarkan_dimuat_ulang_dari_direktori(tmp_path):
+    dikeluarkan = []
+    registri = RegistriTurnamen(direktori=str(tmp_path), pakai_log=True, maks_aktif=1,
+                                saat_dikeluarkan=lambda t_id, t: dikeluarkan.append(t_id))
+    a = registri.buat('a')
+    isi(a)
+    klasemen = a.pemain_df.copy()
+    registri.buat('b')
+    assert registri.aktif() == ['b']
+    assert dikeluarkan == ['a']
+
+    dimuat = registri.ambil('a')
+    assert dimuat is not a
+    assert dimuat.pemain_df.equals(klasemen)
+    assert registri.aktif() == ['a']
+
+
+@pytest.mark.skipif(not ADA_PROC_FD, reason='butuh /proc/self/fd')
+def test_pengeluaran_menutup_koneksi_dan_log(tmp_path):
+    registri = RegistriTurnamen(direktori=str(tmp_path), pakai_log=True, maks_aktif=1)
+    for t_id in ('a', 'b', 'c'):
+        isi(registri.buat(t_id))
+
+    awal = jumlah_fd()
+    for _ in range(20):
+        for t_id in ('a', 'b', 'c'):
+            registri.ambil(t_id).pemain_df
+    assert jumlah_fd() <= awal
+
+    # Objek penyimpanan/log yang sama tetap bisa dipakai setelah ditutup (turnamen utama)
+    turnamen = registri.ambil('a')
+    turnamen.penyimpanan.tutup()
+    turnamen.log_event.tutup()
+    turnamen.tambah_pemain('Pemain Baru')
+    assert 'Pemain Baru' in registri.ambil('a').pemain.nama
@@ -0,0 +1,92 @@
+import json
+import threading
+
+PELANGGAN = 5
+TENGGAT = 5  # detik
+JEDA = 0.1  # keep-alive pendek agar pembaca tidak lama tertahan
+
+
+def baca_sampai(aliran, jenis, hasil):
+    """Membaca pesan SSE dari `aliran` sampai event `jenis`; menyimpan data JSON-nya di `hasil`."""
+    for potongan in aliran:
+        if isinstance(potongan, bytes):
+            potongan = potongan.decode()
+        baris = dict(b.split(': ', 1) for b in potongan.strip().split('\n') if ': ' in b)
+        if baris.get('event') == jenis:
+            hasil.append(json.loads(baris['data']))
+            return
+
+
+def langganan_bersamaan(penyiar, jenis, jumlah):
+    aliran = [penyiar.langganan(jeda=JEDA) for _ in range(jumlah)]
+    for a in aliran:
+        assert next(a).startswith(b'retry:')  # pelanggan terdaftar
+    hasil = [[] for _ in aliran]
+    thread = [threading.Thread(target=baca_sampai, args=(a, jenis, h), daemon=True) for a, h in zip(aliran, hasil)]
+    for t in thread:
+        t.start()
+    return aliran, hasil, thread
+
+
+def tutup(aliran, thread):
+    for t in thread:
+        t.join(TENGGAT)
+        assert not t.is_alive()
+    for a in aliran:
+        a.close()
+
+
+def test_skor_disiarkan_ke_semua_pelanggan(aplikasi, turnamen_baru):
+    _, awalan, turnamen = turnamen_baru
+    for i in range(12):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(3, 'Americano', 'Double')
+    penyiar = aplikasi.siaran[awalan.rsplit('/', 1)[1]].penyiar
+    match = turnamen.jadwal.putaran(1)[0]
+
+    aliran, hasil, thread = langganan_bersamaan(penyiar, 'skor', PELANGGAN)
+    assert penyiar.pelanggan == PELANGGAN
+    turnamen.input_skor(match.match_id, 21, 12)
+    tutup(aliran, thread)
+
+    assert penyiar.pelanggan == 0
+    for data in hasil:
+        assert len(data) == 1
+        data = data[0]
+        assert [m['Match_ID'] for m in data['matches']] == [match.match_id]
+        assert data['matches'][0]['Poin_Tim_1'] == 21
+        # Diff klasemen pertama berisi seluruh pemain; pemenang memimpin urutan
+        assert {p['ID'] for p in data['pemain']} == set(turnamen.pemain.id_aktif().tolist())
+        assert set(data['urutan'][:2]) == set(match.tim()[0])
+
+    # Pesan berikutnya hanya berisi baris klasemen yang berubah (skor atau peringkat)
+    aliran, hasil, thread = langganan_bersamaan(penyiar, 'skor', 2)
+    lain = turnamen.jadwal.putaran(1)[1]
+    turnamen.input_skor(lain.match_id, 15, 21)
+    tutup(aliran, thread)
+    for data in hasil:
+        berubah = {p['ID'] for p in data[0]['pemain']}
+        assert set(lain.pemain()) <= berubah < set(turnamen.pemain.id_aktif().tolist())
+    assert penyiar.pelanggan == 0
+
+
+def test_stream_mengirim_klasemen(aplikasi, turnamen_baru):
+    client, awalan, turnamen = turnamen_baru
+    penyiar = aplikasi.siaran[awalan.rsplit('/', 1)[1]].penyiar
+    respons = client.get(awalan + '/stream', buffered=False)
+    assert respons.status_code == 200
+    assert respons.mimetype == 'text/event-stream'
+
+    aliran = iter(respons.response)
+    assert next(aliran).startswith(b'retry:')
+    assert penyiar.pelanggan == 1
+    hasil = []
+    t = threading.Thread(target=baca_sampai, args=(aliran, 'klasemen', hasil), daemon=True)
+    t.start()
+    client.post(awalan + '/tambah_pemain', data={'nama_pemain': 'Ani'})
+    t.join(TENGGAT)
+    assert not t.is_alive()
+    assert [p['Nama'] for p in hasil[0]['pemain']] == ['Ani']
+
+    respons.close()
+    assert penyiar.pelanggan == 0
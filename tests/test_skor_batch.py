@@ -0,0 +1,119 @@
+import copy
+import random
+
+import pytest
+
+from klasemen import cek_konsistensi_wlt
+from turnamen import Turnamen
+
+
+def siapkan(turnamen, jumlah_pemain=16, jumlah_lapangan=4):
+    for i in range(jumlah_pemain):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(jumlah_lapangan, 'Americano', 'Double')
+    # Satu match sudah selesai, agar batch juga berisi koreksi skor
+    pertama = turnamen.jadwal.putaran(1)[0]
+    turnamen.input_skor(pertama.match_id, 21, 15)
+
+
+def keadaan(turnamen):
+    return (turnamen.semua_jadwal().copy(), turnamen.pemain_df.copy(), dict(turnamen.rating.rating),
+            turnamen.putaran_saat_ini, turnamen.versi_state)
+
+
+def sama(sebelum, sesudah):
+    jadwal, pemain, rating, putaran, versi = sebelum
+    assert sesudah[0].equals(jadwal)
+    assert sesudah[1].equals(pemain)
+    assert sesudah[2:] == (rating, putaran, versi)
+
+
+def entri(match, skor_1=21, skor_2=10, **ubah):
+    data = {'match_id': match.match_id, 'skor_tim_1': skor_1, 'skor_tim_2': skor_2, 'versi': match.versi}
+    data.update(ubah)
+    return data
+
+
+# Tiap kasus mengubah satu entri batch (yang terakhir); status yang diharapkan
+@pytest.mark.parametrize('ubah,status', [
+    ({'versi': 99}, 409),
+    ({'match_id': 9999}, 404),
+    ({'skor_tim_2': -1}, 400),
+    ({'skor_tim_1': 'dua puluh'}, 400),
+    ({'match_id': None}, 400),
+], ids=['versi-basi', 'match-tidak-ada', 'skor-negatif', 'skor-bukan-angka', 'tanpa-match-id'])
+def test_satu_entri_buruk_menolak_seluruh_batch(turnamen_baru, ubah, status):
+    client, awalan, turnamen = turnamen_baru
+    siapkan(turnamen)
+    matches = turnamen.jadwal.putaran(1)
+    skor = [entri(m) for m in matches[:-1]] + [entri(matches[-1], **ubah)]
+    sebelum = keadaan(turnamen)
+
+    respons = client.post(awalan + '/api/v1/scores', json={'skor': skor})
+
+    assert respons.status_code == status
+    if status != 400:
+        assert respons.get_json()['match_ids'] == [skor[-1]['match_id']]
+    sama(sebelum, keadaan(turnamen))
+
+
+def test_match_ganda_menolak_seluruh_batch(turnamen_baru):
+    client, awalan, turnamen = turnamen_baru
+    siapkan(turnamen)
+    matches = turnamen.jadwal.putaran(1)
+    sebelum = keadaan(turnamen)
+
+    skor = [entri(m) for m in matches] + [entri(matches[1], 5, 21)]
+    assert client.post(awalan + '/api/v1/scores', json={'skor': skor}).status_code == 400
+    assert client.post(awalan + '/api/v1/scores', json={'skor': []}).status_code == 400
+    # Langsung ke Turnamen: match ganda juga ditolak dan dikembalikan
+    assert turnamen.input_skor_batch([(m.match_id, 21, 10, None) for m in matches] +
+                                     [(matches[1].match_id, 5, 21, None)]) == [matches[1].match_id]
+    sama(sebelum, keadaan(turnamen))
+
+
+def salin(turnamen):
+    """Turnamen baru dengan state yang sama (jadwal tidak di-replay karena diacak)."""
+    hasil = Turnamen(max_pemain=turnamen.max_pemain)
+    hasil.pasang_state(copy.deepcopy(turnamen.ke_state()))
+    return hasil
+
+
+@pytest.mark.parametrize('seluruh_putaran', [False, True])
+def test_batch_sama_dengan_input_skor_berurutan(seluruh_putaran):
+    acak = random.Random(3)
+    turnamen = Turnamen(max_pemain=16)
+    siapkan(turnamen)
+    matches = turnamen.jadwal.putaran(1)
+    if not seluruh_putaran:
+        matches = matches[:-1]
+    skor = [(m.match_id, acak.randint(0, 21), acak.randint(0, 21), m.versi) for m in matches]
+    pembanding = salin(turnamen)
+
+    assert turnamen.input_skor_batch(skor) == []
+    for match_id, skor_1, skor_2, versi in skor:
+        assert pembanding.input_skor(match_id, skor_1, skor_2, versi)
+
+    assert turnamen.ke_state()['pemain'] == pembanding.ke_state()['pemain']
+    assert turnamen.rating.rating == pembanding.rating.rating
+    assert turnamen.putaran_saat_ini == pembanding.putaran_saat_ini == (2 if seluruh_putaran else 1)
+    for match_id, skor_1, skor_2, _ in skor:
+        a, b = turnamen.jadwal.get(match_id), pembanding.jadwal.get(match_id)
+        assert (a.poin_1, a.poin_2, a.selesai, a.versi) == (b.poin_1, b.poin_2, b.selesai, b.versi)
+        assert (a.poin_1, a.poin_2, a.selesai) == (skor_1, skor_2, True)
+    beda = cek_konsistensi_wlt(turnamen.pemain_df, turnamen.semua_jadwal())
+    assert beda.empty, beda.to_string()
+
+
+def test_batch_lewat_api(turnamen_baru):
+    client, awalan, turnamen = turnamen_baru
+    siapkan(turnamen)
+    matches = turnamen.jadwal.putaran(1)
+    skor = [entri(m, 21, i) for i, m in enumerate(matches)]
+
+    respons = client.post(awalan + '/api/v1/scores', json={'skor': skor})
+
+    assert respons.status_code == 200
+    assert all(m.selesai for m in matches)
+    assert [(m.poin_1, m.poin_2) for m in matches] == [(21, i) for i in range(len(matches))]
+    assert turnamen.putaran_saat_ini == 2
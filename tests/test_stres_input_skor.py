@@ -0,0 +1,88 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from klasemen import cek_konsistensi_wlt
+
+THREAD = 16
+KIRIMAN_PER_MATCH = 6
+
+
+def siapkan(turnamen, jumlah_pemain=24, num_lapangan=6):
+    for i in range(jumlah_pemain):
+        turnamen.tambah_pemain(f'Pemain {i + 1}')
+    turnamen.mulai_putaran(num_lapangan, 'Americano', 'Double')
+
+
+def kirim_bersamaan(aplikasi, awalan, tugas):
+    """POST skor JSON dari banyak thread (satu test client per thread); status per tugas."""
+    lokal = threading.local()
+
+    def kirim(tugas):
+        match_id, skor_tim_1, skor_tim_2, versi = tugas
+        client = getattr(lokal, 'client', None)
+        if client is None:
+            client = lokal.client = aplikasi.app.test_client()
+        data = {'skor_tim_1': skor_tim_1, 'skor_tim_2': skor_tim_2, 'versi': versi}
+        return client.post(f'{awalan}/api/v1/matches/{match_id}/score', json=data).status_code
+
+    with ThreadPoolExecutor(max_workers=THREAD) as pool:
+        return list(pool.map(kirim, tugas))
+
+
+def test_versi_basi_ditolak_tepat_satu_diterima(aplikasi, turnamen_baru):
+    _, awalan, turnamen = turnamen_baru
+    siapkan(turnamen)
+    acak = random.Random(1)
+    match_ids = [m.match_id for m in turnamen.jadwal.putaran(1)]
+    # Semua kiriman membawa versi 0: yang pertama per match diterima, sisanya basi
+    tugas = [(m_id, acak.randint(0, 21), acak.randint(0, 21), 0) for m_id in match_ids
+             for _ in range(KIRIMAN_PER_MATCH)]
+    acak.shuffle(tugas)
+
+    status = kirim_bersamaan(aplikasi, awalan, tugas)
+
+    for m_id in match_ids:
+        per_match = [kode for (t_id, *_), kode in zip(tugas, status) if t_id == m_id]
+        assert sorted(per_match) == [200] + [409] * (KIRIMAN_PER_MATCH - 1)
+    # Skor terakhir menutup putaran tepat satu kali
+    assert turnamen.putaran_saat_ini == 2
+    assert len(turnamen.matches_putaran(2)) == len(match_ids)
+    beda = cek_konsistensi_wlt(turnamen.pemain_df, turnamen.semua_jadwal())
+    assert beda.empty, beda.to_string()
+
+
+def test_koreksi_bersamaan_tanpa_update_hilang(aplikasi, turnamen_baru):
+    _, awalan, turnamen = turnamen_baru
+    siapkan(turnamen)
+    acak = random.Random(2)
+    jumlah_putaran = 5
+
+    for putaran in range(1, jumlah_putaran + 1):
+        match_ids = [m.match_id for m in turnamen.jadwal.putaran(putaran)]
+        # Skor pertama semua match kecuali satu, lalu koreksi bersamaan tanpa versi
+        tugas = [(m_id, acak.randint(0, 21), acak.randint(0, 21), None) for m_id in match_ids[1:]
+                 for _ in range(KIRIMAN_PER_MATCH)]
+        acak.shuffle(tugas)
+        assert set(kirim_bersamaan(aplikasi, awalan, tugas)) == {200}
+        assert turnamen.putaran_saat_ini == putaran
+        assert set(kirim_bersamaan(aplikasi, awalan, [(match_ids[0], 21, 10, None)] * 3)) == {200}
+        assert turnamen.putaran_saat_ini == putaran + 1
+
+    jadwal = turnamen.semua_jadwal()
+    pemain_df = turnamen.pemain_df
+    beda = cek_konsistensi_wlt(pemain_df, jadwal)
+    assert beda.empty, beda.to_string()
+
+    # Tidak ada update yang hilang: Total_Poin / Games_Played = jumlah dari skor akhir setiap match
+    selesai = jadwal[jadwal['Status'] == 'Selesai']
+    poin = dict.fromkeys(pemain_df.index, 0)
+    games = dict.fromkeys(pemain_df.index, 0)
+    for _, m in selesai.iterrows():
+        for kolom, skor in (('Pemain_1_A', 'Poin_Tim_1'), ('Pemain_1_B', 'Poin_Tim_1'),
+                            ('Pemain_2_A', 'Poin_Tim_2'), ('Pemain_2_B', 'Poin_Tim_2')):
+            poin[int(m[kolom])] += int(m[skor])
+            games[int(m[kolom])] += 1
+    assert pemain_df['Total_Poin'].to_dict() == poin
+    assert pemain_df['Games_Played'].to_dict() == games
+    assert len(selesai) == jumlah_putaran * 6
@@ -0,0 +1,808 @@
+import functools
+import itertools
+import random
+import threading
+
+import numpy as np
+
+from log_event import isi_bye, ringkas_match
+from penjadwal import RiwayatPasangan, susun_grup, rencanakan_americano
+from penyimpanan import KonflikVersi
+from profil import span, terukur
+from rating import MesinRating
+from tabel import (KOLOM_PEMAIN, K_POIN, K_BYE, TabelPemain, TabelJadwal, Match,
+                   array_id, kunci_pemain, match_ke_dataframe)
+
+ID_COLS = ['Pemain_1_A', 'Pemain_1_B', 'Pemain_2_A', 'Pemain_2_B']
+
+# Nomor versi state di memori; unik di seluruh proses sehingga tetap naik
+# walaupun turnamen dikeluarkan dari registri lalu dimuat ulang
+_versi_state = itertools.count(1)
+
+
+def catat_bye(buku_bye, pemain, putaran, bermain):
+    """Menulis ke buku bye: pemain aktif yang tidak ada di `bermain` duduk di luar pada `putaran`."""
+    bermain = set(bermain)
+    buku_bye[putaran] = [p_id for p_id in sorted(pemain.id_aktif().tolist()) if p_id not in bermain]
+
+
+def bye_dari_jadwal(pemain, matches):
+    """
+    Buku bye yang diturunkan dari riwayat match (untuk data lama tanpa buku
+    bye): per putaran, pemain aktif SAAT INI yang tidak bermain. Pemain yang
+    sudah dihapus atau baru ditambah membuat hasilnya perkiraan.
+    """
+    bermain = {}
+    for m in matches:
+        bermain.setdefault(m.putaran, set()).update(m.pemain())
+    buku_bye = {}
+    for putaran, ids in bermain.items():
+        catat_bye(buku_bye, pemain, putaran, ids)
+    return buku_bye
+
+
+@terukur()
+def buat_jadwal(pemain, putaran, num_lapangan, mode_permainan, format_turnamen, riwayat=None, id_match_baru=None,
+                buku_bye=None, rating=None):
+    """
+    Membuat jadwal baru dengan logika prioritas dari TabelPemain `pemain`.
+    Pasangan dan lawan disusun oleh penjadwal.susun_grup berdasarkan `riwayat`
+    (RiwayatPasangan) agar partner/lawan yang sama jarang terulang.
+    `id_match_baru` adalah fungsi pemberi Match_ID berikutnya. Jika `buku_bye`
+    (dict putaran -> ID) diberikan, pemain yang duduk di luar dicatat di sana.
+    Jika `rating` (MesinRating) diberikan, Mexicano membagi peringkat menurut
+    rating, bukan Total_Poin.
+    """
+    total_poin = pemain.kolom(K_POIN)
+
+    players_per_court = 4 if mode_permainan == 'Double' else 2
+    total_slots = num_lapangan * players_per_court
+
+    # Kriteria Prioritas: Total_Bye DESC, Games_Played ASC, Total_Poin DESC, seri diacak.
+    # Diambil dari indeks yang dipelihara tabel, tanpa mengurutkan seluruh roster.
+    pemain_potensial = pemain.prioritas.teratas_acak(total_slots)
+
+    pemain_yang_bermain_count = len(pemain_potensial) - (len(pemain_potensial) % players_per_court)
+    pemain_bermain_ids = pemain_potensial[:pemain_yang_bermain_count]
+
+    pemain_bermain = pemain_bermain_ids
+
+    if len(pemain_bermain) < players_per_court:
+        return []
+
+    if riwayat is None:
+        riwayat = RiwayatPasangan()
+
+    # --- AMERICANO (Pengulangan Partner/Lawan Minimal) ---
+    if format_turnamen == 'Americano':
+        grup_lapangan = susun_grup(pemain_bermain, riwayat, players_per_court)
+
+    # --- MEXICANO (Peringkat) ---
+    elif format_turnamen == 'Mexicano':
+
+        if rating is not None:
+            # Urutan dibaca dari indeks rating yang sudah terurut
+            pemain_bermain_sorted = rating.urutkan(pemain_bermain)
+        else:
+            poin_bermain = total_poin[pemain.baris_dari(pemain_bermain)]
+            pemain_bermain_sorted = [pemain_bermain[i] for i in np.argsort(-poin_bermain, kind='stable')]
+
+        mid_point = len(pemain_bermain_sorted) // 2
+        peringkat_tinggi = pemain_bermain_sorted[:mid_point]
+        peringkat_rendah = pemain_bermain_sorted[mid_point:]
+
+        random.shuffle(peringkat_tinggi)
+        random.shuffle(peringkat_rendah)
+
+        # Susunan awal: Double = (H1 & L1) vs (H2 & L2), Single = H vs L.
+        # Local search hanya menukar H dengan H dan L dengan L.
+        urutan_awal, kelompok = [], []
+        if mode_permainan == 'Double':
+            for i in range(len(peringkat_tinggi) // 2):
+                urutan_awal += [peringkat_tinggi[2 * i], peringkat_rendah[2 * i],
+                                peringkat_tinggi[2 * i + 1], peringkat_rendah[2 * i + 1]]
+                kelompok += ['H', 'L', 'H', 'L']
+        elif mode_permainan == 'Single':
+            for i in range(len(peringkat_tinggi)):
+                urutan_awal += [peringkat_tinggi[i], peringkat_rendah[i]]
+                kelompok += ['H', 'L']
+
+        grup_lapangan = susun_grup(urutan_awal, riwayat, players_per_court, kelompok=kelompok)
+
+    else:
+        return []
+
+    if buku_bye is not None:
+        catat_bye(buku_bye, pemain, putaran, pemain_bermain)
+    return buat_match_dari_grup(grup_lapangan, putaran, mode_permainan, id_match_baru)
+
+def buat_match_dari_grup(grup_lapangan, putaran, mode_permainan, id_match_baru):
+    """
+    Mengubah grup per lapangan ([1A, 1B, 2A, 2B] atau [1A, 2A]) menjadi baris jadwal.
+    """
+    jadwal_baru = []
+    for lapangan_num, grup_pemain in enumerate(grup_lapangan, start=1):
+        if mode_permainan == 'Double':
+            P1A, P1B, P2A, P2B = grup_pemain
+        else: # Single
+            P1A, P2A = grup_pemain
+            P1B, P2B = None, None
+
+        match_data = {
+            'Match_ID': id_match_baru(),
+            'Putaran': putaran,
+            'Lapangan': lapangan_num,
+            'Mode': mode_permainan,
+            'Pemain_1_A': P1A, 'Pemain_1_B': P1B,
+            'Pemain_2_A': P2A, 'Pemain_2_B': P2B,
+            'Poin_Tim_1': 0, 'Poin_Tim_2': 0,
+            'Status': 'Belum Selesai',
+            'Versi': 0
+        }
+        jadwal_baru.append(match_data)
+
+    return jadwal_baru
+
+
+def _terkunci(metode):
+    """
+    Menjalankan metode di bawah kunci turnamen, setelah sinkron dengan
+    penyimpanan. Semua mutasi (termasuk pembuatan putaran otomatis di
+    input_skor) berjalan berurutan dan tepat satu kali.
+    """
+    @functools.wraps(metode)
+    def pembungkus(self, *args, **kwargs):
+        with self.kunci:
+            self.sinkronkan()
+            return metode(self, *args, **kwargs)
+    return pembungkus
+
+
+class Turnamen:
+    """
+    Seluruh state satu turnamen (pemain, jadwal, putaran, config) beserta
+    operasi yang mengubahnya. Jika `penyimpanan` diberikan, setiap operasi
+    menulis baris yang berubah saja ke penyimpanan (write-through). Jika
+    `log_event` diberikan, setiap operasi juga dicatat sebagai event.
+
+    Pemain dan match disimpan di TabelPemain / TabelJadwal (lihat tabel.py);
+    `pemain_df` dan `jadwal_df` adalah view DataFrame untuk rendering.
+    `seeding_mexicano` ('poin' atau 'rating') menentukan urutan pembagian
+    peringkat Mexicano.
+    """
+
+    def __init__(self, max_pemain=32, penyimpanan=None, log_event=None, seeding_mexicano='poin'):
+        self.max_pemain = max_pemain
+        self.seeding_mexicano = seeding_mexicano
+        self.penyimpanan = penyimpanan
+        self.log_event = log_event
+        # Satu kunci per turnamen; reentrant agar metode terkunci bisa saling memanggil
+        self.kunci = threading.RLock()
+        # Dipanggil `pendengar(turnamen, event)` setelah setiap mutasi (mis. siaran live)
+        self.pendengar = []
+
+        # 'Total_Poin' adalah akumulasi skor match (cth: Poin Americano)
+        self.pemain = TabelPemain()
+        self.jadwal = TabelJadwal()
+
+        self.next_player_id = 1
+        self.next_match_id = 1
+        self.putaran_saat_ini = 0
+        self.last_config = {
+            'num_lapangan': 1,
+            'format_turnamen': 'Americano',
+            'mode_permainan': 'Double'
+        }
+        # Matriks partner/lawan untuk semua match yang sedang terjadwal
+        self.riwayat_pasangan = RiwayatPasangan()
+        # Rencana Americano yang sudah dihitung di muka (None = jadwal per putaran)
+        self.rencana_jadwal = None
+        # Buku bye: putaran -> ID pemain yang duduk di luar, ditulis saat putaran dibuat.
+        # Dengan penyimpanan, memori hanya memuat putaran aktif.
+        self.buku_bye = {}
+        # Rating Elo pemain (lihat rating.py), diperbarui setiap skor dicatat
+        self.rating = MesinRating()
+
+        # Versi penyimpanan yang tercermin di memori
+        self.versi = 0
+        self._reset_perubahan()
+        self._state_berubah()
+
+        if self.penyimpanan is not None:
+            self.muat_dari_penyimpanan()
+        elif self.log_event is not None:
+            self.pasang_state(self.log_event.replay())
+
+    # --- View DataFrame (hanya untuk rendering / analisis) ---
+    @property
+    def pemain_df(self):
+        return self.pemain.ke_dataframe()
+
+    @property
+    def jadwal_df(self):
+        return self.jadwal.ke_dataframe()
+
+    # --- Fungsi Utility ---
+    def get_next_player_id(self):
+        current_id = self.next_player_id
+        self.next_player_id += 1
+        return current_id
+
+    def get_next_match_id(self):
+        current_id = self.next_match_id
+        self.next_match_id += 1
+        return current_id
+
+    def _tambah_jadwal(self, new_matches):
+        if new_matches:
+            baru = [Match.dari_dict(m) for m in new_matches]
+            for match in baru:
+                self.jadwal.tambah(match)
+            self.riwayat_pasangan.catat_array(array_id(baru))
+            self._perubahan['match_baru'].update(m.match_id for m in baru)
+
+    def _hapus_jadwal(self, indices):
+        if len(indices):
+            dihapus = [self.jadwal.hapus(m_id) for m_id in indices]
+            self.riwayat_pasangan.catat_array(array_id(dihapus), arah=-1)
+            self._perubahan['match_hapus'].update(indices)
+            # Match Selesai yang dihapus keluar dari riwayat, begitu juga delta ratingnya
+            batal = [self.rating.batalkan(m.match_id) for m in dihapus if m.selesai]
+            self._perubahan['rating'].update(p_id for m in dihapus if m.selesai for p_id in m.pemain())
+            if not all(batal):
+                self.hitung_ulang_rating()
+
+    def _rating_seeding(self):
+        return self.rating if self.seeding_mexicano == 'rating' else None
+
+    def _rating_inkremental(self, match):
+        """
+        True jika skor `match` bisa diterapkan ke rating secara inkremental:
+        match putaran aktif yang belum Selesai atau delta lamanya tersimpan,
+        dengan semua pemainnya masih terdaftar. Selain itu (mis. koreksi
+        putaran lama, yang memengaruhi rating putaran sesudahnya) rating
+        dihitung ulang penuh.
+        """
+        rating = self.rating
+        return (match.putaran == self.putaran_saat_ini and (not match.selesai or match.match_id in rating.delta)
+                and all(p_id in rating for p_id in match.pemain()))
+
+    def hitung_ulang_rating(self):
+        """Menghitung ulang seluruh rating dari riwayat match (mode batch, lihat rating.py)."""
+        matches = {m.match_id: m for m in self.semua_match()}
+        # Match di memori bisa lebih baru daripada penyimpanan (belum simpan())
+        matches.update(self.jadwal.match)
+        for m_id in self._perubahan['match_hapus'] - set(self.jadwal.match):
+            matches.pop(m_id, None)
+        self.rating = MesinRating.dari_matches(self.pemain.id_aktif().tolist(), matches.values(),
+                                               self.putaran_saat_ini)
+        self._perubahan['rating'].update(self.rating.rating)
+        self._perubahan['delta'].update(self.jadwal.match)
+
+    def rencanakan_ulang(self):
+        """
+        Menyusun ulang sisa rencana Americano (jumlah putaran tetap sama) dari
+        kondisi roster dan riwayat saat ini. Dipanggil hanya saat roster berubah.
+        """
+        if not self.rencana_jadwal or not self.rencana_jadwal['putaran']:
+            return
+        players_per_court = 4 if self.rencana_jadwal['mode_permainan'] == 'Double' else 2
+        self.rencana_jadwal['putaran'] = rencanakan_americano(
+            self.pemain, len(self.rencana_jadwal['putaran']), self.rencana_jadwal['num_lapangan'],
+            players_per_court, self.riwayat_pasangan
+        )
+
+    # --- Operasi Turnamen ---
+    @_terkunci
+    def tambah_pemain(self, nama):
+        if nama and len(self.pemain) < self.max_pemain:
+            new_id = self.get_next_player_id()
+            self.pemain.tambah(new_id, nama)
+            self.rating.tambah(new_id)
+            self._perubahan['pemain'].add(new_id)
+            self.rencanakan_ulang()
+            self.simpan()
+            self._catat_event(['P+', new_id, nama, self.rencana_jadwal])
+
+    @_terkunci
+    def tambah_pemain_banyak(self, daftar_nama):
+        """
+        Import roster sekaligus. Nama kosong dan duplikat (kunci_pemain,
+        terhadap roster maupun sesama daftar) dilewati, begitu juga nama di
+        atas max_pemain. ID diberikan dalam satu blok; semua pemain masuk
+        dengan satu operasi tabel, satu rencanakan_ulang, satu simpan() dan
+        satu event. Mengembalikan (ditambah [(ID, nama)], dilewati [(nama, alasan)]).
+        """
+        terdaftar = {kunci_pemain(nama) for nama in self.pemain.nama}
+        baru, dilewati = [], []
+        sisa = self.max_pemain - len(self.pemain)
+        for nama in daftar_nama:
+            nama = (nama or '').strip()
+            kunci = kunci_pemain(nama)
+            if not nama:
+                dilewati.append((nama, 'kosong'))
+            elif kunci in terdaftar:
+                dilewati.append((nama, 'duplikat'))
+            elif len(baru) >= sisa:
+                dilewati.append((nama, 'roster penuh'))
+            else:
+                terdaftar.add(kunci)
+                baru.append(nama)
+        if not baru:
+            return [], dilewati
+
+        ids = list(range(self.next_player_id, self.next_player_id + len(baru)))
+        self.next_player_id += len(baru)
+        self.pemain.tambah_banyak(ids, baru)
+        self.rating.tambah_banyak(ids)
+        self._perubahan['pemain'].update(ids)
+        self.rencanakan_ulang()
+        self.simpan()
+        ditambah = list(zip(ids, baru))
+        self._catat_event(['P*', [list(p) for p in ditambah], self.rencana_jadwal])
+        return ditambah, dilewati
+
+    @_terkunci
+    def hapus_pemain(self, player_id):
+        pemain, jadwal = self.pemain, self.jadwal
+
+        if player_id in pemain:
+            pemain.hapus(player_id)
+            self.rating.hapus(player_id)
+            self._perubahan['pemain_hapus'].add(player_id)
+
+            terlibat = [m for m in jadwal.putaran(self.putaran_saat_ini) if player_id in m.pemain()]
+
+            if terlibat:
+                # Batalkan kontribusi W/L/T dari match Selesai yang ikut dihapus
+                for match in terlibat:
+                    if match.selesai:
+                        tim_1, tim_2 = match.tim()
+                        pemain.terapkan_wlt(tim_1, tim_2, match.poin_1, match.poin_2, arah=-1)
+                        self._perubahan['pemain'].update(tim_1 + tim_2)
+                self._hapus_jadwal([m.match_id for m in terlibat])
+
+            # Pemain lain di match belum Selesai yang dihapus ikut duduk di luar putaran ini;
+            # pemain match Selesai sudah bermain (dan tetap memegang poinnya), jadi bukan bye
+            bye = self.buku_bye.get(self.putaran_saat_ini)
+            if bye is not None:
+                lepas = {p_id for m in terlibat if not m.selesai for p_id in m.pemain()}
+                self.buku_bye[self.putaran_saat_ini] = sorted((set(bye) | lepas) - {player_id})
+                self._perubahan['bye'].add(self.putaran_saat_ini)
+
+            # Jika semua match di putaran saat ini dihapus, mundur 1 putaran (opsional)
+            if self.putaran_saat_ini > 0 and not jadwal.putaran(self.putaran_saat_ini):
+                self.putaran_saat_ini -= 1
+
+            self.rencanakan_ulang()
+            self.simpan()
+            self._catat_event(['P-', player_id, self.rencana_jadwal])
+
+    @_terkunci
+    def mulai_putaran(self, num_lapangan, format_turnamen, mode_permainan, jumlah_putaran_rencana=0):
+        players_per_court = 4 if mode_permainan == 'Double' else 2
+
+        if len(self.pemain) < players_per_court:
+            return
+
+        # Hapus jadwal putaran yang belum selesai.
+        self._hapus_jadwal([m.match_id for m in self.jadwal if not m.selesai])
+
+        self.putaran_saat_ini += 1
+
+        self.last_config['num_lapangan'] = num_lapangan
+        self.last_config['format_turnamen'] = format_turnamen
+        self.last_config['mode_permainan'] = mode_permainan
+
+        pemain = self.pemain
+        self.rencana_jadwal = None
+        if format_turnamen == 'Americano' and jumlah_putaran_rencana > 0:
+            rencana = rencanakan_americano(pemain, jumlah_putaran_rencana, num_lapangan, players_per_court, self.riwayat_pasangan)
+            new_matches = []
+            if rencana:
+                grup = rencana.pop(0)
+                catat_bye(self.buku_bye, pemain, self.putaran_saat_ini, [p_id for g in grup for p_id in g])
+                new_matches = buat_match_dari_grup(grup, self.putaran_saat_ini, mode_permainan, self.get_next_match_id)
+            self.rencana_jadwal = {
+                'num_lapangan': num_lapangan,
+                'mode_permainan': mode_permainan,
+                'putaran': rencana
+            }
+        else:
+            new_matches = buat_jadwal(pemain, self.putaran_saat_ini, num_lapangan, mode_permainan, format_turnamen,
+                                      self.riwayat_pasangan, self.get_next_match_id, self.buku_bye,
+                                      self._rating_seeding())
+
+        self._tambah_jadwal(new_matches)
+        self._perubahan['bye'].add(self.putaran_saat_ini)
+        self.simpan()
+        self._catat_event(['R', num_lapangan, format_turnamen, mode_permainan,
+                           [ringkas_match(m) for m in new_matches], self.rencana_jadwal])
+
+    @_terkunci
+    def kocok_ulang(self, format_turnamen, mode_permainan):
+        jadwal_saat_ini = self.jadwal.putaran(self.putaran_saat_ini)
+
+        if jadwal_saat_ini and not any(m.selesai for m in jadwal_saat_ini):
+
+            # Hapus jadwal putaran saat ini untuk dikocok ulang
+            self._hapus_jadwal([m.match_id for m in jadwal_saat_ini])
+
+            num_lapangan = len({m.lapangan for m in jadwal_saat_ini})
+
+            self.last_config['num_lapangan'] = num_lapangan
+            self.last_config['format_turnamen'] = format_turnamen
+            self.last_config['mode_permainan'] = mode_permainan
+
+            # Rencana hanya berlaku untuk Americano dengan mode yang sama
+            if self.rencana_jadwal and (format_turnamen != 'Americano' or mode_permainan != self.rencana_jadwal['mode_permainan']):
+                self.rencana_jadwal = None
+
+            new_matches = buat_jadwal(self.pemain, self.putaran_saat_ini, num_lapangan, mode_permainan, format_turnamen,
+                                      self.riwayat_pasangan, self.get_next_match_id, self.buku_bye,
+                                      self._rating_seeding())
+            self._tambah_jadwal(new_matches)
+            self._perubahan['bye'].add(self.putaran_saat_ini)
+            self.simpan()
+            self._catat_event(['K', format_turnamen, mode_permainan,
+                               [ringkas_match(m) for m in new_matches], self.rencana_jadwal])
+
+    @_terkunci
+    def input_skor(self, match_id, skor_tim_1, skor_tim_2, versi=None):
+        """
+        Mencatat/mengoreksi skor satu match. `versi` (opsional) adalah versi
+        baris match yang dilihat pengirim; jika sudah berubah, skor ditolak
+        dan fungsi mengembalikan False.
+        """
+        pemain, jadwal = self.pemain, self.jadwal
+        match = jadwal.get(match_id)
+        skor_dicatat = False
+
+        if versi is not None and match is not None and match.versi != versi:
+            return False
+
+        if skor_tim_1 >= 0 and skor_tim_2 >= 0 and match is not None:
+            self._perubahan['skor'].setdefault(match_id, match.versi)
+            tim_1, tim_2 = match.tim()
+            inkremental = self._rating_inkremental(match)
+
+            # 1. Batalkan poin, Games_Played dan W/L/T lama (untuk update skor/reset)
+            if match.selesai:
+                pemain.terapkan_skor(tim_1, tim_2, match.poin_1, match.poin_2, arah=-1)
+
+            # 2. Update Jadwal
+            match.poin_1, match.poin_2, match.selesai = skor_tim_1, skor_tim_2, True
+            match.versi += 1
+
+            # 3. Tambah poin, Games_Played (1 per match) dan W/L/T baru
+            pemain.terapkan_skor(tim_1, tim_2, skor_tim_1, skor_tim_2)
+
+            # 4. Rating: delta lama diganti delta skor baru
+            if inkremental:
+                self.rating.terapkan([match])
+                self._perubahan['delta'].add(match_id)
+            else:
+                self.hitung_ulang_rating()
+
+            self._perubahan['pemain'].update(tim_1 + tim_2)
+            skor_dicatat = True
+
+        # --- Otomatis Buat Jadwal Putaran Berikutnya ---
+        lanjut = self._lanjutkan_jika_selesai()
+
+        self.simpan()
+        if skor_dicatat or lanjut is not None:
+            self._catat_event(['S', match_id, skor_tim_1, skor_tim_2, lanjut])
+        return skor_dicatat
+
+    @_terkunci
+    def input_skor_batch(self, skor):
+        """
+        Mencatat skor banyak match sekaligus. `skor` berisi tuple
+        (match_id, skor_tim_1, skor_tim_2, versi) dengan versi boleh None.
+        Atomik: jika ada match yang tidak ditemukan, skornya negatif, muncul
+        dua kali atau versinya sudah berubah, tidak ada yang dicatat dan
+        Match_ID tersebut dikembalikan. Jika semua diterima, klasemen
+        diperbarui dalam satu operasi array, putaran dicek sekali, dan
+        fungsi mengembalikan list kosong.
+        """
+        jadwal = self.jadwal
+        ditolak, dilihat = [], set()
+        for match_id, skor_tim_1, skor_tim_2, versi in skor:
+            match = jadwal.get(match_id)
+            if (match is None or skor_tim_1 < 0 or skor_tim_2 < 0 or match_id in dilihat
+                    or (versi is not None and match.versi != versi)):
+                ditolak.append(match_id)
+            dilihat.add(match_id)
+        if ditolak or not skor:
+            return ditolak
+
+        perubahan_skor = []
+        inkremental = all(self._rating_inkremental(jadwal.get(match_id)) for match_id, _, _, _ in skor)
+        for match_id, skor_tim_1, skor_tim_2, _ in skor:
+            match = jadwal.get(match_id)
+            self._perubahan['skor'].setdefault(match_id, match.versi)
+            tim_1, tim_2 = match.tim()
+            if match.selesai:
+                perubahan_skor.append((tim_1, tim_2, match.poin_1, match.poin_2, -1))
+            perubahan_skor.append((tim_1, tim_2, skor_tim_1, skor_tim_2, 1))
+            match.poin_1, match.poin_2, match.selesai = skor_tim_1, skor_tim_2, True
+            match.versi += 1
+            self._perubahan['pemain'].update(tim_1 + tim_2)
+        self.pemain.terapkan_skor_batch(perubahan_skor)
+        if inkremental:
+            self.rating.terapkan([jadwal.get(match_id) for match_id, _, _, _ in skor])
+            self._perubahan['delta'].update(match_id for match_id, _, _, _ in skor)
+        else:
+            self.hitung_ulang_rating()
+
+        lanjut = self._lanjutkan_jika_selesai()
+        self.simpan()
+        self._catat_event(['B', [[match_id, skor_tim_1, skor_tim_2] for match_id, skor_tim_1, skor_tim_2, _ in skor],
+                           lanjut])
+        return []
+
+    def _lanjutkan_jika_selesai(self):
+        """
+        Jika semua match putaran saat ini Selesai: mencatat bye putaran itu dan
+        membuat putaran berikutnya. Mengembalikan `lanjut` untuk event
+        ([bye_ids, mode, matches, dari_rencana]) atau None.
+        """
+        pemain = self.pemain
+        current_round_matches = self.jadwal.putaran(self.putaran_saat_ini)
+
+        if not current_round_matches or not all(m.selesai for m in current_round_matches):
+            return None
+
+        # Update Total_Bye untuk putaran ini SEBELUM membuat yang baru, langsung dari buku bye
+        players_on_bye_prev = [p_id for p_id in self.buku_bye.get(self.putaran_saat_ini, ()) if p_id in pemain]
+
+        # Tambah Total_Bye untuk pemain yang mendapat bye di putaran sebelumnya
+        pemain.tambah_nilai(players_on_bye_prev, K_BYE, 1)
+        self._perubahan['pemain'].update(players_on_bye_prev)
+
+        # Lanjutkan ke putaran baru
+        self.putaran_saat_ini += 1
+
+        num_lapangan = self.last_config['num_lapangan']
+        format_turnamen = self.last_config['format_turnamen']
+        mode_permainan = self.last_config['mode_permainan']
+
+        dari_rencana = bool(self.rencana_jadwal and self.rencana_jadwal['putaran'])
+        if dari_rencana:
+            # Ambil putaran berikutnya dari rencana yang sudah dihitung
+            mode_permainan = self.rencana_jadwal['mode_permainan']
+            grup = self.rencana_jadwal['putaran'].pop(0)
+            catat_bye(self.buku_bye, pemain, self.putaran_saat_ini, [p_id for g in grup for p_id in g])
+            new_matches = buat_match_dari_grup(grup, self.putaran_saat_ini, mode_permainan, self.get_next_match_id)
+        else:
+            new_matches = buat_jadwal(self.pemain, self.putaran_saat_ini, num_lapangan, mode_permainan, format_turnamen,
+                                      self.riwayat_pasangan, self.get_next_match_id, self.buku_bye,
+                                      self._rating_seeding())
+
+        self._tambah_jadwal(new_matches)
+        self._perubahan['bye'].add(self.putaran_saat_ini)
+        return [players_on_bye_prev, mode_permainan, [ringkas_match(m) for m in new_matches], dari_rencana]
+
+    # --- Penyimpanan ---
+    def _reset_perubahan(self):
+        # 'skor' memetakan match_id -> versi baris saat pertama diubah (untuk cek optimistic)
+        self._perubahan = {'pemain': set(), 'pemain_hapus': set(), 'match_baru': set(), 'skor': {}, 'match_hapus': set(),
+                           'bye': set(), 'rating': set(), 'delta': set()}
+
+    @terukur('simpan')
+    def simpan(self, kosongkan=False):
+        """
+        Menulis baris yang berubah sejak simpan() terakhir ke penyimpanan.
+        Jika proses lain sudah mengubah match yang sama, state dimuat ulang
+        dari penyimpanan dan KonflikVersi diteruskan ke pemanggil.
+        """
+        perubahan = self._perubahan
+        self._reset_perubahan()
+        if self.penyimpanan is None:
+            return
+
+        pemain, jadwal = self.pemain, self.jadwal
+        pemain_rows = [pemain.baris_tuple(p_id) for p_id in perubahan['pemain'] if p_id in pemain]
+        match_rows = [(m_id,) + jadwal.get(m_id).ke_baris() for m_id in perubahan['match_baru'] if m_id in jadwal]
+        skor_rows = []
+        for m_id, versi_lama in perubahan['skor'].items():
+            match = jadwal.get(m_id)
+            if match is not None and m_id not in perubahan['match_baru']:
+                skor_rows.append((match.poin_1, match.poin_2, match.status, match.versi, m_id, versi_lama))
+        # Rating ikut disimpan agar muat_dari_penyimpanan tidak perlu membaca seluruh riwayat match
+        rating, delta = self.rating.rating, self.rating.delta
+        rating_rows = [(rating[p_id], p_id) for p_id in perubahan['pemain'] | perubahan['rating'] if p_id in rating]
+        delta_rows = [(delta[m_id][2] if m_id in delta else None, m_id)
+                      for m_id in perubahan['delta'] | perubahan['match_baru'] if m_id in jadwal]
+
+        try:
+            self._tulis(perubahan, pemain_rows, match_rows, skor_rows, rating_rows, delta_rows, kosongkan)
+        except KonflikVersi:
+            self.muat_dari_penyimpanan()
+            raise
+
+    def _tulis(self, perubahan, pemain_rows, match_rows, skor_rows, rating_rows, delta_rows, kosongkan):
+        self.versi = self.penyimpanan.simpan_perubahan(
+            pemain=pemain_rows,
+            pemain_hapus=[int(p_id) for p_id in perubahan['pemain_hapus']],
+            match_baru=match_rows,
+            skor=skor_rows,
+            match_hapus=[int(m_id) for m_id in perubahan['match_hapus'] - perubahan['match_baru']],
+            bye={putaran: self.buku_bye[putaran] for putaran in perubahan['bye'] if putaran in self.buku_bye},
+            rating=rating_rows,
+            delta_rating=delta_rows,
+            config={
+                'next_player_id': self.next_player_id,
+                'next_match_id': self.next_match_id,
+                'putaran_saat_ini': self.putaran_saat_ini,
+                'last_config': self.last_config,
+                'rencana_jadwal': self.rencana_jadwal,
+            },
+            kosongkan=kosongkan,
+        )
+
+    def muat_dari_penyimpanan(self):
+        """
+        Memuat klasemen, rating, putaran saat ini dan config dari penyimpanan.
+        Riwayat match lama tidak dimuat ke memori; hanya kolom ID pemainnya
+        yang dibaca untuk membangun ulang matriks partner/lawan.
+        """
+        penyimpanan = self.penyimpanan
+        self.versi = penyimpanan.versi()
+
+        config = penyimpanan.muat_config()
+        self.next_player_id = config.get('next_player_id', 1)
+        self.next_match_id = config.get('next_match_id', 1)
+        self.putaran_saat_ini = config.get('putaran_saat_ini', 0)
+        self.last_config = config.get('last_config', self.last_config)
+        self.rencana_jadwal = config.get('rencana_jadwal')
+
+        self.pemain = TabelPemain.dari_baris([[p[k] for k in KOLOM_PEMAIN] for p in penyimpanan.muat_pemain()])
+        self.jadwal = TabelJadwal(Match.dari_dict(m) for m in penyimpanan.muat_putaran(self.putaran_saat_ini))
+        self.buku_bye = penyimpanan.muat_bye(self.putaran_saat_ini)
+        if self.putaran_saat_ini not in self.buku_bye and len(self.jadwal):
+            # Database lama tanpa buku bye: turunkan putaran aktif dari jadwalnya
+            self.buku_bye = bye_dari_jadwal(self.pemain, self.jadwal)
+
+        self.riwayat_pasangan = RiwayatPasangan()
+        self.riwayat_pasangan.catat_array(np.array(penyimpanan.muat_pasangan(), dtype=float))
+        self._reset_perubahan()
+        ids = self.pemain.id_aktif().tolist()
+        rating = penyimpanan.muat_rating()
+        if all(rating.get(p_id) is not None for p_id in ids):
+            self.rating = MesinRating.dari_tersimpan({p_id: rating[p_id] for p_id in ids}, self.jadwal,
+                                                     penyimpanan.muat_delta_rating(self.putaran_saat_ini))
+        else:
+            # Database lama tanpa rating tersimpan: hitung ulang sekali, ditulis pada simpan() berikutnya
+            self.hitung_ulang_rating()
+        self._state_berubah()
+
+    def sinkronkan(self):
+        """Memuat ulang jika instance lain sudah menulis ke penyimpanan."""
+        if self.penyimpanan is None:
+            return
+        with self.kunci:
+            if self.penyimpanan.versi() != self.versi:
+                self.muat_dari_penyimpanan()
+
+    def matches_putaran(self, putaran):
+        """Match satu putaran; putaran lama dibaca dari penyimpanan jika ada."""
+        if self.penyimpanan is None or putaran == self.putaran_saat_ini:
+            return self.jadwal.putaran(putaran)
+        return [Match.dari_dict(m) for m in self.penyimpanan.muat_putaran(putaran)]
+
+    def semua_match(self):
+        """Seluruh riwayat match sebagai objek Match (dari penyimpanan jika ada)."""
+        if self.penyimpanan is None:
+            return list(self.jadwal)
+        return [Match.dari_dict(m) for m in self.penyimpanan.muat_semua_jadwal()]
+
+    def semua_bye(self):
+        """Seluruh buku bye (putaran -> ID), dari penyimpanan jika ada."""
+        if self.penyimpanan is None:
+            return {putaran: list(ids) for putaran, ids in self.buku_bye.items()}
+        return self.penyimpanan.muat_bye()
+
+    @_terkunci
+    def isi_buku_bye(self, timpa=False):
+        """
+        Mengisi buku bye dari riwayat match untuk putaran yang belum punya
+        catatan (semua putaran jika `timpa`). Mengembalikan jumlah putaran
+        yang diisi. Lihat bye_dari_jadwal untuk batasannya.
+        """
+        ada = self.semua_bye()
+        turunan = bye_dari_jadwal(self.pemain, self.semua_match())
+        diisi = [putaran for putaran in turunan if timpa or putaran not in ada]
+        for putaran in diisi:
+            self.buku_bye[putaran] = turunan[putaran]
+            self._perubahan['bye'].add(putaran)
+        if diisi:
+            self.simpan()
+            self._state_berubah()
+        return len(diisi)
+
+    def semua_jadwal(self):
+        """Seluruh riwayat match sebagai DataFrame (memori hanya memuat putaran aktif)."""
+        return match_ke_dataframe(self.semua_match())
+
+    # --- Versi State ---
+    def _state_berubah(self):
+        """
+        Menaikkan versi_state dan membuang cache_tampilan. Dipanggil setiap
+        mutasi (lewat _beritahu) dan setiap kali state dimuat ulang.
+        """
+        self.versi_state = next(_versi_state)
+        # View model / halaman yang dihitung dari state versi ini (lihat tampilan.tersimpan)
+        self.cache_tampilan = {}
+
+    # --- Log Event ---
+    def _catat_event(self, event):
+        if self.log_event is not None:
+            self.log_event.tambah(event, self.ke_state)
+        self._beritahu(event)
+
+    def _beritahu(self, event):
+        self._state_berubah()
+        with span('pendengar'):
+            for pendengar in self.pendengar:
+                pendengar(self, event)
+
+    def ke_state(self):
+        """State turnamen sebagai struktur Python biasa (format log_event)."""
+        pemain = {}
+        for p_id in self.pemain.id_aktif().tolist():
+            baris = self.pemain.baris_tuple(p_id)
+            pemain[p_id] = list(baris[1:])
+        jadwal = {
+            m.match_id: [m.putaran, m.lapangan, m.mode, m.p1a, m.p1b, m.p2a, m.p2b,
+                         m.poin_1, m.poin_2, m.selesai, m.versi]
+            for m in self.semua_match()
+        }
+        return {
+            'pemain': pemain,
+            'jadwal': jadwal,
+            'next_player_id': self.next_player_id,
+            'next_match_id': self.next_match_id,
+            'putaran_saat_ini': self.putaran_saat_ini,
+            'last_config': dict(self.last_config),
+            'rencana_jadwal': self.rencana_jadwal,
+            'bye': self.semua_bye(),
+        }
+
+    def pasang_state(self, state):
+        """Mengganti seluruh state dengan hasil replay."""
+        self.next_player_id = state['next_player_id']
+        self.next_match_id = state['next_match_id']
+        self.putaran_saat_ini = state['putaran_saat_ini']
+        self.last_config = dict(state['last_config'])
+        self.rencana_jadwal = state['rencana_jadwal']
+
+        self.pemain = TabelPemain.dari_baris([[p_id] + row for p_id, row in state['pemain'].items()])
+        self.jadwal = TabelJadwal(Match(m_id, *row) for m_id, row in state['jadwal'].items())
+        self.buku_bye = {putaran: list(ids) for putaran, ids in (state.get('bye') or isi_bye(state)).items()}
+
+        self.riwayat_pasangan = RiwayatPasangan()
+        self.riwayat_pasangan.catat_array(np.array([row[3:7] for row in state['jadwal'].values()], dtype=float))
+        # Semua match state sudah ada di self.jadwal (penyimpanan belum ditulis ulang)
+        self.rating = MesinRating.dari_matches(self.pemain.id_aktif().tolist(), self.jadwal, self.putaran_saat_ini)
+        self._reset_perubahan()
+        self._state_berubah()
+
+    @_terkunci
+    def undo(self, n=1):
+        """Membatalkan n event terakhir dengan me-replay log tanpa event tersebut."""
+        if self.log_event is None or n < 1:
+            return
+        self.pasang_state(self.log_event.undo(n))
+        self.simpan_semua()
+        self._beritahu(['U', n])
+
+    def simpan_semua(self):
+        """Menulis ulang seluruh state ke penyimpanan (setelah undo/replay)."""
+        if self.penyimpanan is None:
+            return
+        self._perubahan['pemain'].update(self.pemain.id_aktif().tolist())
+        self._perubahan['match_baru'].update(self.jadwal.match)
+        self._perubahan['bye'].update(self.buku_bye)
+        self.simpan(kosongkan=True)